@@ -0,0 +1,49 @@
+import sys
+import json
+import argparse
+
+METRICS = (
+    ("throughput_rps", ("throughput_rps",), True),
+    ("p50_ms", ("latency_ms", "p50"), False),
+    ("p95_ms", ("latency_ms", "p95"), False),
+    ("p99_ms", ("latency_ms", "p99"), False),
+    ("errors", ("errors",), False),
+)
+
+
+def get(data: dict, path: tuple):
+    for key in path:
+        data = data[key]
+    return data
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compara dois relatórios do run_benchmark.")
+    parser.add_argument("base")
+    parser.add_argument("new")
+    parser.add_argument("--threshold", type=float, default=0.1, help="Piora relativa tolerada antes de falhar (0.1 = 10%%).")
+    args = parser.parse_args()
+    with open(args.base, encoding="utf-8") as file:
+        base = json.load(file)
+    with open(args.new, encoding="utf-8") as file:
+        new = json.load(file)
+
+    regressions = []
+    print(f"{base['meta']['commit']} -> {new['meta']['commit']}")
+    print(f"{'cenário':<14}{'métrica':<16}{'base':>12}{'novo':>12}{'delta':>10}")
+    for scenario in base["scenarios"].keys() & new["scenarios"].keys():
+        for name, path, higher_is_better in METRICS:
+            before = get(base["scenarios"][scenario], path)
+            after = get(new["scenarios"][scenario], path)
+            delta = (after - before) / before if before else 0.0
+            worse = -delta if higher_is_better else delta
+            if name != "errors" and worse > args.threshold:
+                regressions.append(f"{scenario}.{name}")
+            print(f"{scenario:<14}{name:<16}{before:>12}{after:>12}{delta:>+10.1%}")
+    if regressions:
+        print(f"Regressões acima de {args.threshold:.0%}: {', '.join(regressions)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,181 @@
+import random
+import asyncio
+import argparse
+from datetime import datetime
+
+import uvicorn
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+
+SERVICES = ("cg", "mb", "fx")
+
+
+class FakeUpstreams():
+    def __init__(self, coins: int = 5000, mb_coins: int = 100, latency: dict = None, jitter: float = 0.0, error_rate: dict = None) -> None:
+        """
+        Servidores locais que imitam a CoinGecko (/cg), a loja do Mercado
+        Bitcoin (/mb) e a awesomeapi (/fx), para rodar o serviço sem acesso
+        à internet.
+
+        O universo tem `coins` moedas com símbolo "c{i}" e id "coin-{i}",
+        ranqueadas pelo índice; apenas as `mb_coins` primeiras existem no
+        Mercado Bitcoin. Cada serviço tem latência e taxa de erro (respostas
+        500) próprias.
+
+        Args:
+            coins (int, optional): Quantidade de moedas na CoinGecko.
+            mb_coins (int, optional): Quantidade de moedas no Mercado Bitcoin.
+            latency (dict, optional): Latência média, em segundos, por serviço.
+            jitter (float, optional): Variação relativa da latência (0.2 = ±20%).
+            error_rate (dict, optional): Fração de respostas 500 por serviço.
+        """
+        self.coins = coins
+        self.mb_coins = mb_coins
+        self.latency = {service: 0.0 for service in SERVICES} | (latency or {})
+        self.jitter = jitter
+        self.error_rate = {service: 0.0 for service in SERVICES} | (error_rate or {})
+        self.calls = {}
+        self.app = Starlette(routes=[
+            Route("/cg/coins/list", self.coins_list),
+            Route("/cg/coins/markets", self.coins_markets),
+            Route("/cg/simple/price", self.simple_price),
+            Route("/cg/coins/{coin_id}", self.coin),
+            Route("/mb/marketplace/product/unlogged", self.mb_products),
+            Route("/fx/last/{pairs}", self.fx_last),
+            Route("/calls", self.get_calls),
+            Route("/calls/reset", self.reset_calls, methods=["POST"]),
+        ])
+
+    async def _simulate(self, service: str, route: str):
+        self.calls[f"{service}:{route}"] = self.calls.get(f"{service}:{route}", 0) + 1
+        latency = self.latency[service]
+        if latency > 0:
+            await asyncio.sleep(max(0.0, latency * (1 + random.uniform(-self.jitter, self.jitter))))
+        if random.random() < self.error_rate[service]:
+            return JSONResponse({"error": "fake upstream error"}, status_code=500)
+        return None
+
+    def _price(self, index: int) -> float:
+        return round(100000 / (index + 1), 8)
+
+    async def coins_list(self, request: Request):
+        return await self._simulate("cg", "coins_list") or JSONResponse([
+            {"id": f"coin-{index}", "symbol": f"c{index}", "name": f"Coin {index}"} for index in range(self.coins)
+        ])
+
+    async def coins_markets(self, request: Request):
+        error = await self._simulate("cg", "coins_markets")
+        if error:
+            return error
+        page = int(request.query_params.get("page", 1))
+        per_page = int(request.query_params.get("per_page", 250))
+        start = (page - 1) * per_page
+        return JSONResponse([
+            {"id": f"coin-{index}", "symbol": f"c{index}", "name": f"Coin {index}", "market_cap_rank": index + 1, "current_price": self._price(index)}
+            for index in range(start, min(start + per_page, self.coins))
+        ])
+
+    async def simple_price(self, request: Request):
+        error = await self._simulate("cg", "simple_price")
+        if error:
+            return error
+        currencies = request.query_params.get("vs_currencies", "usd").split(",")
+        prices = {}
+        for coin_id in request.query_params.get("ids", "").split(","):
+            index = int(coin_id.rsplit("-", 1)[-1]) if coin_id.startswith("coin-") else self.coins
+            if index < self.coins:
+                prices[coin_id] = {currency: self._price(index) for currency in currencies}
+        return JSONResponse(prices)
+
+    async def coin(self, request: Request):
+        error = await self._simulate("cg", "coin")
+        if error:
+            return error
+        coin_id = request.path_params["coin_id"]
+        index = int(coin_id.rsplit("-", 1)[-1]) if coin_id.startswith("coin-") else self.coins
+        if index >= self.coins:
+            return JSONResponse({"error": "coin not found"}, status_code=404)
+        price = self._price(index)
+        return JSONResponse({
+            "id": coin_id,
+            "symbol": f"c{index}",
+            "name": f"Coin {index}",
+            "market_data": {"current_price": {"usd": price, "brl": price * 5}},
+        })
+
+    async def mb_products(self, request: Request):
+        error = await self._simulate("mb", "products")
+        if error:
+            return error
+        symbol = request.query_params.get("symbol", "")
+        if not symbol:
+            offset = int(request.query_params.get("offset", 0))
+            limit = int(request.query_params.get("limit", 20))
+            products = [
+                {"name": f"Coin {index}", "symbol": f"c{index}", "market_price": str(self._price(index) * 5)}
+                for index in range(offset, min(offset + limit, self.mb_coins))
+            ]
+            return JSONResponse({"response_data": {"products": products, "total_items": self.mb_coins}})
+        index = int(symbol[1:]) if symbol[:1] == "c" and symbol[1:].isdigit() else self.mb_coins
+        products = []
+        if index < self.mb_coins:
+            products.append({"name": f"Coin {index}", "symbol": symbol, "market_price": str(self._price(index) * 5)})
+        return JSONResponse({"response_data": {"products": products, "total_items": len(products)}})
+
+    async def fx_last(self, request: Request):
+        error = await self._simulate("fx", "last")
+        if error:
+            return error
+        rates = {}
+        for pair in request.path_params["pairs"].split(","):
+            code, codein = pair.upper().split("-")
+            rates[f"{code}{codein}"] = {
+                "code": code, "codein": codein, "name": pair, "high": "5.0", "low": "4.9",
+                "varBid": "0", "pctChange": "0", "bid": "5.0", "ask": "5.0",
+                "timestamp": str(int(datetime.now().timestamp())),
+                "create_date": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            }
+        return JSONResponse(rates)
+
+    async def get_calls(self, request: Request):
+        return JSONResponse(self.calls)
+
+    async def reset_calls(self, request: Request):
+        self.calls = {}
+        return JSONResponse(self.calls)
+
+
+def parse_per_service(value: str) -> dict:
+    """
+    Converte "0.05" (todos os serviços) ou "cg:0.05,mb:0.02" em um dicionário
+    por serviço.
+    """
+    if ":" not in value:
+        return {service: float(value) for service in SERVICES}
+    return {service: float(number) for service, number in (item.split(":") for item in value.split(",") if item)}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Servidores falsos da CoinGecko, Mercado Bitcoin e awesomeapi.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--coins", type=int, default=5000)
+    parser.add_argument("--mb-coins", type=int, default=100)
+    parser.add_argument("--latency", default="0.02", help='Segundos, "0.02" ou "cg:0.05,mb:0.02,fx:0.01".')
+    parser.add_argument("--jitter", type=float, default=0.2)
+    parser.add_argument("--error-rate", default="0", help='Fração de erros 500, "0.01" ou "mb:0.5".')
+    args = parser.parse_args()
+    upstreams = FakeUpstreams(
+        coins=args.coins,
+        mb_coins=args.mb_coins,
+        latency=parse_per_service(args.latency),
+        jitter=args.jitter,
+        error_rate=parse_per_service(args.error_rate),
+    )
+    uvicorn.run(upstreams.app, host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
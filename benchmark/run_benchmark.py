@@ -0,0 +1,328 @@
+import os
+import sys
+import json
+import time
+import socket
+import random
+import secrets
+import shutil
+import asyncio
+import argparse
+import platform
+import threading
+import subprocess
+from collections import Counter
+from datetime import datetime, timezone
+
+import httpx
+import numpy as np
+import redis.asyncio as redis
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SCENARIOS = ("all-hit", "all-miss", "expiry-storm", "mixed")
+CREDENTIALS = {"username": "teste", "password": "teste"}
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def wait_http(url: str, timeout: float = 30) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if httpx.get(url, timeout=1).status_code < 500:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.1)
+    raise RuntimeError(f"{url} não respondeu em {timeout}s.")
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, text=True).strip()
+    except Exception:
+        return "unknown"
+
+
+class RedisStandIn():
+    def __init__(self, mode: str) -> None:
+        """
+        Sobe (ou aponta para) o Redis usado no benchmark.
+
+        Modos: "external" usa REDIS_HOST/REDIS_PORT do ambiente; "server" sobe
+        um redis-server descartável, sem persistência; "memory" sobe o
+        TcpFakeServer do fakeredis (pip install "fakeredis[lua]") em uma
+        thread; "auto" escolhe "server" se o redis-server estiver no PATH e
+        "memory" caso contrário.
+
+        Args:
+            mode (str): O modo.
+        """
+        if mode == "auto":
+            mode = "server" if shutil.which("redis-server") else "memory"
+        self.mode = mode
+        self.host = os.environ.get("REDIS_HOST", "127.0.0.1") if mode == "external" else "127.0.0.1"
+        self.port = int(os.environ.get("REDIS_PORT", 6379)) if mode == "external" else free_port()
+        self._process = None
+        self._server = None
+
+    def start(self) -> None:
+        if self.mode == "server":
+            self._process = subprocess.Popen(
+                ["redis-server", "--port", str(self.port), "--save", "", "--appendonly", "no"],
+                stdout=subprocess.DEVNULL,
+            )
+        elif self.mode == "memory":
+            from fakeredis import TcpFakeServer
+            self._server = TcpFakeServer((self.host, self.port), server_type="redis")
+            threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        deadline = time.monotonic() + 10
+        while time.monotonic() < deadline:
+            try:
+                with socket.create_connection((self.host, self.port), timeout=1):
+                    return
+            except OSError:
+                time.sleep(0.1)
+        raise RuntimeError(f"Redis ({self.mode}) não respondeu em {self.host}:{self.port}.")
+
+    def stop(self) -> None:
+        if self._process is not None:
+            self._process.terminate()
+            self._process.wait()
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+
+
+class Benchmark():
+    def __init__(self, args: argparse.Namespace) -> None:
+        """
+        Orquestra os servidores falsos, o Redis e a aplicação (main:app via
+        uvicorn, em processos separados) e executa os cenários de carga.
+
+        Args:
+            args (argparse.Namespace): Os argumentos da linha de comando.
+        """
+        self.args = args
+        self.redis_stand_in = RedisStandIn(mode=args.redis)
+        self.upstream_port = free_port()
+        self.app_port = free_port()
+        self.upstream_url = f"http://127.0.0.1:{self.upstream_port}"
+        self.app_url = f"http://127.0.0.1:{self.app_port}"
+        self.quote_prefix = os.environ.get("REDIS_QUOTE_PREFIX", "quote:")
+        self.hot = [f"c{index}" for index in range(args.hot_symbols)]
+        self._cold = iter(f"c{index}" for index in range(args.hot_symbols, args.coins))
+        self._processes = []
+        self._app_log = None
+        self.time_to_ready = None
+
+    def next_cold(self) -> str:
+        try:
+            return next(self._cold)
+        except StopIteration:
+            raise RuntimeError("Moedas insuficientes para os cenários de miss; aumente --coins.")
+
+    def start(self) -> None:
+        self.redis_stand_in.start()
+        self._processes.append(subprocess.Popen([
+            sys.executable, "-m", "benchmark.fake_upstreams",
+            "--port", str(self.upstream_port),
+            "--coins", str(self.args.coins),
+            "--latency", self.args.upstream_latency,
+            "--error-rate", self.args.upstream_error_rate,
+        ], cwd=ROOT))
+        wait_http(f"{self.upstream_url}/calls")
+        env = os.environ | {
+            "COINGECKO_BASE_URL": f"{self.upstream_url}/cg/",
+            "STORE_MERCADO_BITCOIN_BASE_URL": f"{self.upstream_url}/mb/",
+            "COTACAO_BASE_URL": f"{self.upstream_url}/fx/",
+            "REDIS_HOST": self.redis_stand_in.host,
+            "REDIS_PORT": str(self.redis_stand_in.port),
+            "REDIS_TIME": str(self.args.redis_time),
+            "RATE_LIMIT_ENABLED": "false",
+            "PREWARM_ENABLED": "false",
+            "LOG_LEVEL": "WARNING",
+            "COINGECKO_INDEX_PATH": "",
+            "AUTH_SECRET_KEY": os.environ.get("AUTH_SECRET_KEY") or secrets.token_urlsafe(32),
+            "AUTH_TOKEN_TTL": "86400",
+        }
+        os.makedirs(os.path.dirname(os.path.abspath(self.args.app_log)), exist_ok=True)
+        self._app_log = open(self.args.app_log, "w", encoding="utf-8")
+        started_at = time.monotonic()
+        self._processes.append(subprocess.Popen([
+            sys.executable, "-m", "uvicorn", "main:app",
+            "--host", "127.0.0.1", "--port", str(self.app_port),
+            "--workers", str(self.args.workers), "--log-level", "warning", "--no-access-log",
+        ], cwd=ROOT, env=env, stdout=self._app_log, stderr=subprocess.STDOUT))
+        wait_http(f"{self.app_url}/health/ready")
+        self.time_to_ready = round(time.monotonic() - started_at, 3)
+
+    def stop(self) -> None:
+        for process in self._processes:
+            process.terminate()
+        for process in self._processes:
+            try:
+                process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                process.kill()
+        self.redis_stand_in.stop()
+        if self._app_log is not None:
+            self._app_log.close()
+
+    async def run(self) -> dict:
+        self.redis = redis.Redis(host=self.redis_stand_in.host, port=self.redis_stand_in.port, db=5, decode_responses=True)
+        limits = httpx.Limits(max_connections=self.args.concurrency, max_keepalive_connections=self.args.concurrency)
+        async with httpx.AsyncClient(base_url=self.app_url, limits=limits, timeout=30) as client:
+            self.client = client
+            response = await client.post("/token", data=CREDENTIALS)
+            response.raise_for_status()
+            client.headers["Authorization"] = f"Bearer {response.json()['access_token']}"
+            # Carrega o índice de símbolos e o câmbio antes de medir.
+            await client.get("/api", params={"symbol": self.hot[0]})
+            results = {}
+            for scenario in self.args.scenarios:
+                await self.redis.flushdb()
+                results[scenario] = await getattr(self, f"scenario_{scenario.replace('-', '_')}")()
+                print(json.dumps({scenario: results[scenario]}), flush=True)
+        await self.redis.aclose()
+        return results
+
+    async def warm(self) -> None:
+        for start in range(0, len(self.hot), 100):
+            response = await self.client.get("/api/batch", params={"symbols": ",".join(self.hot[start:start + 100])})
+            response.raise_for_status()
+
+    async def expire(self, symbols: list) -> None:
+        async with self.redis.pipeline(transaction=False) as pipe:
+            for symbol in symbols:
+                pipe.delete(f"{self.quote_prefix}{symbol}")
+                pipe.publish("cache:invalidate", f"{self.quote_prefix}{symbol}")
+            await pipe.execute()
+
+    async def measure(self, requests: list) -> dict:
+        """
+        Executa as requisições com no máximo --concurrency simultâneas e
+        resume as latências.
+
+        Args:
+            requests (list[tuple]): Pares (caminho, parâmetros).
+
+        Returns:
+            dict: Vazão, percentis de latência, códigos de status e chamadas
+                feitas aos servidores falsos.
+        """
+        httpx.post(f"{self.upstream_url}/calls/reset")
+        latencies = np.zeros(len(requests))
+        statuses = Counter()
+        queue = iter(enumerate(requests))
+
+        async def worker():
+            for index, (path, params) in queue:
+                started_at = time.perf_counter()
+                try:
+                    status_code = (await self.client.get(path, params=params)).status_code
+                except httpx.HTTPError as error:
+                    status_code = type(error).__name__
+                latencies[index] = time.perf_counter() - started_at
+                statuses[str(status_code)] += 1
+
+        started_at = time.perf_counter()
+        await asyncio.gather(*[worker() for _ in range(self.args.concurrency)])
+        duration = time.perf_counter() - started_at
+        latencies_ms = latencies * 1000
+        return {
+            "requests": len(requests),
+            "errors": sum(count for status, count in statuses.items() if not status.startswith("2")),
+            "duration_s": round(duration, 4),
+            "throughput_rps": round(len(requests) / duration, 2),
+            "latency_ms": {
+                "p50": round(float(np.percentile(latencies_ms, 50)), 3),
+                "p95": round(float(np.percentile(latencies_ms, 95)), 3),
+                "p99": round(float(np.percentile(latencies_ms, 99)), 3),
+                "mean": round(float(latencies_ms.mean()), 3),
+                "max": round(float(latencies_ms.max()), 3),
+            },
+            "status_codes": dict(statuses),
+            "upstream_calls": httpx.get(f"{self.upstream_url}/calls").json(),
+        }
+
+    async def scenario_all_hit(self) -> dict:
+        await self.warm()
+        return await self.measure([("/api", {"symbol": random.choice(self.hot)}) for _ in range(self.args.requests)])
+
+    async def scenario_all_miss(self) -> dict:
+        return await self.measure([("/api", {"symbol": self.next_cold()}) for _ in range(self.args.requests)])
+
+    async def scenario_expiry_storm(self) -> dict:
+        await self.warm()
+        await self.expire(symbols=self.hot)
+        return await self.measure([("/api", {"symbol": random.choice(self.hot)}) for _ in range(self.args.requests)])
+
+    async def scenario_mixed(self) -> dict:
+        await self.warm()
+        requests = []
+        for _ in range(self.args.requests):
+            draw = random.random()
+            if draw < 0.8:
+                requests.append(("/api", {"symbol": random.choice(self.hot)}))
+            elif draw < 0.9:
+                requests.append(("/api", {"symbol": self.next_cold()}))
+            else:
+                symbols = random.sample(self.hot, min(9, len(self.hot))) + [self.next_cold()]
+                requests.append(("/api/batch", {"symbols": ",".join(symbols)}))
+        return await self.measure(requests)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark offline do serviço (main:app).")
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS), help=f"Separados por vírgula, entre {SCENARIOS}.")
+    parser.add_argument("--requests", type=int, default=2000, help="Requisições por cenário.")
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--hot-symbols", type=int, default=200)
+    parser.add_argument("--coins", type=int, default=10000)
+    parser.add_argument("--workers", type=int, default=1, help="Workers do uvicorn.")
+    parser.add_argument("--redis", choices=("auto", "server", "memory", "external"), default="auto")
+    parser.add_argument("--redis-time", type=int, default=300, help="REDIS_TIME da aplicação.")
+    parser.add_argument("--upstream-latency", default="0.02", help='Segundos, "0.02" ou "cg:0.05,mb:0.02,fx:0.01".')
+    parser.add_argument("--upstream-error-rate", default="0", help='Fração de erros 500, "0.01" ou "mb:0.5".')
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", default=os.path.join(ROOT, "benchmark", "results", "latest.json"))
+    parser.add_argument("--app-log", default=os.path.join(ROOT, "benchmark", "results", "app.log"))
+    args = parser.parse_args()
+    args.scenarios = [scenario.strip() for scenario in args.scenarios.split(",") if scenario.strip()]
+    for scenario in args.scenarios:
+        if scenario not in SCENARIOS:
+            parser.error(f"Cenário desconhecido: {scenario}.")
+    random.seed(args.seed)
+
+    benchmark = Benchmark(args=args)
+    try:
+        benchmark.start()
+        results = asyncio.run(benchmark.run())
+    finally:
+        benchmark.stop()
+
+    report = {
+        "meta": {
+            "commit": git_commit(),
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "redis": benchmark.redis_stand_in.mode,
+            "time_to_ready_seconds": benchmark.time_to_ready,
+            "config": {key: value for key, value in vars(args).items() if key not in ("output", "app_log")},
+        },
+        "scenarios": results,
+    }
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    with open(args.output, "w", encoding="utf-8") as file:
+        json.dump(report, file, indent=2)
+    print(f"Relatório gravado em {args.output}")
+
+
+if __name__ == "__main__":
+    main()
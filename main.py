@@ -1,16 +1,69 @@
+import math
+from contextlib import asynccontextmanager
+
+from src.system.core.lifecycle_core import lifecycle
+
 from fastapi import  FastAPI, HTTPException,Request
 from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.exceptions import RequestValidationError
 from starlette.exceptions import HTTPException as StarletteHTTPException
 
-from src.app.api.route import backend as backend_api
-from src.app.auth.route import backend as backend_auth
+from src.app.api.route import backend as backend_api, api_controller
+from src.app.auth.route import backend as backend_auth, auth_controller
+from src.app.stream.route import backend as backend_stream, stream_controller
+from src.app.history.route import backend as backend_history
+from src.app.metrics.route import backend as backend_metrics
+from src.app.health.route import backend as backend_health
+from src.app.search.route import backend as backend_search
+from src.system.core.metrics_core import MetricsMiddleware
+from src.system.core.http_cache_core import CompressionMiddleware
+from src.system.core.redis_core import RedisUnavailableError
+from src.system.integrations.http_client import HttpClient
+
+# Aquecimento: roda em paralelo depois que o worker sobe, enquanto
+# /health/live já responde; /health/ready só responde 200 ao final.
+coin_gecko = api_controller.CLASS_MAPPING["CoinGecko"]
+store_mercado_bitcoin = api_controller.CLASS_MAPPING["StoreMercadoBitcoin"]
+lifecycle.on_startup("redis", api_controller.redis_core.start, required=False)
+lifecycle.on_startup("coingecko_symbol_index", coin_gecko.symbol_index.ensure_loaded)
+lifecycle.on_startup("mercado_bitcoin_catalog", store_mercado_bitcoin.catalog.ensure_loaded, required=False)
+lifecycle.on_startup("fx_rates", api_controller.fx_rate_service.ensure_loaded)
+lifecycle.on_startup("symbol_search", api_controller.symbol_search.ensure_loaded, required=False)
+if api_controller.prewarm.PREWARM_ENABLED:
+    lifecycle.on_startup("prewarm", api_controller.prewarm.start, required=False)
+
+# Encerramento: roda na ordem inversa, fechando os clientes compartilhados por último.
+lifecycle.on_shutdown("http_clients", HttpClient.close_all)
+lifecycle.on_shutdown("redis", api_controller.redis_core.close)
+lifecycle.on_shutdown("auth_hash_executor", lambda: auth_controller.hash_executor.shutdown(wait=False))
+lifecycle.on_shutdown("coingecko_symbol_index", coin_gecko.symbol_index.stop)
+lifecycle.on_shutdown("mercado_bitcoin_catalog", store_mercado_bitcoin.catalog.stop)
+lifecycle.on_shutdown("symbol_search", api_controller.symbol_search.stop)
+lifecycle.on_shutdown("fx_rates", api_controller.fx_rate_service.stop)
+lifecycle.on_shutdown("prewarm", api_controller.prewarm.stop)
+lifecycle.on_shutdown("stream", stream_controller.close)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Ciclo de vida do worker: inicia o aquecimento em segundo plano ao subir e
+    encerra tasks, pools e sessões ao descer.
+
+    Args:
+        app (FastAPI): A aplicação.
+    """
+    await lifecycle.startup()
+    yield
+    await lifecycle.shutdown()
+
 
 app = FastAPI(
     title="Mercado Bitcoin",
     description="<a href='#' target='__blank'>Teste Manoel Messias da Silva Neto</a>",
-    version="0.1.0"
+    version="0.1.0",
+    lifespan=lifespan,
 )
 
 # Configurar o CORS
@@ -25,6 +78,8 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+app.add_middleware(CompressionMiddleware)
+app.add_middleware(MetricsMiddleware)
 
 @app.get("/",tags=["HOME"])
 async def get_home():  
@@ -32,6 +87,11 @@ async def get_home():
 
 app.include_router(backend_api)
 app.include_router(backend_auth)
+app.include_router(backend_stream)
+app.include_router(backend_history)
+app.include_router(backend_metrics)
+app.include_router(backend_health)
+app.include_router(backend_search)
 
 
 async def http_exception_handler(request: Request, exc: StarletteHTTPException):
@@ -77,6 +137,29 @@ async def validation_exception_handler(request: Request, exc: RequestValidationE
         },
     )
 
+@app.exception_handler(RedisUnavailableError)
+async def redis_unavailable_exception_handler(request: Request, exc: RedisUnavailableError):
+    """
+    Manipulador de exceções para rotas que dependem do Redis enquanto ele
+    está indisponível (modo degradado).
+
+    Args:
+        request (Request): A requisição que causou a exceção.
+        exc (RedisUnavailableError): A exceção levantada.
+
+    Returns:
+        JSONResponse: Resposta JSON com código de status 503 e Retry-After.
+    """
+    return JSONResponse(
+        status_code=503,
+        headers={"Retry-After": str(math.ceil(api_controller.redis_core.REDIS_CIRCUIT_OPEN_TIME))},
+        content={
+            "status_code": 503,
+            "data": [],
+            "detail": "Serviço temporariamente indisponível.",
+        },
+    )
+
 @app.exception_handler(Exception)
 async def general_exception_handler(request: Request, exc: Exception):
     """
@@ -1,42 +1,733 @@
+import os
+import json
+import math
+import asyncio
 import logging
+import numpy as np
+from typing import Optional
 from fastapi import HTTPException
 from src.system.core.logger_core import logger
-from src.app.api.model import ApiOut, ApiFilter
+from src.app.auth.model import User
+from src.app.api.model import ApiOut, ApiFilter, ApiBatchFilter, ApiBatchOut
 from src.system.core.redis_core import RedisCore
+from src.system.core.history_core import HistoryCore
+from src.system.core.prewarm_core import PrewarmCore
+from src.system.core.http_cache_core import HttpCacheCore
+from src.system.core.singleflight_core import SingleFlightCore
+from src.system.core.circuit_breaker_core import CircuitBreakerCore, CircuitOpenError
+from src.system.core.rate_limit_core import RateLimitCore, RateLimitExceeded
+from src.system.core.metrics_core import metrics, UPSTREAM_REQUEST_DURATION, UPSTREAM_ERRORS
 from src.system.integrations.api_coin_gecko import CoinGecko
-from src.system.integrations.api_cotacao import Cotacao, FilterCotacao
+from src.system.integrations.api_cotacao import Cotacao
+from src.system.integrations.fx_rate_service import FxRateService
+from src.system.integrations.symbol_search_service import SymbolSearchService
 from src.system.integrations.api_store_mercado_bitcoin import StoreMercadoBitcoin
+from src.system.integrations.http_client import HttpClientError
 
 class ApiController():   
+    PROVIDER_STRATEGIES = ("priority", "race", "hedge")
+    PROVIDER_ORDERS = ("static", "latency")
+
     def __init__(self):
+        self.PROVIDER_STRATEGY = os.environ.get("PROVIDER_STRATEGY", "priority").lower()
+        if self.PROVIDER_STRATEGY not in self.PROVIDER_STRATEGIES:
+            raise ValueError(f"A variável de ambiente 'PROVIDER_STRATEGY' deve ser uma de {self.PROVIDER_STRATEGIES}.")
+        self.PROVIDER_ORDER = os.environ.get("PROVIDER_ORDER", "static").lower()
+        if self.PROVIDER_ORDER not in self.PROVIDER_ORDERS:
+            raise ValueError(f"A variável de ambiente 'PROVIDER_ORDER' deve ser uma de {self.PROVIDER_ORDERS}.")
+        self.PROVIDER_HEDGE_DELAY = float(os.environ.get("PROVIDER_HEDGE_DELAY", 0.3))
+        self.PROVIDER_TIMEOUT = float(os.environ.get("PROVIDER_TIMEOUT", 5))
+        self.BATCH_MAX_SYMBOLS = int(os.environ.get("BATCH_MAX_SYMBOLS", 200))
+        self.BATCH_CONCURRENCY = int(os.environ.get("BATCH_CONCURRENCY", 10))
+        self.FAST_RESPONSE = os.environ.get("FAST_RESPONSE", "true").lower() == "true"
         self.cotacao_integration = Cotacao()
         self.redis_core = RedisCore()
+        self.single_flight = SingleFlightCore(redis_core=self.redis_core)
+        self.fx_rate_service = FxRateService(cotacao=self.cotacao_integration, redis_core=self.redis_core)
+        self._background_tasks = set()
+        self.history = HistoryCore(redis_core=self.redis_core)
+        self.rate_limit = RateLimitCore(redis_core=self.redis_core)
+        self.prewarm = PrewarmCore(redis_core=self.redis_core, refresh=self.refresh_symbols)
+        self.http_cache = HttpCacheCore()
         self.CLASS_MAPPING = {
-            "StoreMercadoBitcoin":StoreMercadoBitcoin(),
-            "CoinGecko":CoinGecko(),
+            "StoreMercadoBitcoin":StoreMercadoBitcoin(redis_core=self.redis_core),
+            "CoinGecko":CoinGecko(redis_core=self.redis_core),
         }
+        self.symbol_search = SymbolSearchService(
+            coin_gecko=self.CLASS_MAPPING["CoinGecko"], store_mercado_bitcoin=self.CLASS_MAPPING["StoreMercadoBitcoin"],
+        )
+        self.circuit_breakers = {class_integracao: CircuitBreakerCore(name=class_integracao) for class_integracao in self.CLASS_MAPPING}
+        self._upstream_durations = {class_integracao: UPSTREAM_REQUEST_DURATION.labels(class_integracao) for class_integracao in self.CLASS_MAPPING}
+        metrics.gauge(
+            "upstream_circuit_open", "1 se o circuito da integração estiver aberto.", ("integration",),
+            function=lambda: {(name,): int(breaker.state == CircuitBreakerCore.OPEN) for name, breaker in self.circuit_breakers.items()},
+        )
+        metrics.gauge(
+            "upstream_latency_ewma_seconds", "EWMA da latência das integrações.", ("integration",),
+            function=lambda: {(name,): breaker.latency_ewma for name, breaker in self.circuit_breakers.items() if breaker.latency_ewma is not None},
+        )
+        metrics.gauge(
+            "search_index_entries", "Entradas no índice de busca de símbolos, por fonte.", ("source",),
+            function=lambda: {(source,): len(entries) for source, entries in self.symbol_search.index.sources.items()},
+        )
+        metrics.gauge(
+            "redis_degraded", "1 se o Redis estiver em modo degradado.",
+            function=lambda: {(): int(self.redis_core.mode == RedisCore.DEGRADED)},
+        )
+        metrics.gauge(
+            "redis_pending_writes", "Escritas de cache aguardando o Redis voltar.",
+            function=lambda: {(): len(self.redis_core.pending_writes)},
+        )
+
+    async def check_rate_limit(self, user: User) -> None:
+        """
+        Consome um token do limite de requisições do usuário.
+
+        Args:
+            user (User): O usuário autenticado.
+
+        Raises:
+            HTTPException: Levanta uma exceção 429, com o cabeçalho Retry-After,
+                        se o usuário excedeu o limite.
+        """
+        try:
+            await self.rate_limit.acquire_user(username=user.username)
+        except RateLimitExceeded as error:
+            raise self._too_many_requests(retry_after=error.retry_after)
+
+    @staticmethod
+    def _too_many_requests(retry_after: float) -> HTTPException:
+        return HTTPException(
+            status_code=429,
+            detail="Limite de requisições excedido.",
+            headers={"Retry-After": str(max(1, math.ceil(retry_after)))},
+        )
+
     async def search_coin_per_symbol(self, data: ApiFilter) -> ApiOut:
-            api_response=None
-            reponse_redis = await self.redis_core.get_redis(key=data.symbol)            
-            if reponse_redis:
-                logger(mensagem=":D -------- REDIS CACHED -------- :D",nivel=logging.WARNING)
-                return ApiOut(**reponse_redis)
-            for class_integracao in self.CLASS_MAPPING:
+        return ApiOut.model_validate_json(await self.search_coin_per_symbol_json(data=data))
+
+    async def search_coin_per_symbol_json(self, data: ApiFilter) -> str:
+        return (await self.search_coin_per_symbol_cached(data=data))[0]
+
+    async def search_coin_per_symbol_cached(self, data: ApiFilter) -> tuple:
+        """
+        Busca a cotação do símbolo já serializada em JSON.
+
+        O cache guarda o JSON canônico da cotação validada, então um acerto é
+        devolvido como está, sem passar pelo pydantic; uma falta é
+        serializada uma única vez, na gravação do cache.
+
+        Args:
+            data (ApiFilter): O símbolo a ser consultado.
+
+        Raises:
+            HTTPException: Levanta uma exceção 404 se nenhuma integração
+                        encontrar o símbolo, ou 429 se alguma integração foi
+                        pulada por ter excedido seu limite de requisições.
+
+        Returns:
+            tuple: O JSON de ApiOut, idêntico ao gerado pelo response_model, e
+                os segundos restantes até o TTL suave do cache (limitados a
+                FX_REFRESH_INTERVAL quando há `vs_currencies`).
+        """
+        currencies = self._parse_currencies(vs_currencies=data.vs_currencies)
+        serialized, ttl = await self._get_quote_json(symbol=data.symbol)
+        if currencies:
+            serialized = (await self._add_prices(responses={data.symbol: serialized}, currencies=currencies))[data.symbol]
+            ttl = min(ttl, self.fx_rate_service.FX_REFRESH_INTERVAL)
+        return serialized, ttl
+
+    async def _get_quote_json(self, symbol: str) -> tuple:
+        self.prewarm.record(symbol=symbol)
+        entry = await self.redis_core.get_entry_redis(key=self.redis_core.quote_key(symbol), with_ttl=True)
+        if entry:
+            reponse_redis, stale, ttl = entry
+            if stale:
+                self._refresh_in_background(symbol=symbol)
+            logger(mensagem=":D -------- REDIS CACHED -------- :D",nivel=logging.DEBUG)
+            return self._to_json(reponse_redis), ttl
+        serialized = await self.single_flight.do(
+            key=self.redis_core.quote_key(symbol),
+            fetch=lambda: self._fetch_and_cache(symbol=symbol),
+            read_cached=lambda: self._get_cached(symbol=symbol),
+        )
+        return serialized, float(self.redis_core.REDIS_TIME)
+
+    def cache_headers(self, content: str, ttl: Optional[float]) -> dict:
+        """
+        Monta os cabeçalhos ETag e Cache-Control de uma resposta de cotação.
+
+        Args:
+            content (str): O JSON da resposta.
+            ttl (float): Segundos restantes até o TTL suave do cache, ou None
+                         se a resposta não deve ser reaproveitada sem revalidação.
+
+        Returns:
+            dict: Os cabeçalhos de cache HTTP.
+        """
+        return self.http_cache.headers(content=content, ttl=ttl, stale_ttl=self.redis_core.REDIS_STALE_TIME)
+
+    def _parse_currencies(self, vs_currencies: Optional[str]) -> list:
+        """
+        Valida as moedas pedidas em `vs_currencies`.
+
+        Args:
+            vs_currencies (str): As moedas, já normalizadas ("BRL,USD").
+
+        Raises:
+            HTTPException: Levanta uma exceção 422 se alguma moeda não estiver
+                        em FX_CURRENCIES.
+
+        Returns:
+            list[str]: As moedas, ou uma lista vazia se nenhuma foi pedida.
+        """
+        if not vs_currencies:
+            return []
+        currencies = vs_currencies.split(",")
+        unsupported = [currency for currency in currencies if currency not in self.fx_rate_service.FX_CURRENCIES]
+        if unsupported:
+            raise HTTPException(
+                status_code=422,
+                detail=f"Moedas não suportadas: {', '.join(unsupported)}. Use {', '.join(self.fx_rate_service.FX_CURRENCIES)}.",
+            )
+        return currencies
+
+    async def _add_prices(self, responses: dict, currencies: list) -> dict:
+        """
+        Acrescenta ao JSON de cada cotação o preço nas moedas pedidas.
+
+        Cada integração informa `coin_price` na sua própria moeda (`currency`:
+        USD na CoinGecko, BRL no Mercado Bitcoin). Os N preços são levados a
+        reais pela cotação da moeda de origem e convertidos para as M moedas
+        com uma única divisão vetorizada (matriz N x M) pelas cotações em
+        memória do FxRateService; o JSON em cache não é alterado. Cotações
+        sem moeda de origem conhecida ficam com `prices` nulo.
+
+        Args:
+            responses (dict): Mapeamento símbolo -> JSON canônico da cotação.
+            currencies (list[str]): As moedas, em maiúsculas.
+
+        Raises:
+            HTTPException: Levanta uma exceção 503 se a cotação de alguma
+                        moeda estiver indisponível.
+
+        Returns:
+            dict: O mesmo mapeamento, com o campo `prices` preenchido.
+        """
+        if not responses:
+            return responses
+        symbols = list(responses)
+        quotes = [json.loads(responses[symbol]) for symbol in symbols]
+        sources = list(dict.fromkeys(quote["currency"] for quote in quotes if quote.get("currency")))
+        try:
+            rates = await self.fx_rate_service.get_conversion_rates(currencies=currencies + sources)
+        except Exception as error:
+            logger(mensagem=f":( Câmbio indisponível -> {error} :(",nivel=logging.WARNING)
+            raise HTTPException(status_code=503, detail="Cotação de câmbio indisponível.")
+        source_rates = dict(zip(sources, rates[len(currencies):].tolist()))
+        prices = np.array([quote.get("coin_price") for quote in quotes], dtype=np.float64)
+        prices *= np.array([source_rates.get(quote.get("currency"), np.nan) for quote in quotes], dtype=np.float64)
+        matrix = np.divide.outer(prices, rates[:len(currencies)])
+        keys = [currency.lower() for currency in currencies]
+        return {
+            symbol: self._with_prices(serialized=responses[symbol], prices=self._dumps(dict(zip(keys, row))) if price == price else "null")
+            for symbol, price, row in zip(symbols, prices.tolist(), matrix.tolist())
+        }
+
+    @staticmethod
+    def _with_prices(serialized: str, prices: str) -> str:
+        # `prices` é o último campo de ApiOut; entradas gravadas antes dele
+        # não têm o campo.
+        if serialized.endswith(',"prices":null}'):
+            serialized = serialized[:-len(',"prices":null}')] + "}"
+        return f'{serialized[:-1]},"prices":{prices}}}'
+
+    @staticmethod
+    def _dumps(content) -> str:
+        """
+        Serializa exatamente como o JSONResponse do FastAPI, para que as
+        respostas montadas a partir do cache tenham os mesmos bytes.
+
+        Args:
+            content (Any): O conteúdo, já em tipos compatíveis com JSON.
+
+        Returns:
+            str: O JSON compacto.
+        """
+        return json.dumps(content, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":"))
+
+    def _to_json(self, cached) -> str:
+        # Entradas gravadas antes do JSON canônico guardam o dicionário.
+        return cached if isinstance(cached, str) else self._dumps(cached)
+
+    async def search_coin_per_symbols(self, data: ApiBatchFilter) -> ApiBatchOut:
+        return ApiBatchOut.model_validate_json(await self.search_coin_per_symbols_json(data=data))
+
+    async def search_coin_per_symbols_json(self, data: ApiBatchFilter) -> str:
+        return (await self.search_coin_per_symbols_cached(data=data))[0]
+
+    async def search_coin_per_symbols_cached(self, data: ApiBatchFilter) -> tuple:
+        """
+        Busca as cotações de vários símbolos de uma vez.
+
+        Os símbolos em cache são resolvidos com um único MGET (os obsoletos são
+        servidos e atualizados em segundo plano); os demais são buscados nas
+        integrações na ordem de CLASS_MAPPING, em lote quando a integração
+        oferece `get_per_symbols`, e gravados em um único pipeline.
+        Símbolos não encontrados voltam com erro no próprio item, sem falhar
+        o lote inteiro.
+
+        Args:
+            data (ApiBatchFilter): Os símbolos a serem consultados.
+
+        Raises:
+            HTTPException: Levanta uma exceção 422 se o lote exceder
+                        BATCH_MAX_SYMBOLS, ou 429 se nenhum símbolo pôde
+                        ser resolvido por causa do limite das integrações.
+
+        Returns:
+            tuple: O JSON de ApiBatchOut, com um item por símbolo na ordem da
+                requisição, montado a partir do JSON canônico de cada cotação,
+                e os segundos restantes até o primeiro TTL suave entre as
+                cotações encontradas (None se nenhuma foi encontrada).
+        """
+        if len(data.symbols) > self.BATCH_MAX_SYMBOLS:
+            raise HTTPException(status_code=422, detail=f"Máximo de {self.BATCH_MAX_SYMBOLS} símbolos por requisição.")
+        currencies = self._parse_currencies(vs_currencies=data.vs_currencies)
+        for symbol in data.symbols:
+            self.prewarm.record(symbol=symbol)
+        responses = {}
+        ttls = []
+        for symbol, entry in zip(data.symbols, await self.redis_core.mget_entries_redis(keys=[self.redis_core.quote_key(symbol) for symbol in data.symbols], with_ttl=True)):
+            if entry:
+                reponse_redis, stale, ttl = entry
+                if stale:
+                    self._refresh_in_background(symbol=symbol)
+                responses[symbol] = self._to_json(reponse_redis)
+                ttls.append(ttl)
+        misses = [symbol for symbol in data.symbols if symbol not in responses]
+        rate_limited = []
+        if misses:
+            fetched = await self.refresh_symbols(symbols=misses, rate_limited=rate_limited)
+            responses.update(fetched)
+            if fetched:
+                ttls.append(float(self.redis_core.REDIS_TIME))
+        if currencies:
+            responses = await self._add_prices(responses=responses, currencies=currencies)
+            ttls.append(self.fx_rate_service.FX_REFRESH_INTERVAL)
+        logger(mensagem=f":D -------- BATCH {len(data.symbols) - len(misses)}/{len(data.symbols)} CACHED -------- :D",nivel=logging.DEBUG)
+        error = "Symbol não encontrado."
+        if rate_limited:
+            if not responses:
+                raise self._too_many_requests(retry_after=min(rate_limited))
+            error = f"Limite de requisições das integrações excedido. Tente novamente em {max(1, math.ceil(min(rate_limited)))}s."
+        error = self._dumps(error)
+        return '{"items":[' + ",".join(
+            f'{{"symbol":{self._dumps(symbol)},"data":{responses[symbol]},"error":null}}' if symbol in responses
+            else f'{{"symbol":{self._dumps(symbol)},"data":null,"error":{error}}}'
+            for symbol in data.symbols
+        ) + ']}', min(ttls) if responses else None
+
+    async def refresh_symbols(self, symbols: list, rate_limited: Optional[list] = None) -> dict:
+        """
+        Busca vários símbolos nas integrações e grava o resultado no cache
+        em um único pipeline, independentemente do que já estiver armazenado.
+
+        Args:
+            symbols (list[str]): Os símbolos a serem atualizados.
+            rate_limited (list[float], optional): Recebe o Retry-After de cada
+                                                  integração pulada por limite.
+
+        Returns:
+            dict: Um dicionário que mapeia cada símbolo encontrado ao JSON
+                canônico da sua cotação.
+        """
+        fetched = await self._fetch_many(symbols=symbols, rate_limited=rate_limited)
+        serialized = {symbol: self._dumps(api_response.model_dump(mode="json")) for symbol, api_response in fetched.items()}
+        if fetched:
+            await self.redis_core.set_entries_redis(data={self.redis_core.quote_key(symbol): value for symbol, value in serialized.items()})
+            await self._record_history(responses=list(fetched.values()))
+        return serialized
+
+    async def _fetch_many(self, symbols: list, rate_limited: Optional[list] = None) -> dict:
+        """
+        Busca vários símbolos nas integrações, na ordem de `_ordered_integrations`.
+
+        Integrações com `get_per_symbols` (e `batch_available`, quando
+        definido, verdadeiro) recebem todos os símbolos pendentes em uma única
+        chamada, que consome do limite da integração uma requisição por
+        chamada ao upstream (`batch_cost`, quando definido); as demais são
+        consultadas por símbolo, com no máximo BATCH_CONCURRENCY chamadas
+        simultâneas.
+
+        Args:
+            symbols (list[str]): Os símbolos a serem buscados.
+            rate_limited (list[float], optional): Recebe o Retry-After de cada
+                                                  integração pulada por limite.
+
+        Returns:
+            dict: Um dicionário que mapeia cada símbolo encontrado à sua cotação.
+        """
+        responses = {}
+        rate_limited = [] if rate_limited is None else rate_limited
+        semaphore = asyncio.Semaphore(self.BATCH_CONCURRENCY)
+
+        async def get_one(class_integracao: str, symbol: str):
+            async with semaphore:
                 try:
-                    api_response = ApiOut(**self.CLASS_MAPPING.get(class_integracao).get_per_symbol(symbol=data.symbol))
-                    break
+                    return symbol, await self._get_from_integration(class_integracao=class_integracao, symbol=symbol)
+                except RateLimitExceeded as error:
+                    rate_limited.append(error.retry_after)
+                    return symbol, None
+                except Exception:
+                    return symbol, None
+
+        for class_integracao in self._ordered_integrations():
+            integracao = self.CLASS_MAPPING[class_integracao]
+            pending = [symbol for symbol in symbols if symbol not in responses]
+            if not pending:
+                break
+            if hasattr(integracao, "get_per_symbols") and getattr(integracao, "batch_available", True):
+                try:
+                    response = await self._call_integration(
+                        class_integracao=class_integracao,
+                        call=lambda: integracao.get_per_symbols(symbols=pending),
+                        cost=integracao.batch_cost(symbols=pending) if hasattr(integracao, "batch_cost") else 1,
+                    )
+                    responses.update({symbol: ApiOut(**item) for symbol, item in response.items()})
+                except CircuitOpenError:
+                    pass
+                except RateLimitExceeded as error:
+                    rate_limited.append(error.retry_after)
                 except Exception as error:
-                    logger(mensagem=f":( Erro na consulta da integração {class_integracao} :(",nivel=logging.WARNING)
-            if not api_response:
-                raise HTTPException(status_code=404, detail="Symbol não encontrado.")
-            if api_response.coin_price_dolar==0.0:
-                response_cotacao = self.cotacao_integration.get_cotacao(
-                    filter=FilterCotacao(moeda="USD-BRL")
-                )                
-                api_response.coin_price_dolar=response_cotacao.high * float(api_response.coin_price)
-
-            await self.redis_core.setnx_redis(key=data.symbol, data=api_response.model_dump_json())
-            await self.redis_core.expire_redis(key=data.symbol)
-            logger(mensagem=":D -------- SEND CACHED -------- :D",nivel=logging.INFO)
-            return api_response
+                    logger(mensagem=f":( Erro na consulta em lote da integração {class_integracao} :(",nivel=logging.WARNING)
+                continue
+            for symbol, api_response in await asyncio.gather(*[get_one(class_integracao, symbol) for symbol in pending]):
+                if api_response:
+                    responses[symbol] = api_response
+
+        if any(api_response.coin_price_dolar == 0.0 for api_response in responses.values()):
+            response_cotacao, fx_rate_age = await self.fx_rate_service.get_rate(pair="USD-BRL")
+            for api_response in responses.values():
+                if api_response.coin_price_dolar == 0.0:
+                    api_response.coin_price_dolar = float(api_response.coin_price) / response_cotacao.bid
+                    api_response.fx_rate_age = fx_rate_age
+        return responses
+
+    def _refresh_in_background(self, symbol: str) -> None:
+        """
+        Agenda a atualização de uma cotação obsoleta sem bloquear a requisição.
+        Atualizações concorrentes do mesmo símbolo são coalescidas.
+
+        Args:
+            symbol (str): O símbolo da criptomoeda.
+        """
+        task = asyncio.ensure_future(self.single_flight.do(
+            key=self.redis_core.quote_key(symbol),
+            fetch=lambda: self._fetch_and_cache(symbol=symbol),
+            read_cached=lambda: self._get_cached(symbol=symbol, fresh_only=True),
+        ))
+        self._background_tasks.add(task)
+        task.add_done_callback(self._on_background_refresh_done)
+
+    def _on_background_refresh_done(self, task: asyncio.Task) -> None:
+        self._background_tasks.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            logger(mensagem=f":( Erro na atualização em segundo plano -> {task.exception()} :(",nivel=logging.WARNING)
+
+    async def _get_cached(self, symbol: str, fresh_only: bool = False) -> Optional[str]:
+        """
+        Busca a cotação do símbolo no cache.
+
+        Args:
+            symbol (str): O símbolo da criptomoeda.
+            fresh_only (bool, optional): Se True, ignora valores que já passaram
+                                         do TTL suave.
+
+        Returns:
+            str: O JSON da cotação em cache, ou None se não houver.
+        """
+        entry = await self.redis_core.get_entry_redis(key=self.redis_core.quote_key(symbol))
+        if not entry or (fresh_only and entry[1]):
+            return None
+        return self._to_json(entry[0])
+
+    async def _fetch_and_cache(self, symbol: str) -> str:
+        """
+        Busca a cotação nas integrações, converte o preço para dólar se
+        necessário (com a cotação em memória do FxRateService) e grava o
+        resultado no cache.
+
+        Args:
+            symbol (str): O símbolo da criptomoeda.
+
+        Raises:
+            HTTPException: Levanta uma exceção 404 se nenhuma integração
+                        encontrar o símbolo, ou 429 se alguma integração foi
+                        pulada por ter excedido seu limite de requisições.
+
+        Returns:
+            str: O JSON canônico da cotação encontrada, o mesmo gravado no cache.
+        """
+        if self.PROVIDER_STRATEGY == "race":
+            api_response = await self._search_hedged(symbol=symbol, hedge_delay=0)
+        elif self.PROVIDER_STRATEGY == "hedge":
+            api_response = await self._search_hedged(symbol=symbol, hedge_delay=self.PROVIDER_HEDGE_DELAY)
+        else:
+            api_response = await self._search_priority(symbol=symbol)
+        if not api_response:
+            raise HTTPException(status_code=404, detail="Symbol não encontrado.")
+        if api_response.coin_price_dolar==0.0:
+            response_cotacao, fx_rate_age = await self.fx_rate_service.get_rate(pair="USD-BRL")
+            api_response.coin_price_dolar=float(api_response.coin_price) / response_cotacao.bid
+            api_response.fx_rate_age=fx_rate_age
+
+        serialized = self._dumps(api_response.model_dump(mode="json"))
+        await self.redis_core.set_entry_redis(key=self.redis_core.quote_key(symbol), data=serialized)
+        await self._record_history(responses=[api_response])
+        logger(mensagem=":D -------- SEND CACHED -------- :D",nivel=logging.INFO)
+        return serialized
+
+    async def _record_history(self, responses: list) -> None:
+        """
+        Grava as cotações buscadas na série histórica. Falhas são apenas
+        registradas em log para não afetar a resposta.
+
+        Args:
+            responses (list[ApiOut]): As cotações buscadas.
+        """
+        try:
+            await self.history.record_many(observations=[api_response.model_dump() for api_response in responses])
+        except Exception as error:
+            logger(mensagem=f":( Erro ao gravar histórico -> {error} :(",nivel=logging.WARNING)
+
+    async def _get_from_integration(self, class_integracao: str, symbol: str) -> ApiOut:
+        """
+        Consulta uma integração respeitando o prazo individual de cada provedor.
+
+        Args:
+            class_integracao (str): Nome da integração em CLASS_MAPPING.
+            symbol (str): O símbolo da criptomoeda.
+
+        Raises:
+            CircuitOpenError: Se o circuito da integração estiver aberto.
+            RateLimitExceeded: Se a integração excedeu seu limite de requisições.
+            Exception: Se a integração falhar ou exceder PROVIDER_TIMEOUT.
+
+        Returns:
+            ApiOut: A cotação retornada pela integração.
+        """
+        try:
+            response = await self._call_integration(
+                class_integracao=class_integracao,
+                call=lambda: self.CLASS_MAPPING.get(class_integracao).get_per_symbol(symbol=symbol),
+            )
+            return ApiOut(**response)
+        except (CircuitOpenError, RateLimitExceeded):
+            raise
+        except Exception as error:
+            logger(mensagem=f":( Erro na consulta da integração {class_integracao} :(",nivel=logging.WARNING)
+            raise error
+
+    async def _call_integration(self, class_integracao: str, call, cost: int = 1):
+        """
+        Executa uma chamada à integração passando pelo circuit breaker e pelo
+        limite de requisições da integração, e registra a latência e o
+        resultado nas estatísticas de saúde.
+
+        Apenas erros de transporte, códigos 429/5xx e estouros de
+        PROVIDER_TIMEOUT contam como falha do provedor; um símbolo não
+        encontrado é uma resposta válida. Integrações que estejam respondendo
+        da memória (`serves_from_memory`) não consomem o limite de requisições.
+
+        Args:
+            class_integracao (str): Nome da integração em CLASS_MAPPING.
+            call (Callable): Função sem argumentos que retorna a corrotina da chamada.
+            cost (int, optional): Quantas chamadas ao upstream a chamada faz
+                                  (consultas em lote fazem uma por lote).
 
+        Raises:
+            CircuitOpenError: Se o circuito da integração estiver aberto.
+            RateLimitExceeded: Se a integração excedeu seu limite de requisições.
+            Exception: O erro levantado pela chamada.
+
+        Returns:
+            Any: O retorno da chamada.
+        """
+        circuit_breaker = self.circuit_breakers[class_integracao]
+        if not circuit_breaker.allow():
+            UPSTREAM_ERRORS.labels(class_integracao, "circuit_open").inc()
+            raise CircuitOpenError(name=class_integracao)
+        try:
+            if not getattr(self.CLASS_MAPPING[class_integracao], "serves_from_memory", False):
+                await self.rate_limit.acquire_provider(name=class_integracao, cost=cost)
+        except RateLimitExceeded:
+            circuit_breaker.record_cancelled()
+            UPSTREAM_ERRORS.labels(class_integracao, "rate_limited").inc()
+            raise
+        loop = asyncio.get_running_loop()
+        started_at = loop.time()
+        try:
+            response = await asyncio.wait_for(call(), timeout=self.PROVIDER_TIMEOUT)
+        except asyncio.CancelledError:
+            circuit_breaker.record_cancelled()
+            raise
+        except Exception as error:
+            latency = loop.time() - started_at
+            self._upstream_durations[class_integracao].observe(latency)
+            if self._is_provider_failure(error=error):
+                circuit_breaker.record_failure(latency=latency, error=error)
+                UPSTREAM_ERRORS.labels(class_integracao, "timeout" if isinstance(error, asyncio.TimeoutError) else "failure").inc()
+            else:
+                circuit_breaker.record_success(latency=latency)
+                UPSTREAM_ERRORS.labels(class_integracao, "not_found").inc()
+            raise error
+        latency = loop.time() - started_at
+        self._upstream_durations[class_integracao].observe(latency)
+        circuit_breaker.record_success(latency=latency)
+        return response
+
+    @staticmethod
+    def _is_provider_failure(error: Exception) -> bool:
+        if isinstance(error, asyncio.TimeoutError):
+            return True
+        if isinstance(error, HttpClientError):
+            return error.status_code is None or error.status_code == 429 or error.status_code >= 500
+        return False
+
+    def _ordered_integrations(self) -> list:
+        """
+        Retorna as integrações na ordem de consulta.
+
+        Com PROVIDER_ORDER=static (padrão), usa a ordem de CLASS_MAPPING; com
+        PROVIDER_ORDER=latency, ordena pela EWMA da latência observada
+        (integrações ainda sem medição mantêm a posição de CLASS_MAPPING à
+        frente das demais). Como cada integração cota em uma moeda (BRL no
+        Mercado Bitcoin, USD na CoinGecko), a ordem por latência pode trocar a
+        moeda de `coin_price` de uma consulta para a outra. Integrações com o
+        circuito aberto vão para o fim.
+
+        Returns:
+            list[str]: Os nomes das integrações.
+        """
+        ordered = list(self.CLASS_MAPPING)
+        if self.PROVIDER_ORDER == "latency":
+            ordered.sort(key=lambda class_integracao: self.circuit_breakers[class_integracao].latency_ewma or 0.0)
+        ordered.sort(key=lambda class_integracao: self.circuit_breakers[class_integracao].state == CircuitBreakerCore.OPEN)
+        return ordered
+
+    async def _search_priority(self, symbol: str) -> Optional[ApiOut]:
+        """
+        Consulta as integrações uma a uma, na ordem de `_ordered_integrations`,
+        pulando as que estão com o circuito aberto.
+
+        Args:
+            symbol (str): O símbolo da criptomoeda.
+
+        Raises:
+            HTTPException: Levanta uma exceção 429 se nenhuma integração
+                        responder e alguma tiver sido pulada por limite.
+
+        Returns:
+            ApiOut: A primeira cotação válida, ou None se nenhuma integração responder.
+        """
+        errors = []
+        for class_integracao in self._ordered_integrations():
+            try:
+                return await self._get_from_integration(class_integracao=class_integracao, symbol=symbol)
+            except Exception as error:
+                errors.append(error)
+        self._raise_if_rate_limited(errors=errors)
+        return None
+
+    def _raise_if_rate_limited(self, errors: list) -> None:
+        retry_afters = [error.retry_after for error in errors if isinstance(error, RateLimitExceeded)]
+        if retry_afters:
+            raise self._too_many_requests(retry_after=min(retry_afters))
+
+    async def _search_hedged(self, symbol: str, hedge_delay: float) -> Optional[ApiOut]:
+        """
+        Dispara as integrações de forma concorrente e retorna a primeira cotação válida.
+
+        Cada integração é disparada `hedge_delay` segundos depois da anterior, ou
+        imediatamente se a anterior falhar antes disso. Com `hedge_delay=0` todas
+        são disparadas ao mesmo tempo. Integrações com o circuito aberto falham
+        na hora e liberam a próxima. As consultas restantes são canceladas assim
+        que uma resposta válida chega.
+
+        Args:
+            symbol (str): O símbolo da criptomoeda.
+            hedge_delay (float): Atraso, em segundos, entre o disparo de cada integração.
+
+        Raises:
+            HTTPException: Levanta uma exceção 429 se nenhuma integração
+                        responder e alguma tiver sido pulada por limite.
+
+        Returns:
+            ApiOut: A primeira cotação válida, ou None se nenhuma integração responder.
+        """
+        queue = self._ordered_integrations()
+        pending = set()
+        errors = []
+        try:
+            while queue or pending:
+                timeout = None
+                if queue:
+                    class_integracao = queue.pop(0)
+                    pending.add(asyncio.create_task(
+                        self._get_from_integration(class_integracao=class_integracao, symbol=symbol)
+                    ))
+                    if queue:
+                        if hedge_delay <= 0:
+                            continue
+                        timeout = hedge_delay
+                done, pending = await asyncio.wait(pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        return task.result()
+                    errors.append(task.exception())
+            self._raise_if_rate_limited(errors=errors)
+            return None
+        finally:
+            for task in pending:
+                task.cancel()
+
+    def get_fx_rates(self) -> dict:
+        """
+        Retorna as cotações de câmbio em memória e a idade de cada uma.
+
+        Returns:
+            dict: O estado do FxRateService por par de moedas.
+        """
+        return self.fx_rate_service.get_rates()
+
+    def get_providers(self) -> dict:
+        """
+        Retorna a ordem de consulta atual e o estado do circuit breaker e as
+        estatísticas de saúde de cada integração (por worker).
+
+        Returns:
+            dict: A ordem das integrações e as estatísticas de cada uma.
+        """
+        return {
+            "strategy": self.PROVIDER_STRATEGY,
+            "order": self._ordered_integrations(),
+            "providers": {
+                class_integracao: circuit_breaker.stats()
+                for class_integracao, circuit_breaker in self.circuit_breakers.items()
+            },
+        }
+
+    def get_health(self) -> dict:
+        """
+        Retorna o modo de operação do worker: "ok", ou "degraded" quando o
+        Redis está indisponível e as leituras vêm do cache em memória.
+
+        Returns:
+            dict: O status e as estatísticas do Redis.
+        """
+        redis_stats = self.redis_core.stats()
+        return {
+            "status": "ok" if redis_stats["mode"] == RedisCore.NORMAL else "degraded",
+            "redis": redis_stats,
+        }
@@ -1,4 +1,4 @@
-from typing import Optional
+from typing import Dict, List, Optional
 from datetime import datetime
 from pydantic import BaseModel, field_validator
 
@@ -8,14 +8,48 @@ class ApiOut(BaseModel):
     coin_price: Optional[float] 
     coin_price_dolar: Optional[float] 
     date_consult: Optional[datetime] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    fx_rate_age: Optional[float] = None
+    currency: Optional[str] = None
+    prices: Optional[Dict[str, float]] = None
     
     class Config:
         from_attributes = True
 
+def normalize_currencies(value: Optional[str]) -> Optional[str]:
+    if not value:
+        return None
+    currencies = [currency.strip().upper() for currency in value.split(",")]
+    return ",".join(dict.fromkeys(currency for currency in currencies if currency)) or None
+
 class ApiFilter(BaseModel):
   symbol : str
+  vs_currencies : Optional[str] = None
   
   @field_validator('symbol', mode="after")
   def set_symbol_lower(cls, value):
       return value.lower() if value else value
 
+  @field_validator('vs_currencies', mode="after")
+  def set_currencies_upper(cls, value):
+      return normalize_currencies(value)
+
+class ApiBatchFilter(BaseModel):
+  symbols : List[str]
+  vs_currencies : Optional[str] = None
+
+  @field_validator('vs_currencies', mode="after")
+  def set_currencies_upper(cls, value):
+      return normalize_currencies(value)
+
+  @field_validator('symbols', mode="after")
+  def split_symbols_lower(cls, value):
+      symbols = [symbol.strip().lower() for item in value for symbol in item.split(",")]
+      return list(dict.fromkeys(symbol for symbol in symbols if symbol))
+
+class ApiBatchItem(BaseModel):
+    symbol: str
+    data: Optional[ApiOut] = None
+    error: Optional[str] = None
+
+class ApiBatchOut(BaseModel):
+    items: List[ApiBatchItem]
@@ -1,22 +1,51 @@
-from typing import Annotated
-from fastapi import APIRouter, Depends
+from typing import Annotated, List, Optional
+from fastapi import APIRouter, Depends, Query, Request, Response
 from fastapi.encoders import jsonable_encoder
 
 from src.app.auth.model import User
-from src.app.api.model import ApiFilter, ApiOut
+from src.app.api.model import ApiFilter, ApiOut, ApiBatchFilter, ApiBatchOut
 from src.app.api.controller import ApiController
-from src.app.auth.controller import AuthController
+from src.app.auth.route import auth_controller
 
 
 #CONFIG-CONFIG-CONFIG-CONFIG-CONFIG-CONFIG-CONFIG-CONFIG-CONFIG-CONFIG-CONFIG-CONFIG-CONFIG-CONFIG-CONFIG-CONFIG-CONFIG-CONFIG-CONFIG-CONFIG-CONFIG-CONFIG-CONFIG#
 backend = APIRouter()
 
 api_controller= ApiController()
-auth_controller = AuthController()
+
+async def get_rate_limited_user(current_user: Annotated[User, Depends(auth_controller.get_current_user)]) -> User:
+    await api_controller.check_rate_limit(user=current_user)
+    return current_user
 
 #BACKEND-BACKEND-BACKEND-BACKEND-BACKEND-BACKEND-BACKEND-BACKEND-BACKEND-BACKEND-BACKEND-BACKEND-BACKEND-BACKEND-BACKEND-BACKEND-BACKEND-BACKEND-BACKEND-BACKEND#
 @backend.get("/api",response_model=ApiOut, tags=["SEARCH"])
-async def get_coin_per_symbo(current_user: Annotated[User, Depends(auth_controller.get_current_user)],data:Annotated[ApiFilter,Depends()],):  
-    result = jsonable_encoder( await api_controller.search_coin_per_symbol(data=data))    
+async def get_coin_per_symbo(request: Request, response: Response, current_user: Annotated[User, Depends(get_rate_limited_user)],data:Annotated[ApiFilter,Depends()],):  
+    content, ttl = await api_controller.search_coin_per_symbol_cached(data=data)
+    headers = api_controller.cache_headers(content=content, ttl=ttl)
+    if api_controller.http_cache.not_modified(if_none_match=request.headers.get("If-None-Match"), headers=headers):
+        return Response(status_code=304, headers=headers)
+    if api_controller.FAST_RESPONSE:
+        return Response(content=content, media_type="application/json", headers=headers)
+    response.headers.update(headers)
+    result = jsonable_encoder(ApiOut.model_validate_json(content))
+    return result
+
+@backend.get("/api/batch",response_model=ApiBatchOut, tags=["SEARCH"])
+async def get_coin_per_symbols(request: Request, response: Response, current_user: Annotated[User, Depends(get_rate_limited_user)],symbols:Annotated[List[str],Query(description="Símbolos separados por vírgula ou repetidos.")],vs_currencies:Annotated[Optional[str],Query(description="Moedas separadas por vírgula, por exemplo brl,usd,eur.")]=None,):
+    content, ttl = await api_controller.search_coin_per_symbols_cached(data=ApiBatchFilter(symbols=symbols, vs_currencies=vs_currencies))
+    headers = api_controller.cache_headers(content=content, ttl=ttl)
+    if api_controller.http_cache.not_modified(if_none_match=request.headers.get("If-None-Match"), headers=headers):
+        return Response(status_code=304, headers=headers)
+    if api_controller.FAST_RESPONSE:
+        return Response(content=content, media_type="application/json", headers=headers)
+    response.headers.update(headers)
+    result = jsonable_encoder(ApiBatchOut.model_validate_json(content))
     return result
 
+@backend.get("/api/fx", tags=["SEARCH"])
+async def get_fx_rates(current_user: Annotated[User, Depends(auth_controller.get_current_user)],):
+    return api_controller.get_fx_rates()
+
+@backend.get("/api/providers", tags=["SEARCH"])
+async def get_providers(current_user: Annotated[User, Depends(auth_controller.get_current_user)],):
+    return api_controller.get_providers()
@@ -1,49 +1,72 @@
-from typing import Annotated
+import os
+import time
+import asyncio
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Annotated, Optional
 
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 
-from src.app.auth.model import  UserInDB
+from src.app.auth.model import User, UserInDB
+from src.system.core.metrics_core import CACHE_REQUESTS
+from src.system.core.token_core import InvalidTokenError, token_core, password_hasher
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
 
+TOKEN_HITS = CACHE_REQUESTS.labels("token", "hit")
+TOKEN_MISSES = CACHE_REQUESTS.labels("token", "miss")
+
+
 class AuthController:
     def __init__(self) -> None:
         """
         Inicializa a classe e configura um banco de dados simulado de usuários.
 
-        O banco de dados contém usuários fictícios com informações como nome de 
-        usuário, nome completo, e-mail, senha hash e status de desativação.
+        O banco de dados contém usuários fictícios com informações como nome de
+        usuário, nome completo, e-mail, senha hash (PBKDF2) e status de
+        desativação. Os hashes de senha rodam em um pool de AUTH_HASH_WORKERS
+        threads, e os tokens já verificados ficam em um cache limitado a
+        AUTH_TOKEN_CACHE_SIZE entradas.
         """
+        self.AUTH_HASH_WORKERS = int(os.environ.get("AUTH_HASH_WORKERS", 2))
+        self.AUTH_TOKEN_CACHE_SIZE = int(os.environ.get("AUTH_TOKEN_CACHE_SIZE", 1024))
+        self.token_core = token_core
+        self.password_hasher = password_hasher
+        self.hash_executor = ThreadPoolExecutor(max_workers=self.AUTH_HASH_WORKERS, thread_name_prefix="auth-hash")
+        self.verified_tokens: OrderedDict[str, tuple[float, User]] = OrderedDict()
         self.fake_users_db = {
             "teste": {
                 "username": "teste",
                 "full_name": "teste teste",
                 "email": "teste@example.com",
-                "hashed_password": "fakehashedteste",
+                "hashed_password": "pbkdf2_sha256$600000$W4WBvpirMkWdta2YSimWDA$d5UsdqxAeTHzhGfcuHBhGw12w1gJujCnkLDhLlPi6FE",
                 "disabled": False,
             },
             "alice": {
                 "username": "alice",
                 "full_name": "Alice Wonderson",
                 "email": "alice@example.com",
-                "hashed_password": "fakehashedsecret",
+                "hashed_password": "pbkdf2_sha256$600000$yshfulbuOAh1VLLs5jBkgw$T8kbYejlCBTVp5pLhpDWWqi8QCqvvgYClXpTxw3k3AU",
                 "disabled": True,
             },
         }
+        # Hash usado quando o usuário não existe, para que o login leve o
+        # mesmo tempo e não revele quais usuários estão cadastrados.
+        self._dummy_hash = self.fake_users_db["teste"]["hashed_password"]
 
-    @staticmethod
-    def fake_hash_password(password: str) -> str:
+    async def verify_password(self, password: str, hashed_password: str) -> bool:
         """
-        Simula o hashing de uma senha.
+        Confere uma senha com o hash guardado fora do event loop.
 
         Args:
-            password (str): A senha a ser hashada.
+            password (str): A senha informada.
+            hashed_password (str): O hash guardado.
 
         Returns:
-            str: A senha hashada simulada, prefixada com "fakehashed".
+            bool: True se a senha confere.
         """
-        return "fakehashed" + password
+        return await asyncio.get_running_loop().run_in_executor(self.hash_executor, self.password_hasher.verify, password, hashed_password)
 
     def get_user(self, username: str) -> UserInDB:
         """
@@ -61,20 +84,70 @@ class AuthController:
             return UserInDB(**user_dict)
         return None
 
-    def fake_decode_token(self, token: str) -> UserInDB:
+    async def authenticate(self, username: str, password: str) -> Optional[UserInDB]:
+        """
+        Confere as credenciais de um usuário.
+
+        Args:
+            username (str): O nome de usuário.
+            password (str): A senha informada.
+
+        Returns:
+            UserInDB: O usuário, ou None se não existir, a senha não conferir
+                      ou ele estiver desativado.
+        """
+        user = self.get_user(username)
+        valid = await self.verify_password(password, user.hashed_password if user else self._dummy_hash)
+        if not user or not valid or user.disabled:
+            return None
+        return user
+
+    def create_access_token(self, user: User) -> str:
         """
-        Simula a decodificação de um token para recuperar o usuário associado.
+        Emite um token de acesso assinado com os dados públicos do usuário.
+
+        Args:
+            user (User): O usuário autenticado.
+
+        Returns:
+            str: O token de acesso.
+        """
+        return self.token_core.encode(subject=user.username, claims={"email": user.email, "full_name": user.full_name})
+
+    async def decode_token(self, token: str) -> Optional[User]:
+        """
+        Verifica um token e recupera o usuário associado, sem consultar o
+        banco de usuários. Tokens já verificados são servidos do cache até
+        expirarem. É assíncrono (só há HMAC, sem I/O) para rodar sempre no
+        event loop: o cache não é compartilhado entre threads.
 
         Args:
             token (str): O token a ser decodificado.
 
         Returns:
-            UserInDB: Um objeto UserInDB correspondente ao usuário associado
-                    ao token.
+            User: O usuário do token, ou None se o token não for válido.
         """
-        return self.get_user(token)
+        cached = self.verified_tokens.get(token)
+        if cached is not None:
+            expires_at, user = cached
+            if expires_at + self.token_core.AUTH_TOKEN_LEEWAY >= time.time():
+                self.verified_tokens.move_to_end(token)
+                TOKEN_HITS.inc()
+                return user
+            self.verified_tokens.pop(token, None)
+        TOKEN_MISSES.inc()
+        try:
+            claims = self.token_core.decode(token)
+        except InvalidTokenError:
+            return None
+        user = User(username=claims["sub"], email=claims.get("email"), full_name=claims.get("full_name"), disabled=False)
+        if self.AUTH_TOKEN_CACHE_SIZE > 0:
+            self.verified_tokens[token] = (claims["exp"], user)
+            while len(self.verified_tokens) > self.AUTH_TOKEN_CACHE_SIZE:
+                self.verified_tokens.popitem(last=False)
+        return user
 
-    def get_current_user(self, token: Annotated[str, Depends(oauth2_scheme)]) -> UserInDB:
+    async def get_current_user(self, token: Annotated[str, Depends(oauth2_scheme)]) -> User:
         """
         Obtém o usuário atual a partir do token fornecido.
 
@@ -83,18 +156,16 @@ class AuthController:
 
         Raises:
             HTTPException: Levanta uma exceção 401 se o token não for válido
-                        ou se o usuário estiver desativado.
+                        ou estiver expirado.
 
         Returns:
-            UserInDB: O objeto UserInDB correspondente ao usuário atual.
+            User: O objeto User correspondente ao usuário atual.
         """
-        user = self.fake_decode_token(token)
+        user = await self.decode_token(token)
         if not user:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Unauthorized",
                 headers={"WWW-Authenticate": "Bearer"},
             )
-        if user.disabled:
-            raise HTTPException(status_code=401, detail="Unauthorized")
         return user
@@ -2,7 +2,7 @@ from typing import Annotated
 from fastapi import Depends,APIRouter,  HTTPException
 from fastapi.security import OAuth2PasswordRequestForm
 
-from src.app.auth.model import User, UserInDB
+from src.app.auth.model import User
 from src.app.auth.controller import AuthController
 
 
@@ -22,21 +22,23 @@ async def login(form_data: Annotated[OAuth2PasswordRequestForm, Depends()]):
                                                 usuário e senha.
 
     Raises:
-        HTTPException: Levanta uma exceção 401 se o usuário não for encontrado 
-                       ou se a senha estiver incorreta.
+        HTTPException: Levanta uma exceção 401 se o usuário não for encontrado,
+                       se a senha estiver incorreta ou se ele estiver
+                       desativado.
 
     Returns:
-        dict: Um dicionário contendo o token de acesso e o tipo do token.
+        dict: Um dicionário contendo o token de acesso assinado, o tipo do
+              token e a validade em segundos.
     """
-    user_dict = auth_controller.get_user(username=form_data.username)
-    if not user_dict:
-        raise HTTPException(status_code=401, detail="Unauthorized")    
-    user = UserInDB.model_validate(user_dict.model_dump())
-    hashed_password = auth_controller.fake_hash_password(form_data.password)
-    if hashed_password != user.hashed_password:
+    user = await auth_controller.authenticate(username=form_data.username, password=form_data.password)
+    if not user:
         raise HTTPException(status_code=401, detail="Unauthorized")
-    
-    return {"access_token": user.username, "token_type": "bearer"}
+
+    return {
+        "access_token": auth_controller.create_access_token(user),
+        "token_type": "bearer",
+        "expires_in": auth_controller.token_core.AUTH_TOKEN_TTL,
+    }
 
 @backend.get("/users/me", response_model=User, tags=["AUTH"])
 async def read_users_me(current_user: Annotated[User, Depends(auth_controller.get_current_user)]):
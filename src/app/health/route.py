@@ -0,0 +1,35 @@
+from fastapi import APIRouter
+from fastapi.responses import JSONResponse
+
+from src.app.api.route import api_controller
+from src.system.core.lifecycle_core import lifecycle
+
+
+#CONFIG-CONFIG-CONFIG-CONFIG-CONFIG-CONFIG-CONFIG-CONFIG-CONFIG-CONFIG-CONFIG-CONFIG-CONFIG-CONFIG-CONFIG-CONFIG-CONFIG-CONFIG-CONFIG-CONFIG-CONFIG-CONFIG-CONFIG#
+backend = APIRouter()
+
+#BACKEND-BACKEND-BACKEND-BACKEND-BACKEND-BACKEND-BACKEND-BACKEND-BACKEND-BACKEND-BACKEND-BACKEND-BACKEND-BACKEND-BACKEND-BACKEND-BACKEND-BACKEND-BACKEND-BACKEND#
+@backend.get("/health", tags=["HEALTH"])
+async def get_health():
+    """
+    Informa se o worker está operando normalmente ou em modo degradado
+    (Redis indisponível, servindo do cache em memória).
+    """
+    return api_controller.get_health()
+
+@backend.get("/health/live", tags=["HEALTH"])
+async def get_liveness():
+    """
+    Liveness: responde 200 enquanto o processo estiver de pé, inclusive
+    durante o aquecimento.
+    """
+    return {"status": "alive"}
+
+@backend.get("/health/ready", tags=["HEALTH"])
+async def get_readiness():
+    """
+    Readiness: responde 200 quando o aquecimento terminou e o worker pode
+    receber tráfego, e 503 enquanto ele está aquecendo ou encerrando. Inclui
+    o tempo até ficar pronto e a situação de cada etapa.
+    """
+    return JSONResponse(status_code=200 if lifecycle.ready else 503, content=lifecycle.stats())
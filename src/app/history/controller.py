@@ -0,0 +1,50 @@
+from datetime import datetime, timedelta
+from fastapi import HTTPException
+
+from src.system.core.history_core import HistoryCore
+from src.app.history.model import HistoryFilter
+
+
+class HistoryController():
+    def __init__(self, history_core: HistoryCore) -> None:
+        """
+        Inicializa o controller de consultas históricas.
+
+        Args:
+            history_core (HistoryCore): Armazenamento das séries históricas.
+        """
+        self.history_core = history_core
+
+    async def search_history(self, data: HistoryFilter) -> dict:
+        """
+        Consulta a série histórica do símbolo no período.
+
+        Com `interval='raw'` retorna as observações brutas; caso contrário
+        retorna candles OHLC do tamanho pedido ('1m', '5m', '1h', '1d', '1w'...).
+        O resultado é colunar (um array por campo).
+
+        Args:
+            data (HistoryFilter): Símbolo, intervalo, campo e período. Sem
+                                  período, retorna as últimas 24 horas.
+
+        Raises:
+            HTTPException: Levanta uma exceção 422 se o intervalo ou o período
+                        forem inválidos.
+
+        Returns:
+            dict: A série no formato de HistoryRawOut ou HistoryCandlesOut.
+        """
+        end = data.end or datetime.now()
+        start = data.start or end - timedelta(days=1)
+        if start > end:
+            raise HTTPException(status_code=422, detail="O início do período deve ser anterior ao fim.")
+        if data.interval == "raw":
+            series = await self.history_core.get_raw(symbol=data.symbol, start=start.timestamp(), end=end.timestamp())
+            return {"symbol": data.symbol, "interval": data.interval, **series}
+        interval = self.history_core.parse_interval(data.interval)
+        if interval is None or interval % 60:
+            raise HTTPException(status_code=422, detail="Intervalo inválido. Use 'raw' ou valores como '1m', '5m', '1h', '1d', '1w'.")
+        series = await self.history_core.get_candles(
+            symbol=data.symbol, field=data.field, interval=interval, start=start.timestamp(), end=end.timestamp(),
+        )
+        return {"symbol": data.symbol, "interval": data.interval, "field": data.field, **series}
@@ -0,0 +1,32 @@
+from typing import List, Literal, Optional
+from datetime import datetime
+from pydantic import BaseModel, field_validator
+
+class HistoryFilter(BaseModel):
+    symbol: str
+    interval: str = "1h"
+    field: Literal["coin_price", "coin_price_dolar"] = "coin_price"
+    start: Optional[datetime] = None
+    end: Optional[datetime] = None
+
+    @field_validator('symbol', 'interval', mode="after")
+    def set_lower(cls, value):
+        return value.lower() if value else value
+
+class HistoryRawOut(BaseModel):
+    symbol: str
+    interval: str
+    timestamp: List[float]
+    coin_price: List[float]
+    coin_price_dolar: List[float]
+
+class HistoryCandlesOut(BaseModel):
+    symbol: str
+    interval: str
+    field: str
+    timestamp: List[float]
+    open: List[float]
+    high: List[float]
+    low: List[float]
+    close: List[float]
+    count: List[int]
@@ -0,0 +1,20 @@
+from typing import Annotated, Union
+import orjson
+from fastapi import APIRouter, Depends, Response
+
+from src.app.auth.model import User
+from src.app.api.route import api_controller, get_rate_limited_user
+from src.app.history.controller import HistoryController
+from src.app.history.model import HistoryFilter, HistoryRawOut, HistoryCandlesOut
+
+
+#CONFIG-CONFIG-CONFIG-CONFIG-CONFIG-CONFIG-CONFIG-CONFIG-CONFIG-CONFIG-CONFIG-CONFIG-CONFIG-CONFIG-CONFIG-CONFIG-CONFIG-CONFIG-CONFIG-CONFIG-CONFIG-CONFIG-CONFIG#
+backend = APIRouter()
+
+history_controller = HistoryController(history_core=api_controller.history)
+
+#BACKEND-BACKEND-BACKEND-BACKEND-BACKEND-BACKEND-BACKEND-BACKEND-BACKEND-BACKEND-BACKEND-BACKEND-BACKEND-BACKEND-BACKEND-BACKEND-BACKEND-BACKEND-BACKEND-BACKEND#
+@backend.get("/history",response_model=Union[HistoryCandlesOut, HistoryRawOut], tags=["HISTORY"])
+async def get_history(current_user: Annotated[User, Depends(get_rate_limited_user)],data:Annotated[HistoryFilter,Depends()],):
+    result = await history_controller.search_history(data=data)
+    return Response(content=orjson.dumps(result, option=orjson.OPT_SERIALIZE_NUMPY), media_type="application/json")
@@ -0,0 +1,28 @@
+from src.app.search.model import SearchFilter
+from src.system.integrations.symbol_search_service import SymbolSearchService
+
+
+class SearchController():
+    def __init__(self, symbol_search: SymbolSearchService) -> None:
+        """
+        Inicializa o controller de busca de símbolos.
+
+        Args:
+            symbol_search (SymbolSearchService): O serviço de busca.
+        """
+        self.symbol_search = symbol_search
+
+    async def search_symbols(self, data: SearchFilter) -> dict:
+        """
+        Busca símbolos e nomes de criptomoedas para o autocomplete, do mais
+        ao menos relevante, paginados.
+
+        Args:
+            data (SearchFilter): O texto digitado e a página.
+
+        Returns:
+            dict: A consulta, o total de símbolos encontrados, a página e os
+                itens no formato de SearchOut.
+        """
+        result = await self.symbol_search.search(query=data.q, limit=data.limit, offset=data.offset)
+        return {"query": data.q, "limit": data.limit, "offset": data.offset, **result}
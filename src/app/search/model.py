@@ -0,0 +1,20 @@
+from typing import List, Optional
+from pydantic import BaseModel, Field
+
+class SearchFilter(BaseModel):
+    q: str = Field(min_length=1, max_length=100)
+    limit: int = Field(default=10, ge=1, le=50)
+    offset: int = Field(default=0, ge=0)
+
+class SearchItem(BaseModel):
+    symbol: str
+    name: str
+    rank: Optional[int] = None
+    sources: List[str]
+
+class SearchOut(BaseModel):
+    query: str
+    total: int
+    limit: int
+    offset: int
+    items: List[SearchItem]
@@ -0,0 +1,19 @@
+from typing import Annotated
+from fastapi import APIRouter, Depends
+
+from src.app.auth.model import User
+from src.app.api.route import api_controller
+from src.app.auth.route import auth_controller
+from src.app.search.controller import SearchController
+from src.app.search.model import SearchFilter, SearchOut
+
+
+#CONFIG-CONFIG-CONFIG-CONFIG-CONFIG-CONFIG-CONFIG-CONFIG-CONFIG-CONFIG-CONFIG-CONFIG-CONFIG-CONFIG-CONFIG-CONFIG-CONFIG-CONFIG-CONFIG-CONFIG-CONFIG-CONFIG-CONFIG#
+backend = APIRouter()
+
+search_controller = SearchController(symbol_search=api_controller.symbol_search)
+
+#BACKEND-BACKEND-BACKEND-BACKEND-BACKEND-BACKEND-BACKEND-BACKEND-BACKEND-BACKEND-BACKEND-BACKEND-BACKEND-BACKEND-BACKEND-BACKEND-BACKEND-BACKEND-BACKEND-BACKEND#
+@backend.get("/search",response_model=SearchOut, tags=["SEARCH"])
+async def get_search(current_user: Annotated[User, Depends(auth_controller.get_current_user)],data:Annotated[SearchFilter,Depends()],):
+    return await search_controller.search_symbols(data=data)
@@ -0,0 +1,206 @@
+import os
+import asyncio
+import logging
+from typing import Optional
+from fastapi import HTTPException
+
+from src.system.core.logger_core import logger
+from src.app.api.model import ApiFilter
+from src.app.api.controller import ApiController
+from src.app.stream.model import StreamMessage
+
+
+class StreamSubscriber():
+    def __init__(self, queue_size: int) -> None:
+        """
+        Representa uma conexão de streaming (WebSocket ou SSE).
+
+        As mensagens ficam em uma fila limitada; se ela encher, o consumidor
+        é considerado lento e desconectado.
+
+        Args:
+            queue_size (int): Tamanho máximo da fila da conexão.
+        """
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        self.symbols: set = set()
+        self.closed = asyncio.Event()
+
+    def offer(self, message: str) -> bool:
+        """
+        Enfileira uma mensagem sem bloquear.
+
+        Args:
+            message (str): A mensagem já serializada.
+
+        Returns:
+            bool: False se a fila estiver cheia.
+        """
+        try:
+            self.queue.put_nowait(message)
+            return True
+        except asyncio.QueueFull:
+            return False
+
+
+class StreamController():
+    def __init__(self, api_controller: ApiController) -> None:
+        """
+        Inicializa o distribuidor de cotações em tempo real.
+
+        Cada símbolo com pelo menos um inscrito é consultado uma única vez a
+        cada STREAM_POLL_INTERVAL segundos, independentemente do número de
+        inscritos, e as mudanças são distribuídas a todas as conexões.
+
+        Args:
+            api_controller (ApiController): Controller usado para consultar as cotações.
+        """
+        self.STREAM_POLL_INTERVAL = float(os.environ.get("STREAM_POLL_INTERVAL", 1))
+        self.STREAM_QUEUE_SIZE = int(os.environ.get("STREAM_QUEUE_SIZE", 100))
+        self.STREAM_MAX_SYMBOLS = int(os.environ.get("STREAM_MAX_SYMBOLS", 50))
+        self.STREAM_KEEPALIVE_INTERVAL = float(os.environ.get("STREAM_KEEPALIVE_INTERVAL", 15))
+        self.api_controller = api_controller
+        self.subscribers: dict[str, set] = {}
+        self.pollers: dict[str, asyncio.Task] = {}
+        self.last_messages: dict[str, str] = {}
+        self.dropped = 0
+
+    def connect(self) -> StreamSubscriber:
+        """
+        Cria uma nova conexão de streaming.
+
+        Returns:
+            StreamSubscriber: A conexão criada.
+        """
+        return StreamSubscriber(queue_size=self.STREAM_QUEUE_SIZE)
+
+    def disconnect(self, subscriber: StreamSubscriber) -> None:
+        """
+        Encerra a conexão e cancela suas inscrições.
+
+        Args:
+            subscriber (StreamSubscriber): A conexão a ser encerrada.
+        """
+        subscriber.closed.set()
+        self.unsubscribe(subscriber=subscriber, symbols=list(subscriber.symbols))
+
+    def subscribe(self, subscriber: StreamSubscriber, symbols: list) -> None:
+        """
+        Inscreve a conexão nos símbolos, iniciando a consulta dos que ainda
+        não tinham inscritos e enviando de imediato o último valor conhecido.
+
+        Args:
+            subscriber (StreamSubscriber): A conexão.
+            symbols (list[str]): Os símbolos.
+
+        Raises:
+            HTTPException: Levanta uma exceção 422 se a conexão exceder
+                        STREAM_MAX_SYMBOLS símbolos.
+        """
+        symbols = [ApiFilter(symbol=symbol).symbol for symbol in symbols]
+        if len(subscriber.symbols | set(symbols)) > self.STREAM_MAX_SYMBOLS:
+            raise HTTPException(status_code=422, detail=f"Máximo de {self.STREAM_MAX_SYMBOLS} símbolos por conexão.")
+        for symbol in symbols:
+            if symbol in subscriber.symbols:
+                continue
+            subscriber.symbols.add(symbol)
+            self.subscribers.setdefault(symbol, set()).add(subscriber)
+            if symbol not in self.pollers:
+                self.pollers[symbol] = asyncio.create_task(self._poll(symbol=symbol))
+            elif symbol in self.last_messages and not subscriber.offer(self.last_messages[symbol]):
+                self._drop(subscriber=subscriber)
+                return
+
+    def unsubscribe(self, subscriber: StreamSubscriber, symbols: list) -> None:
+        """
+        Cancela inscrições da conexão, parando a consulta dos símbolos que
+        ficarem sem inscritos.
+
+        Args:
+            subscriber (StreamSubscriber): A conexão.
+            symbols (list[str]): Os símbolos.
+        """
+        for symbol in symbols:
+            symbol = symbol.lower()
+            subscriber.symbols.discard(symbol)
+            subscribers = self.subscribers.get(symbol)
+            if subscribers is None:
+                continue
+            subscribers.discard(subscriber)
+            if not subscribers:
+                del self.subscribers[symbol]
+                self.last_messages.pop(symbol, None)
+                poller = self.pollers.pop(symbol, None)
+                if poller:
+                    poller.cancel()
+
+    async def close(self) -> None:
+        """
+        Encerra todas as conexões e interrompe a consulta dos símbolos.
+        """
+        for subscribers in list(self.subscribers.values()):
+            for subscriber in list(subscribers):
+                subscriber.closed.set()
+        pollers = list(self.pollers.values())
+        for poller in pollers:
+            poller.cancel()
+        await asyncio.gather(*pollers, return_exceptions=True)
+        self.subscribers.clear()
+        self.pollers.clear()
+        self.last_messages.clear()
+
+    async def next_message(self, subscriber: StreamSubscriber) -> Optional[str]:
+        """
+        Aguarda a próxima mensagem da conexão.
+
+        Args:
+            subscriber (StreamSubscriber): A conexão.
+
+        Returns:
+            str: A próxima mensagem, ou None se nada chegar em
+                STREAM_KEEPALIVE_INTERVAL segundos.
+        """
+        try:
+            return await asyncio.wait_for(subscriber.queue.get(), timeout=self.STREAM_KEEPALIVE_INTERVAL)
+        except asyncio.TimeoutError:
+            return None
+
+    def publish(self, symbol: str, message: str) -> None:
+        """
+        Distribui uma mensagem a todos os inscritos do símbolo. Conexões com a
+        fila cheia são desconectadas.
+
+        Args:
+            symbol (str): O símbolo.
+            message (str): A mensagem já serializada, compartilhada por todos.
+        """
+        self.last_messages[symbol] = message
+        for subscriber in list(self.subscribers.get(symbol, ())):
+            if not subscriber.offer(message):
+                self._drop(subscriber=subscriber)
+
+    def _drop(self, subscriber: StreamSubscriber) -> None:
+        self.dropped += 1
+        logger(mensagem=":( Consumidor lento desconectado do streaming :(", nivel=logging.WARNING)
+        self.disconnect(subscriber=subscriber)
+
+    async def _poll(self, symbol: str) -> None:
+        """
+        Consulta o símbolo periodicamente e publica apenas quando o valor muda.
+
+        Args:
+            symbol (str): O símbolo.
+        """
+        while True:
+            try:
+                api_response = await self.api_controller.search_coin_per_symbol(data=ApiFilter(symbol=symbol))
+                message = StreamMessage(symbol=symbol, data=api_response).model_dump_json()
+            except asyncio.CancelledError:
+                raise
+            except HTTPException as error:
+                message = StreamMessage(symbol=symbol, error=str(error.detail)).model_dump_json()
+            except Exception as error:
+                logger(mensagem=f"StreamController._poll -> {error}", nivel=logging.WARNING)
+                message = None
+            if message and message != self.last_messages.get(symbol):
+                self.publish(symbol=symbol, message=message)
+            await asyncio.sleep(self.STREAM_POLL_INTERVAL)
@@ -0,0 +1,13 @@
+from typing import List, Literal, Optional
+from pydantic import BaseModel
+
+from src.app.api.model import ApiOut
+
+class StreamMessage(BaseModel):
+    symbol: str
+    data: Optional[ApiOut] = None
+    error: Optional[str] = None
+
+class StreamCommand(BaseModel):
+    action: Literal["subscribe", "unsubscribe"]
+    symbols: List[str]
@@ -0,0 +1,116 @@
+import json
+import asyncio
+from typing import Annotated, List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, WebSocket, WebSocketDisconnect, status
+from fastapi.responses import StreamingResponse
+from pydantic import ValidationError
+
+from src.app.auth.model import User
+from src.app.api.route import api_controller
+from src.app.auth.route import auth_controller
+from src.app.stream.model import StreamCommand
+from src.app.stream.controller import StreamController
+
+
+#CONFIG-CONFIG-CONFIG-CONFIG-CONFIG-CONFIG-CONFIG-CONFIG-CONFIG-CONFIG-CONFIG-CONFIG-CONFIG-CONFIG-CONFIG-CONFIG-CONFIG-CONFIG-CONFIG-CONFIG-CONFIG-CONFIG-CONFIG#
+backend = APIRouter()
+
+stream_controller = StreamController(api_controller=api_controller)
+
+def split_symbols(symbols: List[str]) -> List[str]:
+    return [symbol.strip() for item in symbols for symbol in item.split(",") if symbol.strip()]
+
+#BACKEND-BACKEND-BACKEND-BACKEND-BACKEND-BACKEND-BACKEND-BACKEND-BACKEND-BACKEND-BACKEND-BACKEND-BACKEND-BACKEND-BACKEND-BACKEND-BACKEND-BACKEND-BACKEND-BACKEND#
+@backend.get("/stream/sse", tags=["STREAM"])
+async def stream_sse(request: Request, current_user: Annotated[User, Depends(auth_controller.get_current_user)], symbols: Annotated[List[str], Query(description="Símbolos separados por vírgula ou repetidos.")]):
+    """
+    Transmite as cotações dos símbolos via Server-Sent Events.
+
+    Args:
+        request (Request): A requisição, usada para detectar a desconexão.
+        current_user (User): O usuário autenticado.
+        symbols (List[str]): Os símbolos a acompanhar.
+
+    Returns:
+        StreamingResponse: Um evento `data:` por atualização e comentários de
+                           keep-alive enquanto não houver mudanças.
+    """
+    subscriber = stream_controller.connect()
+    stream_controller.subscribe(subscriber=subscriber, symbols=split_symbols(symbols))
+
+    async def events():
+        try:
+            while not subscriber.closed.is_set():
+                message = await stream_controller.next_message(subscriber=subscriber)
+                if await request.is_disconnected():
+                    break
+                yield f"data: {message}\n\n" if message else ": keep-alive\n\n"
+        finally:
+            stream_controller.disconnect(subscriber=subscriber)
+
+    return StreamingResponse(events(), media_type="text/event-stream", headers={"Cache-Control": "no-cache"})
+
+@backend.websocket("/stream/ws")
+async def stream_ws(websocket: WebSocket, token: Optional[str] = None, symbols: Annotated[List[str], Query()] = []):
+    """
+    Transmite as cotações dos símbolos via WebSocket.
+
+    O token pode ser enviado no cabeçalho Authorization (Bearer) ou no
+    parâmetro `token`. Depois de conectado, o cliente pode enviar comandos
+    {"action": "subscribe" | "unsubscribe", "symbols": [...]}.
+
+    Args:
+        websocket (WebSocket): A conexão.
+        token (str, optional): O token de acesso.
+        symbols (List[str]): Os símbolos iniciais.
+    """
+    authorization = websocket.headers.get("authorization", "")
+    if authorization.lower().startswith("bearer "):
+        token = authorization[7:]
+    try:
+        await auth_controller.get_current_user(token)
+    except HTTPException:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+    await websocket.accept()
+    subscriber = stream_controller.connect()
+
+    async def send_messages():
+        while not subscriber.closed.is_set():
+            message = await stream_controller.next_message(subscriber=subscriber)
+            if message:
+                await websocket.send_text(message)
+
+    try:
+        try:
+            stream_controller.subscribe(subscriber=subscriber, symbols=split_symbols(symbols))
+        except HTTPException as error:
+            await websocket.send_text(json.dumps({"error": error.detail}))
+            await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+            return
+        sender = asyncio.create_task(send_messages())
+        try:
+            while not sender.done():
+                receiver = asyncio.create_task(websocket.receive_text())
+                done, _ = await asyncio.wait({receiver, sender}, return_when=asyncio.FIRST_COMPLETED)
+                if receiver not in done:
+                    receiver.cancel()
+                    break
+                try:
+                    command = StreamCommand.model_validate(json.loads(receiver.result()))
+                    if command.action == "subscribe":
+                        stream_controller.subscribe(subscriber=subscriber, symbols=split_symbols(command.symbols))
+                    else:
+                        stream_controller.unsubscribe(subscriber=subscriber, symbols=split_symbols(command.symbols))
+                except (ValueError, ValidationError) as error:
+                    await websocket.send_text(json.dumps({"error": str(error)}))
+                except HTTPException as error:
+                    await websocket.send_text(json.dumps({"error": error.detail}))
+        finally:
+            sender.cancel()
+        if subscriber.closed.is_set():
+            await websocket.close(code=status.WS_1013_TRY_AGAIN_LATER)
+    except WebSocketDisconnect:
+        pass
+    finally:
+        stream_controller.disconnect(subscriber=subscriber)
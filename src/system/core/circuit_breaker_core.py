@@ -0,0 +1,154 @@
+import os
+import time
+import logging
+from collections import deque
+from typing import Optional
+
+from src.system.core.logger_core import logger
+
+
+class CircuitOpenError(Exception):
+    def __init__(self, name: str) -> None:
+        """
+        Erro levantado ao tentar chamar uma integração com o circuito aberto.
+
+        Args:
+            name (str): Nome da integração.
+        """
+        super().__init__(f"Circuito da integração {name} aberto.")
+        self.name = name
+
+
+class CircuitBreakerCore():
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, name: str, open_time: Optional[float] = None) -> None:
+        """
+        Inicializa o circuit breaker e as estatísticas de saúde de uma integração.
+
+        Mantém as últimas CIRCUIT_WINDOW chamadas para calcular a taxa de erro e
+        uma média móvel exponencial (EWMA) da latência. Com pelo menos
+        CIRCUIT_MIN_CALLS chamadas e taxa de erro acima de
+        CIRCUIT_FAILURE_RATE, o circuito abre e a integração é ignorada por
+        CIRCUIT_OPEN_TIME segundos; depois disso, uma chamada de teste
+        (meio-aberto) decide se ele fecha ou volta a abrir.
+
+        Args:
+            name (str): Nome da integração.
+            open_time (float, optional): Substitui CIRCUIT_OPEN_TIME.
+        """
+        self.CIRCUIT_WINDOW = int(os.environ.get("CIRCUIT_WINDOW", 20))
+        self.CIRCUIT_MIN_CALLS = int(os.environ.get("CIRCUIT_MIN_CALLS", 5))
+        self.CIRCUIT_FAILURE_RATE = float(os.environ.get("CIRCUIT_FAILURE_RATE", 0.5))
+        self.CIRCUIT_OPEN_TIME = float(os.environ.get("CIRCUIT_OPEN_TIME", 30)) if open_time is None else open_time
+        self.CIRCUIT_EWMA_ALPHA = float(os.environ.get("CIRCUIT_EWMA_ALPHA", 0.2))
+        self.name = name
+        self.state = self.CLOSED
+        self.outcomes: deque = deque(maxlen=self.CIRCUIT_WINDOW)
+        self.latency_ewma: Optional[float] = None
+        self.opened_at: Optional[float] = None
+        self.last_error: Optional[str] = None
+        self.skipped = 0
+        self._trial_in_flight = False
+
+    def allow(self) -> bool:
+        """
+        Indica se a integração pode ser chamada agora.
+
+        Returns:
+            bool: False se o circuito estiver aberto, ou meio-aberto com a
+                chamada de teste já em andamento.
+        """
+        if self.state == self.OPEN and time.monotonic() - self.opened_at >= self.CIRCUIT_OPEN_TIME:
+            self.state = self.HALF_OPEN
+            self._trial_in_flight = False
+        if self.state == self.CLOSED:
+            return True
+        if self.state == self.HALF_OPEN and not self._trial_in_flight:
+            self._trial_in_flight = True
+            return True
+        self.skipped += 1
+        return False
+
+    def record_success(self, latency: Optional[float]) -> None:
+        """
+        Registra uma chamada bem-sucedida.
+
+        Args:
+            latency (float): A duração da chamada em segundos, ou None para
+                             não incluí-la na latência média.
+        """
+        self._update_latency(latency=latency)
+        self.outcomes.append(True)
+        if self.state != self.CLOSED:
+            logger(mensagem=f":D Circuito da integração {self.name} fechado :D", nivel=logging.INFO)
+            self.state = self.CLOSED
+            self.outcomes.clear()
+            self.outcomes.append(True)
+        self._trial_in_flight = False
+
+    def record_failure(self, latency: Optional[float], error: Exception) -> None:
+        """
+        Registra uma chamada com falha, abrindo o circuito se necessário.
+
+        Args:
+            latency (float): A duração da chamada em segundos, ou None para
+                             não incluí-la na latência média.
+            error (Exception): O erro ocorrido.
+        """
+        self._update_latency(latency=latency)
+        self.outcomes.append(False)
+        self.last_error = f"{type(error).__name__}: {error}"
+        self._trial_in_flight = False
+        if self.state == self.HALF_OPEN or (
+            len(self.outcomes) >= self.CIRCUIT_MIN_CALLS and self.error_rate >= self.CIRCUIT_FAILURE_RATE
+        ):
+            if self.state != self.OPEN:
+                logger(mensagem=f":( Circuito da integração {self.name} aberto :(", nivel=logging.WARNING)
+            self.state = self.OPEN
+            self.opened_at = time.monotonic()
+
+    def record_cancelled(self) -> None:
+        """
+        Libera a chamada de teste do estado meio-aberto quando ela é cancelada
+        antes de terminar, sem contar como sucesso ou falha.
+        """
+        self._trial_in_flight = False
+
+    @property
+    def error_rate(self) -> float:
+        if not self.outcomes:
+            return 0.0
+        return self.outcomes.count(False) / len(self.outcomes)
+
+    def _update_latency(self, latency: Optional[float]) -> None:
+        if latency is None:
+            return
+        if self.latency_ewma is None:
+            self.latency_ewma = latency
+        else:
+            self.latency_ewma += self.CIRCUIT_EWMA_ALPHA * (latency - self.latency_ewma)
+
+    def stats(self) -> dict:
+        """
+        Retorna o estado do circuito e as estatísticas da integração.
+
+        Returns:
+            dict: Estado, taxa de erro, EWMA da latência (ms), chamadas na
+                janela, chamadas ignoradas, segundos até o próximo teste e
+                último erro.
+        """
+        retry_in = None
+        if self.state == self.OPEN:
+            retry_in = max(0.0, self.CIRCUIT_OPEN_TIME - (time.monotonic() - self.opened_at))
+        return {
+            "state": self.state,
+            "error_rate": self.error_rate,
+            "latency_ewma_ms": self.latency_ewma * 1000 if self.latency_ewma is not None else None,
+            "calls_in_window": len(self.outcomes),
+            "skipped": self.skipped,
+            "retry_in_seconds": retry_in,
+            "last_error": self.last_error,
+        }
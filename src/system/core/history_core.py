@@ -0,0 +1,276 @@
+import os
+import asyncio
+from datetime import datetime
+from typing import Optional
+
+import numpy as np
+
+from src.system.core.redis_core import RedisCore
+
+
+class HistoryCore():
+    FIELDS = ("coin_price", "coin_price_dolar")
+
+    RESOLUTIONS = {"1m": 60, "1h": 3600, "1d": 86400}
+
+    RECORD_SCRIPT = """
+    local ts = tonumber(ARGV[1])
+    redis.call("ZADD", KEYS[1], ts, ARGV[2])
+    redis.call("ZREMRANGEBYSCORE", KEYS[1], "-inf", "(" .. (ts - tonumber(ARGV[3])))
+    for i = 2, #KEYS do
+        local base = 4 + (i - 2) * 3
+        local size = tonumber(ARGV[base])
+        local price = tonumber(ARGV[base + 1])
+        local retention = tonumber(ARGV[base + 2])
+        local bucket = math.floor(ts / size) * size
+        local o, h, l, c, n = price, price, price, price, 1
+        local current = redis.call("ZRANGEBYSCORE", KEYS[i], bucket, bucket)
+        if #current > 0 then
+            local f = {}
+            for value in string.gmatch(current[1], "[^:]+") do
+                f[#f + 1] = tonumber(value)
+            end
+            o = f[2]
+            h = math.max(f[3], price)
+            l = math.min(f[4], price)
+            n = f[6] + 1
+            redis.call("ZREM", KEYS[i], current[1])
+        end
+        redis.call("ZADD", KEYS[i], bucket, string.format("%d:%.17g:%.17g:%.17g:%.17g:%d", bucket, o, h, l, c, n))
+        redis.call("ZREMRANGEBYSCORE", KEYS[i], "-inf", "(" .. (bucket - retention))
+    end
+    return 1
+    """
+
+    RANGE_SCRIPT = """
+    local members = redis.call("ZRANGEBYSCORE", KEYS[1], ARGV[1], ARGV[2], "LIMIT", ARGV[3], ARGV[4])
+    return {#members, table.concat(members, "\\n")}
+    """
+
+    def __init__(self, redis_core: RedisCore) -> None:
+        """
+        Inicializa o armazenamento de séries históricas de preços.
+
+        Cada observação é gravada, por símbolo, em um sorted set bruto e
+        consolidada atomicamente (um script Lua por observação) em candles de
+        1m, 1h e 1d para cada campo de preço. As consultas leem a série já
+        consolidada mais adequada e agregam com operações vetorizadas do numpy.
+
+        As séries são lidas em páginas de HISTORY_PAGE_SIZE membros (ZRANGEBYSCORE
+        com LIMIT, sem limite de período), cada uma devolvida pelo Redis como
+        um único texto, e a conversão e a agregação rodam fora do event loop
+        (`asyncio.to_thread`).
+
+        Args:
+            redis_core (RedisCore): Instância usada para gravar e ler as séries.
+        """
+        self.HISTORY_ENABLED = os.environ.get("HISTORY_ENABLED", "true").lower() == "true"
+        self.HISTORY_RETENTION = {
+            "raw": int(os.environ.get("HISTORY_RETENTION_RAW", 7 * 86400)),
+            "1m": int(os.environ.get("HISTORY_RETENTION_1M", 366 * 86400)),
+            "1h": int(os.environ.get("HISTORY_RETENTION_1H", 5 * 366 * 86400)),
+            "1d": int(os.environ.get("HISTORY_RETENTION_1D", 20 * 366 * 86400)),
+        }
+        self.HISTORY_PAGE_SIZE = int(os.environ.get("HISTORY_PAGE_SIZE", 10000))
+        self.redis_core = redis_core
+        self.record_script = redis_core.register_script_redis(self.RECORD_SCRIPT)
+        self.range_script = redis_core.register_script_redis(self.RANGE_SCRIPT)
+
+    def _key(self, symbol: str, series: str) -> str:
+        return f"history:{{{symbol}}}:{series}"
+
+    async def record_many(self, observations: list) -> None:
+        """
+        Grava várias observações em um único pipeline.
+
+        Args:
+            observations (list[dict]): Dicionários com 'symbol', 'coin_price',
+                                      'coin_price_dolar' e 'date_consult'.
+        """
+        if not self.HISTORY_ENABLED:
+            return
+        calls = []
+        for observation in observations:
+            if observation.get("coin_price") is None:
+                continue
+            date_consult = observation.get("date_consult")
+            ts = date_consult.timestamp() if isinstance(date_consult, datetime) else datetime.now().timestamp()
+            symbol = observation["symbol"].lower()
+            prices = {field: float(observation.get(field) or 0.0) for field in self.FIELDS}
+            keys = [self._key(symbol, "raw")]
+            args = [ts, f"{ts!r}:{prices['coin_price']!r}:{prices['coin_price_dolar']!r}", self.HISTORY_RETENTION["raw"]]
+            for field in self.FIELDS:
+                for resolution, size in self.RESOLUTIONS.items():
+                    keys.append(self._key(symbol, f"{field}:{resolution}"))
+                    args.extend([size, repr(prices[field]), self.HISTORY_RETENTION[resolution]])
+            calls.append((keys, args))
+        await self.redis_core.eval_many_redis(script=self.record_script, calls=calls)
+
+    async def get_raw(self, symbol: str, start: float, end: float) -> dict:
+        """
+        Retorna as observações brutas do período.
+
+        Args:
+            symbol (str): O símbolo da criptomoeda.
+            start (float): Timestamp inicial.
+            end (float): Timestamp final.
+
+        Returns:
+            dict: Arrays 'timestamp', 'coin_price' e 'coin_price_dolar'.
+        """
+        values = await self._read(key=self._key(symbol, "raw"), start=start, end=end, columns=3)
+        # Uma linha contígua por campo, como o orjson exige para serializar.
+        timestamp, coin_price, coin_price_dolar = np.ascontiguousarray(values.T)
+        return {"timestamp": timestamp, "coin_price": coin_price, "coin_price_dolar": coin_price_dolar}
+
+    async def get_candles(self, symbol: str, field: str, interval: int, start: float, end: float) -> dict:
+        """
+        Retorna os candles OHLC do período no intervalo pedido.
+
+        Lê a maior resolução consolidada que divide o intervalo e agrega os
+        buckets com `reduceat`, sem iterar sobre objetos Python.
+
+        Args:
+            symbol (str): O símbolo da criptomoeda.
+            field (str): O campo de preço ('coin_price' ou 'coin_price_dolar').
+            interval (int): O tamanho do candle em segundos (múltiplo de 60).
+            start (float): Timestamp inicial.
+            end (float): Timestamp final.
+
+        Returns:
+            dict: Arrays 'timestamp', 'open', 'high', 'low', 'close' e 'count'.
+        """
+        resolution = max(
+            (name for name, size in self.RESOLUTIONS.items() if interval % size == 0),
+            key=self.RESOLUTIONS.get,
+        )
+        values = await self._read(key=self._key(symbol, f"{field}:{resolution}"), start=start, end=end, columns=6)
+        if interval != self.RESOLUTIONS[resolution] and len(values):
+            values = await asyncio.to_thread(self._aggregate, values, interval)
+        timestamp, open_, high, low, close, count = np.ascontiguousarray(values.T)
+        return {
+            "timestamp": timestamp,
+            "open": open_,
+            "high": high,
+            "low": low,
+            "close": close,
+            "count": count.astype(np.int64),
+        }
+
+    async def _read(self, key: str, start: float, end: float, columns: int) -> np.ndarray:
+        """
+        Lê os membros do período em páginas de HISTORY_PAGE_SIZE e os converte
+        em uma única matriz.
+
+        O RANGE_SCRIPT junta os membros de cada página em um só texto, o que
+        evita montar uma resposta com um item por membro. Cada página continua
+        a partir do score do último membro lido, pulando os membros com esse
+        mesmo score que já foram lidos, então o custo de cada página não
+        cresce com a posição no sorted set, e a conversão de cada página roda
+        em uma thread enquanto a próxima é buscada.
+
+        Args:
+            key (str): A chave do sorted set.
+            start (float): Timestamp inicial.
+            end (float): Timestamp final.
+            columns (int): Quantidade de valores por membro; o primeiro é o score.
+
+        Returns:
+            np.ndarray: Matriz (membros, columns) de float64, ordenada por score.
+        """
+        parsing = []
+        offset = 0
+        while True:
+            count, members = await self.redis_core.eval_script_redis(
+                script=self.range_script, keys=[key], args=[start, end, offset, self.HISTORY_PAGE_SIZE], bulk=True,
+            )
+            parsing.append(asyncio.ensure_future(asyncio.to_thread(self._parse, members, columns)))
+            if count < self.HISTORY_PAGE_SIZE:
+                break
+            last, repeated = self._last_score(members=members)
+            offset = offset + repeated if last == start else repeated
+            start = last
+        pages = await asyncio.gather(*parsing)
+        return pages[0] if len(pages) == 1 else np.concatenate(pages)
+
+    @staticmethod
+    def _last_score(members: str) -> tuple:
+        """
+        Lê o score do último membro de uma página e quantos membros do fim da
+        página têm esse mesmo score, sem converter a página inteira.
+
+        Args:
+            members (str): Os membros da página, um por linha.
+
+        Returns:
+            tuple: O score do último membro e a quantidade de membros com ele.
+        """
+        last, repeated, stop = None, 0, len(members)
+        while stop > 0:
+            begin = members.rfind("\n", 0, stop) + 1
+            score = float(members[begin:members.index(":", begin)])
+            if last is not None and score != last:
+                break
+            last, repeated, stop = score, repeated + 1, begin - 1
+        return last, repeated
+
+    @staticmethod
+    def _parse(members: str, columns: int) -> np.ndarray:
+        """
+        Converte os membros "v1:v2:...", um por linha, em uma matriz numpy de
+        uma só vez.
+
+        Args:
+            members (str): Os membros do sorted set, separados por quebra de linha.
+            columns (int): Quantidade de valores por membro.
+
+        Returns:
+            np.ndarray: Matriz (membros, columns) de float64.
+        """
+        if not members:
+            return np.empty((0, columns), dtype=np.float64)
+        return np.loadtxt(members.splitlines(), delimiter=":", dtype=np.float64, ndmin=2)
+
+    @staticmethod
+    def _aggregate(values: np.ndarray, interval: int) -> np.ndarray:
+        """
+        Agrega candles consecutivos em candles maiores.
+
+        Args:
+            values (np.ndarray): Matriz (timestamp, open, high, low, close, count),
+                                 ordenada por timestamp.
+            interval (int): O novo tamanho do candle em segundos.
+
+        Returns:
+            np.ndarray: A matriz agregada no mesmo formato.
+        """
+        buckets = values[:, 0] - np.mod(values[:, 0], interval)
+        starts = np.concatenate(([0], np.flatnonzero(np.diff(buckets)) + 1))
+        ends = np.concatenate((starts[1:], [len(values)])) - 1
+        return np.column_stack((
+            buckets[starts],
+            values[starts, 1],
+            np.maximum.reduceat(values[:, 2], starts),
+            np.minimum.reduceat(values[:, 3], starts),
+            values[ends, 4],
+            np.add.reduceat(values[:, 5], starts),
+        ))
+
+    @staticmethod
+    def parse_interval(interval: str) -> Optional[int]:
+        """
+        Converte um intervalo como '5m', '4h' ou '1d' em segundos.
+
+        Args:
+            interval (str): O intervalo.
+
+        Returns:
+            int: O intervalo em segundos, ou None se for inválido ou não for
+                múltiplo de um minuto.
+        """
+        units = {"m": 60, "h": 3600, "d": 86400, "w": 604800}
+        try:
+            seconds = int(interval[:-1]) * units[interval[-1]]
+        except (KeyError, ValueError, IndexError):
+            return None
+        return seconds if seconds > 0 else None
@@ -0,0 +1,110 @@
+import os
+import math
+import hashlib
+from typing import Optional
+
+from starlette.middleware.gzip import GZipMiddleware
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+
+class HttpCacheCore():
+    def __init__(self) -> None:
+        """
+        Inicializa os cabeçalhos de cache HTTP das cotações.
+
+        Cada resposta recebe um ETag fraco derivado do próprio JSON (fraco
+        porque o corpo pode ser comprimido no caminho) e um Cache-Control cujo
+        `max-age` é o tempo restante até o TTL suave do cache e cujo
+        `stale-while-revalidate` é a janela em que o valor obsoleto ainda é
+        servido (REDIS_STALE_TIME). Com HTTP_CACHE_PUBLIC=true as respostas
+        podem ser guardadas por caches compartilhados (CDN); o padrão é
+        `private`, já que as rotas exigem autenticação.
+        """
+        self.HTTP_CACHE_ENABLED = os.environ.get("HTTP_CACHE_ENABLED", "true").lower() == "true"
+        self.HTTP_CACHE_PUBLIC = os.environ.get("HTTP_CACHE_PUBLIC", "false").lower() == "true"
+
+    @staticmethod
+    def etag(content: str) -> str:
+        """
+        Calcula o ETag de um corpo de resposta.
+
+        Args:
+            content (str): O JSON da resposta.
+
+        Returns:
+            str: O ETag fraco, por exemplo W/"3f2a...".
+        """
+        return f'W/"{hashlib.blake2b(content.encode(), digest_size=16).hexdigest()}"'
+
+    def headers(self, content: str, ttl: Optional[float], stale_ttl: float) -> dict:
+        """
+        Monta os cabeçalhos de cache de uma resposta.
+
+        Args:
+            content (str): O JSON da resposta.
+            ttl (float): Segundos restantes até o TTL suave (negativo ou zero
+                         se o valor já está obsoleto), ou None se a resposta
+                         não vem do cache e só pode ser revalidada.
+            stale_ttl (float): Segundos restantes até o TTL rígido, a partir
+                               do TTL suave.
+
+        Returns:
+            dict: Os cabeçalhos ETag e Cache-Control, ou vazio se o cache HTTP
+                estiver desativado.
+        """
+        if not self.HTTP_CACHE_ENABLED:
+            return {}
+        scope = "public" if self.HTTP_CACHE_PUBLIC else "private"
+        if ttl is None:
+            return {"ETag": self.etag(content), "Cache-Control": f"{scope}, no-cache"}
+        max_age = max(0, math.floor(ttl))
+        stale_while_revalidate = max(0, math.floor(ttl + stale_ttl) - max_age)
+        return {
+            "ETag": self.etag(content),
+            "Cache-Control": f"{scope}, max-age={max_age}, stale-while-revalidate={stale_while_revalidate}",
+        }
+
+    @staticmethod
+    def not_modified(if_none_match: Optional[str], headers: dict) -> bool:
+        """
+        Verifica se o cliente já tem a versão atual da resposta, pela
+        comparação fraca do If-None-Match com o ETag.
+
+        Args:
+            if_none_match (str): O cabeçalho If-None-Match da requisição.
+            headers (dict): Os cabeçalhos montados por `headers`.
+
+        Returns:
+            bool: True se a resposta pode ser um 304 sem corpo.
+        """
+        etag = headers.get("ETag")
+        if not if_none_match or not etag:
+            return False
+        if if_none_match.strip() == "*":
+            return True
+        opaque = etag.removeprefix("W/")
+        return any(tag.strip().removeprefix("W/") == opaque for tag in if_none_match.split(","))
+
+
+class CompressionMiddleware():
+    def __init__(self, app: ASGIApp) -> None:
+        """
+        Comprime com gzip as respostas das rotas em GZIP_PATHS (por padrão
+        apenas /api/batch) com ao menos GZIP_MINIMUM_SIZE bytes, quando o
+        cliente aceita gzip. As demais rotas não passam pelo GZipMiddleware,
+        que acumularia os eventos do /stream em vez de enviá-los na hora.
+
+        Args:
+            app (ASGIApp): A aplicação.
+        """
+        self.GZIP_PATHS = {path.strip() for path in os.environ.get("GZIP_PATHS", "/api/batch").split(",") if path.strip()}
+        self.GZIP_MINIMUM_SIZE = int(os.environ.get("GZIP_MINIMUM_SIZE", 1024))
+        self.GZIP_LEVEL = int(os.environ.get("GZIP_LEVEL", 6))
+        self.app = app
+        self.gzip = GZipMiddleware(app, minimum_size=self.GZIP_MINIMUM_SIZE, compresslevel=self.GZIP_LEVEL)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "http" and scope["path"] in self.GZIP_PATHS:
+            await self.gzip(scope, receive, send)
+            return
+        await self.app(scope, receive, send)
@@ -0,0 +1,181 @@
+import os
+import time
+import asyncio
+import inspect
+import logging
+from typing import Callable, Optional
+
+from src.system.core.logger_core import logger
+from src.system.core.metrics_core import metrics
+
+
+class LifecycleCore():
+    STARTING = "starting"
+    READY = "ready"
+    STOPPING = "stopping"
+
+    def __init__(self) -> None:
+        """
+        Inicializa o controle de ciclo de vida do worker.
+
+        As etapas de aquecimento registradas com `on_startup` rodam em paralelo
+        em segundo plano logo após o início do worker, que já responde à
+        liveness enquanto isso. O worker fica pronto quando todas as etapas
+        obrigatórias concluem; as que falharem são repetidas a cada
+        LIFECYCLE_RETRY_INTERVAL segundos, com cada tentativa limitada a
+        LIFECYCLE_STEP_TIMEOUT segundos. Passados LIFECYCLE_READY_TIMEOUT
+        segundos (0 desativa), o worker se declara pronto mesmo com etapas
+        pendentes, que continuam sendo repetidas, para que uma integração fora
+        do ar não tire todos os workers de circulação.
+        """
+        self.LIFECYCLE_STEP_TIMEOUT = float(os.environ.get("LIFECYCLE_STEP_TIMEOUT", 30))
+        self.LIFECYCLE_RETRY_INTERVAL = float(os.environ.get("LIFECYCLE_RETRY_INTERVAL", 5))
+        self.LIFECYCLE_READY_TIMEOUT = float(os.environ.get("LIFECYCLE_READY_TIMEOUT", 60))
+        self.LIFECYCLE_SHUTDOWN_TIMEOUT = float(os.environ.get("LIFECYCLE_SHUTDOWN_TIMEOUT", 10))
+        self.created_at = time.monotonic()
+        self.started_at: Optional[float] = None
+        self.ready_at: Optional[float] = None
+        self.state = self.STARTING
+        self.steps: dict[str, dict] = {}
+        self.shutdown_hooks: list[tuple[str, Callable]] = []
+        self._task: Optional[asyncio.Task] = None
+
+    def on_startup(self, name: str, function: Callable, required: bool = True) -> None:
+        """
+        Registra uma etapa de aquecimento.
+
+        Args:
+            name (str): O nome da etapa, exibido na readiness.
+            function (Callable): A função (síncrona ou assíncrona) da etapa.
+            required (bool): Se o worker só fica pronto depois dela. Etapas
+                             opcionais rodam uma única vez.
+        """
+        self.steps[name] = {"function": function, "required": required, "status": "pending", "duration": None, "error": None}
+
+    def on_shutdown(self, name: str, function: Callable) -> None:
+        """
+        Registra uma etapa de encerramento. As etapas rodam na ordem inversa
+        do registro.
+
+        Args:
+            name (str): O nome da etapa.
+            function (Callable): A função (síncrona ou assíncrona) da etapa.
+        """
+        self.shutdown_hooks.append((name, function))
+
+    @property
+    def ready(self) -> bool:
+        return self.state == self.READY
+
+    def time_to_ready(self) -> Optional[float]:
+        """
+        Retorna quantos segundos o worker levou, desde a importação da
+        aplicação, para ficar pronto.
+
+        Returns:
+            float: O tempo até ficar pronto, ou None se ainda não estiver.
+        """
+        if self.ready_at is None:
+            return None
+        return self.ready_at - self.created_at
+
+    async def startup(self) -> None:
+        """
+        Inicia o aquecimento em segundo plano, sem bloquear o início do worker.
+        """
+        self.started_at = time.monotonic()
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._warm_up())
+
+    async def _warm_up(self) -> None:
+        """
+        Roda as etapas de aquecimento em paralelo e repete as obrigatórias que
+        falharem até todas concluírem.
+        """
+        names = list(self.steps)
+        while names:
+            await asyncio.gather(*(self._run_step(name) for name in names))
+            names = [name for name in names if self.steps[name]["required"] and self.steps[name]["status"] != "done"]
+            if not names:
+                break
+            if not self.ready and self.LIFECYCLE_READY_TIMEOUT > 0 and time.monotonic() - self.started_at >= self.LIFECYCLE_READY_TIMEOUT:
+                logger(mensagem=f"LifecycleCore -> pronto sem concluir: {', '.join(names)}", nivel=logging.WARNING)
+                self._set_ready()
+            await asyncio.sleep(self.LIFECYCLE_RETRY_INTERVAL)
+        if not self.ready:
+            self._set_ready()
+
+    async def _run_step(self, name: str) -> None:
+        step = self.steps[name]
+        started_at = time.monotonic()
+        step["status"] = "running"
+        try:
+            result = step["function"]()
+            if inspect.isawaitable(result):
+                await asyncio.wait_for(result, timeout=self.LIFECYCLE_STEP_TIMEOUT)
+            step["status"] = "done"
+            step["error"] = None
+        except Exception as error:
+            step["status"] = "failed"
+            step["error"] = str(error) or type(error).__name__
+            logger(mensagem=f"LifecycleCore._run_step({name}) -> {step['error']}", nivel=logging.WARNING)
+        step["duration"] = round(time.monotonic() - started_at, 4)
+
+    def _set_ready(self) -> None:
+        self.ready_at = time.monotonic()
+        self.state = self.READY
+        steps = ", ".join(f"{name}={step['duration']}s" for name, step in self.steps.items())
+        logger(
+            mensagem=f"LifecycleCore -> pronto em {self.time_to_ready():.3f}s (aquecimento {self.ready_at - self.started_at:.3f}s: {steps})",
+            nivel=logging.INFO,
+        )
+
+    async def shutdown(self) -> None:
+        """
+        Interrompe o aquecimento, se ainda estiver rodando, e executa as etapas
+        de encerramento na ordem inversa do registro. Cada etapa é limitada a
+        LIFECYCLE_SHUTDOWN_TIMEOUT segundos e uma falha não impede as demais.
+        """
+        self.state = self.STOPPING
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        for name, function in reversed(self.shutdown_hooks):
+            try:
+                result = function()
+                if inspect.isawaitable(result):
+                    await asyncio.wait_for(result, timeout=self.LIFECYCLE_SHUTDOWN_TIMEOUT)
+            except Exception as error:
+                logger(mensagem=f"LifecycleCore.shutdown({name}) -> {str(error) or type(error).__name__}", nivel=logging.WARNING)
+
+    def stats(self) -> dict:
+        """
+        Retorna o estado do ciclo de vida e de cada etapa de aquecimento.
+
+        Returns:
+            dict: O estado, o tempo até ficar pronto e as etapas.
+        """
+        return {
+            "status": self.state,
+            "time_to_ready_seconds": None if self.time_to_ready() is None else round(self.time_to_ready(), 4),
+            "steps": {
+                name: {key: value for key, value in step.items() if key != "function"}
+                for name, step in self.steps.items()
+            },
+        }
+
+
+lifecycle = LifecycleCore()
+
+metrics.gauge(
+    "app_ready", "1 se o worker estiver pronto para receber tráfego.",
+    function=lambda: {(): int(lifecycle.ready)},
+)
+metrics.gauge(
+    "app_time_to_ready_seconds", "Segundos entre a importação da aplicação e o worker ficar pronto.",
+    function=lambda: {(): lifecycle.time_to_ready()} if lifecycle.ready_at is not None else {},
+)
@@ -1,30 +1,182 @@
+import os
+import sys
+import json
+import time
+import queue
+import random
+import atexit
 import logging
+import threading
+from datetime import datetime, timezone
+from typing import Optional
+
+from src.system.core.metrics_core import metrics
+
 logging.basicConfig(level=logging.INFO)
-def logger(mensagem, nivel=logging.INFO):
-    """_summary_
+
+CORES = {
+    logging.NOTSET: '\033[94m',    # azul para NOTSET
+    logging.DEBUG: '\033[94m',     # azul para DEBUG
+    logging.INFO: '\033[92m',      # verde para sucesso
+    logging.WARNING: '\033[93m',   # amarelo para alerta
+    logging.ERROR: '\033[91m'      # vermelho para erro
+}
+
+LOG_RECORDS = metrics.counter("log_records_total", "Registros de log por destino.", ("result",))
+LOG_WRITTEN = LOG_RECORDS.labels("written")
+LOG_SAMPLED_OUT = LOG_RECORDS.labels("sampled_out")
+LOG_DROPPED = LOG_RECORDS.labels("dropped")
+
+
+class LoggerCore():
+    def __init__(self) -> None:
+        """
+        Inicializa o pipeline de logs estruturados.
+
+        Os registros são montados na thread de quem chama apenas como uma
+        tupla e entregues, por uma fila limitada a LOG_QUEUE_SIZE, a uma
+        thread de fundo que formata (JSON por padrão, ou texto colorido com
+        LOG_FORMAT=text) e escreve em lote no stderr. Se a fila estiver
+        cheia o registro é descartado, nunca bloqueando o event loop.
+        LOG_SAMPLE_RATES define, por nível, a fração de registros mantida
+        (por padrão 1% dos DEBUG, usados nas mensagens de cache hit).
+        """
+        self.LOG_LEVEL = logging.getLevelName(os.environ.get("LOG_LEVEL", "DEBUG").upper())
+        self.LOG_FORMAT = os.environ.get("LOG_FORMAT", "json").lower()
+        self.LOG_QUEUE_SIZE = int(os.environ.get("LOG_QUEUE_SIZE", 10000))
+        self.LOG_SAMPLE_RATES = self._parse_sample_rates(os.environ.get("LOG_SAMPLE_RATES", "DEBUG:0.01"))
+        self.stream = sys.stderr
+        self.queue: queue.Queue = queue.Queue(maxsize=self.LOG_QUEUE_SIZE)
+        self.dropped = 0
+        self._thread: Optional[threading.Thread] = None
+        self._pid: Optional[int] = None
+        self._start_lock = threading.Lock()
+
+    @staticmethod
+    def _parse_sample_rates(value: str) -> dict:
+        rates = {}
+        for item in value.split(","):
+            if not item.strip():
+                continue
+            level, rate = item.strip().split(":")
+            rates[logging.getLevelName(level.strip().upper())] = float(rate)
+        return rates
+
+    def log(self, mensagem, nivel: int = logging.INFO, campos: Optional[dict] = None) -> None:
+        """
+        Enfileira um registro de log sem bloquear.
+
+        Args:
+            mensagem (Any): A mensagem.
+            nivel (int, optional): O nível do logging. O padrão é INFO.
+            campos (dict, optional): Campos extras do registro estruturado.
+        """
+        if nivel < self.LOG_LEVEL:
+            return
+        sample_rate = self.LOG_SAMPLE_RATES.get(nivel, 1.0)
+        if sample_rate < 1.0 and random.random() >= sample_rate:
+            LOG_SAMPLED_OUT.inc()
+            return
+        if self._pid != os.getpid():
+            self._start()
+        try:
+            self.queue.put_nowait((time.time(), nivel, mensagem, sample_rate, campos))
+        except queue.Full:
+            self.dropped += 1
+            LOG_DROPPED.inc()
+
+    def _start(self) -> None:
+        """
+        Inicia a thread de escrita, também após um fork do processo.
+        """
+        with self._start_lock:
+            if self._pid == os.getpid() and self._thread is not None and self._thread.is_alive():
+                return
+            self.queue = queue.Queue(maxsize=self.LOG_QUEUE_SIZE)
+            self._thread = threading.Thread(target=self._run, name="logger-core", daemon=True)
+            self._pid = os.getpid()
+            self._thread.start()
+
+    def _run(self) -> None:
+        """
+        Consome a fila e escreve os registros em lote, com um único flush por lote.
+        """
+        records_queue = self.queue
+        while True:
+            records = [records_queue.get()]
+            try:
+                while len(records) < 512:
+                    records.append(records_queue.get_nowait())
+            except queue.Empty:
+                pass
+            stop = None in records
+            lines = [self._format(record) for record in records if record is not None]
+            dropped = self.dropped
+            if dropped:
+                self.dropped -= dropped
+                lines.append(self._format((time.time(), logging.WARNING, f"{dropped} registros de log descartados", 1.0, None)))
+            try:
+                if lines:
+                    self.stream.write("\n".join(lines) + "\n")
+                    self.stream.flush()
+                    LOG_WRITTEN.inc(len(lines))
+            except Exception:
+                pass
+            if stop:
+                return
+
+    def _format(self, record: tuple) -> str:
+        created, nivel, mensagem, sample_rate, campos = record
+        if self.LOG_FORMAT == "text":
+            return f"{logging.getLevelName(nivel)}:{__name__}:{CORES.get(nivel, '')}{mensagem}\033[0m"
+        data = {
+            "timestamp": datetime.fromtimestamp(created, tz=timezone.utc).isoformat(timespec="milliseconds"),
+            "level": logging.getLevelName(nivel),
+            "logger": __name__,
+            "pid": self._pid,
+            "message": str(mensagem),
+        }
+        if sample_rate < 1.0:
+            data["sample_rate"] = sample_rate
+        if campos:
+            data.update(campos)
+        return json.dumps(data, ensure_ascii=False, default=str)
+
+    def close(self, timeout: float = 2) -> None:
+        """
+        Escreve os registros pendentes e encerra a thread de escrita.
+
+        Args:
+            timeout (float, optional): Tempo máximo de espera, em segundos.
+        """
+        thread = self._thread
+        if thread is None or not thread.is_alive() or self._pid != os.getpid():
+            return
+        try:
+            self.queue.put(None, timeout=timeout)
+        except queue.Full:
+            return
+        thread.join(timeout=timeout)
+
+
+logger_core = LoggerCore()
+atexit.register(logger_core.close)
+
+
+def logger(mensagem, nivel=logging.INFO, **campos):
+    """
+    Registra uma mensagem no pipeline de logs estruturados, sem bloquear
+    quem chama.
 
     Args:
-        mensagem (_type_): _description_
-        nivel:{    
+        mensagem (_type_): A mensagem.
+        nivel:{
             logging.NOTSET: azul para NOTSET
+            logging.DEBUG: azul, amostrado (mensagens de cache hit)
             logging.INFO: verde para sucesso
             logging.WARNING: amarelo para alerta
             logging.ERROR: vermelho para erro
         }
+        **campos: Campos extras incluídos no registro JSON.
     """
-    logger = logging.getLogger(__name__) 
-    cores = {
-        logging.NOTSET: '\033[94m',    # azul para NOTSET
-        logging.INFO: '\033[92m',    # verde para sucesso
-        logging.WARNING: '\033[93m',  # amarelo para alerta
-        logging.ERROR: '\033[91m'     # vermelho para erro
-    }
-    mensagem_formatada = f"{cores.get(nivel, '')}{mensagem}\033[0m"
-    logger.log(nivel, mensagem_formatada)
- 
-
-# 
-# exibir_e_logar("Operação de Serviço!", nivel=logging.NOTSET)
-# exibir_e_logar("Operação bem-sucedida!", nivel=logging.INFO)
-# exibir_e_logar("Isso é um alerta.", nivel=logging.WARNING)
-# exibir_e_logar("Ocorreu um erro!", nivel=logging.ERROR)
+    logger_core.log(mensagem, nivel, campos)
@@ -0,0 +1,113 @@
+import os
+import time
+from collections import OrderedDict
+from typing import Any, Optional
+
+from src.system.core.metrics_core import CACHE_REQUESTS
+
+class MemoryCacheCore():
+    def __init__(self, max_size: Optional[int] = None, max_skew: Optional[float] = None, layer: str = "l1") -> None:
+        """
+        Inicializa o cache em memória do processo (L1), com limite de tamanho,
+        tempo de vida por entrada e descarte LRU.
+
+        O tempo de vida (MEMORY_CACHE_MAX_SKEW) também é o tempo máximo em que
+        dois workers podem servir valores divergentes caso uma invalidação
+        seja perdida.
+
+        Args:
+            max_size (int, optional): Quantidade máxima de entradas. O padrão
+                                      é MEMORY_CACHE_MAX_SIZE.
+            max_skew (float, optional): Tempo de vida máximo, em segundos. O
+                                        padrão é MEMORY_CACHE_MAX_SKEW.
+            layer (str, optional): Nome da camada nas métricas de cache.
+        """
+        self.MEMORY_CACHE_MAX_SIZE = int(os.environ.get("MEMORY_CACHE_MAX_SIZE", 1024)) if max_size is None else max_size
+        self.MEMORY_CACHE_MAX_SKEW = float(os.environ.get("MEMORY_CACHE_MAX_SKEW", 5)) if max_skew is None else max_skew
+        self._hits_counter = CACHE_REQUESTS.labels(layer, "hit")
+        self._misses_counter = CACHE_REQUESTS.labels(layer, "miss")
+        self._data: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.MEMORY_CACHE_MAX_SIZE > 0 and self.MEMORY_CACHE_MAX_SKEW > 0
+
+    def get(self, key: str) -> Optional[Any]:
+        """
+        Recupera um valor do cache, descartando-o se estiver expirado.
+
+        Args:
+            key (str): A chave do valor.
+
+        Returns:
+            Any: O valor armazenado, ou None se não houver ou estiver expirado.
+        """
+        item = self._data.get(key)
+        if item is None:
+            self.misses += 1
+            self._misses_counter.inc()
+            return None
+        expires_at, value = item
+        if expires_at <= time.monotonic():
+            del self._data[key]
+            self.misses += 1
+            self._misses_counter.inc()
+            return None
+        self._data.move_to_end(key)
+        self.hits += 1
+        self._hits_counter.inc()
+        return value
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        """
+        Armazena um valor no cache, descartando o menos usado se o limite
+        de tamanho for atingido.
+
+        Args:
+            key (str): A chave do valor.
+            value (Any): O valor a ser armazenado.
+            ttl (float, optional): Tempo de vida em segundos, limitado a
+                                   MEMORY_CACHE_MAX_SKEW.
+        """
+        if not self.enabled:
+            return
+        ttl = self.MEMORY_CACHE_MAX_SKEW if ttl is None else min(ttl, self.MEMORY_CACHE_MAX_SKEW)
+        self._data[key] = (time.monotonic() + ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.MEMORY_CACHE_MAX_SIZE:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    def delete(self, key: str) -> None:
+        """
+        Remove uma chave do cache, se existir.
+
+        Args:
+            key (str): A chave a ser removida.
+        """
+        self._data.pop(key, None)
+
+    def clear(self) -> None:
+        """
+        Remove todas as chaves do cache.
+        """
+        self._data.clear()
+
+    def stats(self) -> dict:
+        """
+        Retorna os contadores do cache.
+
+        Returns:
+            dict: Tamanho atual, acertos, faltas, descartes e taxa de acerto.
+        """
+        total = self.hits + self.misses
+        return {
+            "size": len(self._data),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_ratio": self.hits / total if total else 0.0,
+        }
@@ -0,0 +1,278 @@
+import os
+import time
+from bisect import bisect_left
+from typing import Callable, Optional
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labelnames: tuple, labelvalues: tuple, extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(labelnames, labelvalues)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class CounterChild():
+    __slots__ = ("value",)
+
+    def __init__(self) -> None:
+        self.value = 0
+
+    def inc(self, amount: float = 1) -> None:
+        self.value += amount
+
+
+class GaugeChild():
+    __slots__ = ("value",)
+
+    def __init__(self) -> None:
+        self.value = 0
+
+    def set(self, value: float) -> None:
+        self.value = value
+
+    def inc(self, amount: float = 1) -> None:
+        self.value += amount
+
+    def dec(self, amount: float = 1) -> None:
+        self.value -= amount
+
+
+class HistogramChild():
+    __slots__ = ("buckets", "counts", "sum")
+
+    def __init__(self, buckets: tuple) -> None:
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+
+
+class Metric():
+    TYPE = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple = ()) -> None:
+        """
+        Métrica com filhos por combinação de rótulos.
+
+        Os filhos devem ser obtidos uma única vez com `labels` e guardados por
+        quem registra, de forma que o caminho quente seja apenas um incremento
+        de atributo, sem locks nem alocações.
+
+        Args:
+            name (str): Nome da métrica no formato Prometheus.
+            documentation (str): Texto do HELP.
+            labelnames (tuple, optional): Nomes dos rótulos.
+        """
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.children: dict = {}
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def labels(self, *labelvalues):
+        """
+        Retorna o filho da combinação de rótulos, criando-o se necessário.
+
+        Args:
+            *labelvalues (str): Os valores dos rótulos, na ordem de `labelnames`.
+
+        Returns:
+            CounterChild | GaugeChild | HistogramChild: O filho da combinação.
+        """
+        child = self.children.get(labelvalues)
+        if child is None:
+            if len(labelvalues) != len(self.labelnames):
+                raise ValueError(f"A métrica '{self.name}' espera os rótulos {self.labelnames}.")
+            child = self.children.setdefault(labelvalues, self._new_child())
+        return child
+
+    def render(self) -> list:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.TYPE}"]
+        for labelvalues, child in list(self.children.items()):
+            lines.extend(self._render_child(labelvalues=labelvalues, child=child))
+        return lines
+
+
+class Counter(Metric):
+    TYPE = "counter"
+
+    def _new_child(self) -> CounterChild:
+        return CounterChild()
+
+    def _render_child(self, labelvalues: tuple, child: CounterChild) -> list:
+        return [f"{self.name}{_format_labels(self.labelnames, labelvalues)} {_format_value(child.value)}"]
+
+
+class Gauge(Metric):
+    TYPE = "gauge"
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple = (), function: Optional[Callable] = None) -> None:
+        """
+        Métrica de valor instantâneo: definida por quem registra, nos filhos
+        obtidos com `labels`, ou calculada por `function` no momento da
+        coleta. Se os dois tiverem a mesma combinação de rótulos, vale a de
+        `function`.
+
+        Args:
+            name (str): Nome da métrica no formato Prometheus.
+            documentation (str): Texto do HELP.
+            labelnames (tuple, optional): Nomes dos rótulos.
+            function (Callable, optional): Função sem argumentos que retorna um
+                dicionário {valores dos rótulos: valor}.
+        """
+        super().__init__(name=name, documentation=documentation, labelnames=labelnames)
+        self.function = function
+
+    def _new_child(self) -> GaugeChild:
+        return GaugeChild()
+
+    def render(self) -> list:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.TYPE}"]
+        values = {labelvalues: child.value for labelvalues, child in list(self.children.items())}
+        values.update(self.function() if self.function else {})
+        for labelvalues, value in values.items():
+            lines.append(f"{self.name}{_format_labels(self.labelnames, labelvalues)} {_format_value(value)}")
+        return lines
+
+
+class Histogram(Metric):
+    TYPE = "histogram"
+    DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple = (), buckets: tuple = DEFAULT_BUCKETS) -> None:
+        super().__init__(name=name, documentation=documentation, labelnames=labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def _new_child(self) -> HistogramChild:
+        return HistogramChild(buckets=self.buckets)
+
+    def _render_child(self, labelvalues: tuple, child: HistogramChild) -> list:
+        lines = []
+        cumulative = 0
+        for bound, count in zip(self.buckets + (float("inf"),), list(child.counts)):
+            cumulative += count
+            labels = _format_labels(self.labelnames, labelvalues, extra=f'le="{_format_value(bound)}"')
+            lines.append(f"{self.name}_bucket{labels} {cumulative}")
+        labels = _format_labels(self.labelnames, labelvalues)
+        lines.append(f"{self.name}_sum{labels} {_format_value(child.sum)}")
+        lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+class MetricsCore():
+    def __init__(self) -> None:
+        """
+        Registro de métricas do processo, exposto em formato texto do
+        Prometheus.
+
+        Os contadores são atributos simples incrementados na thread do event
+        loop, sem locks; a coleta lê os valores no momento da renderização.
+        Cada worker expõe as próprias métricas.
+        """
+        self.METRICS_ENABLED = os.environ.get("METRICS_ENABLED", "true").lower() == "true"
+        self.metrics: dict[str, Metric] = {}
+
+    def _register(self, metric: Metric) -> Metric:
+        return self.metrics.setdefault(metric.name, metric)
+
+    def counter(self, name: str, documentation: str, labelnames: tuple = ()) -> Counter:
+        return self._register(Counter(name=name, documentation=documentation, labelnames=labelnames))
+
+    def histogram(self, name: str, documentation: str, labelnames: tuple = (), buckets: tuple = Histogram.DEFAULT_BUCKETS) -> Histogram:
+        return self._register(Histogram(name=name, documentation=documentation, labelnames=labelnames, buckets=buckets))
+
+    def gauge(self, name: str, documentation: str, labelnames: tuple = (), function: Optional[Callable] = None) -> Gauge:
+        return self._register(Gauge(name=name, documentation=documentation, labelnames=labelnames, function=function))
+
+    def render(self) -> str:
+        """
+        Renderiza todas as métricas registradas.
+
+        Returns:
+            str: As métricas no formato de exposição texto do Prometheus 0.0.4.
+        """
+        lines = []
+        for metric in list(self.metrics.values()):
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+metrics = MetricsCore()
+
+HTTP_REQUEST_DURATION = metrics.histogram(
+    "http_request_duration_seconds", "Duração das requisições HTTP.", ("method", "route", "status"),
+)
+CACHE_REQUESTS = metrics.counter(
+    "cache_requests_total", "Consultas ao cache por camada e resultado.", ("layer", "result"),
+)
+UPSTREAM_REQUEST_DURATION = metrics.histogram(
+    "upstream_request_duration_seconds", "Duração das chamadas às integrações.", ("integration",),
+)
+UPSTREAM_ERRORS = metrics.counter(
+    "upstream_errors_total", "Chamadas às integrações que não retornaram cotação.", ("integration", "reason"),
+)
+FX_LOOKUPS = metrics.counter(
+    "fx_lookups_total", "Consultas de câmbio por par e origem.", ("pair", "source"),
+)
+
+
+class MetricsMiddleware():
+    def __init__(self, app) -> None:
+        """
+        Middleware ASGI que mede a duração de cada requisição HTTP, rotulada
+        pelo método, pelo caminho da rota (sem parâmetros) e pelo status.
+
+        Args:
+            app (ASGIApp): A aplicação envolvida.
+        """
+        self.app = app
+        self._route_paths: dict = {}
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http" or not metrics.METRICS_ENABLED:
+            await self.app(scope, receive, send)
+            return
+        started_at = time.perf_counter()
+        status_code = [500]
+
+        async def send_wrapper(message) -> None:
+            if message["type"] == "http.response.start":
+                status_code[0] = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            HTTP_REQUEST_DURATION.labels(
+                scope["method"], self._route_path(scope), str(status_code[0]),
+            ).observe(time.perf_counter() - started_at)
+
+    def _route_path(self, scope) -> str:
+        endpoint = scope.get("endpoint")
+        if endpoint is None:
+            return "unmatched"
+        path = self._route_paths.get(endpoint)
+        if path is None:
+            app = scope.get("app")
+            self._route_paths.update({
+                route.endpoint: route.path
+                for route in getattr(app, "routes", [])
+                if getattr(route, "endpoint", None) is not None
+            })
+            path = self._route_paths.setdefault(endpoint, "unmatched")
+        return path
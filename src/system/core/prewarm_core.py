@@ -0,0 +1,154 @@
+import os
+import uuid
+import asyncio
+import logging
+from datetime import datetime
+from typing import Awaitable, Callable, Optional
+
+from src.system.core.logger_core import logger
+from src.system.core.redis_core import RedisCore
+
+
+class PrewarmCore():
+    def __init__(self, redis_core: RedisCore, refresh: Callable[[list], Awaitable[None]]) -> None:
+        """
+        Inicializa o agendador de pré-aquecimento de símbolos populares.
+
+        A frequência de consulta de cada símbolo é acumulada em memória e
+        enviada ao Redis a cada PREWARM_INTERVAL segundos, em sorted sets por
+        janela de PREWARM_BUCKET_TIME segundos. A cada ciclo, um único worker
+        (detentor de uma concessão no Redis) combina as últimas
+        PREWARM_WINDOW janelas com decaimento PREWARM_DECAY, escolhe os
+        PREWARM_TOP_N símbolos mais consultados e atualiza os que expiram nos
+        próximos PREWARM_LEAD_TIME segundos, respeitando o orçamento de
+        PREWARM_BUDGET_PER_MINUTE atualizações por minuto.
+
+        Args:
+            redis_core (RedisCore): Instância usada para contadores e concessões.
+            refresh (Callable): Função assíncrona que busca e grava no cache uma
+                                lista de símbolos.
+        """
+        self.PREWARM_ENABLED = os.environ.get("PREWARM_ENABLED", "true").lower() == "true"
+        self.PREWARM_INTERVAL = float(os.environ.get("PREWARM_INTERVAL", 5))
+        self.PREWARM_BUCKET_TIME = int(os.environ.get("PREWARM_BUCKET_TIME", 60))
+        self.PREWARM_WINDOW = int(os.environ.get("PREWARM_WINDOW", 10))
+        self.PREWARM_DECAY = float(os.environ.get("PREWARM_DECAY", 0.7))
+        self.PREWARM_TOP_N = int(os.environ.get("PREWARM_TOP_N", 50))
+        self.PREWARM_LEAD_TIME = float(os.environ.get("PREWARM_LEAD_TIME", 10))
+        self.PREWARM_BUDGET_PER_MINUTE = int(os.environ.get("PREWARM_BUDGET_PER_MINUTE", 60))
+        self.redis_core = redis_core
+        self.refresh = refresh
+        self._counts: dict[str, int] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    def record(self, symbol: str) -> None:
+        """
+        Registra uma consulta do símbolo. Apenas incrementa um contador em
+        memória; o envio ao Redis é feito em lote pelo ciclo do agendador.
+
+        Args:
+            symbol (str): O símbolo consultado.
+        """
+        if not self.PREWARM_ENABLED:
+            return
+        self._counts[symbol] = self._counts.get(symbol, 0) + 1
+        self.start()
+
+    def start(self) -> None:
+        """
+        Inicia o ciclo do agendador em segundo plano, se ainda não estiver rodando.
+        """
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._loop())
+
+    async def stop(self) -> None:
+        """
+        Interrompe o ciclo do agendador.
+        """
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def run_once(self) -> list:
+        """
+        Executa um ciclo: envia os contadores ao Redis e, se este worker obtiver
+        a concessão do ciclo, atualiza os símbolos populares prestes a expirar.
+
+        Returns:
+            list: Os símbolos atualizados neste ciclo.
+        """
+        bucket = int(datetime.now().timestamp() // self.PREWARM_BUCKET_TIME)
+        await self._flush(bucket=bucket)
+        token = uuid.uuid4().hex
+        if not await self.redis_core.acquire_lease_redis(key="lease:prewarm", token=token, time=self.PREWARM_INTERVAL):
+            return []
+
+        keys = [f"prewarm:hits:{bucket - age}" for age in range(self.PREWARM_WINDOW)]
+        weights = [self.PREWARM_DECAY ** age for age in range(self.PREWARM_WINDOW)]
+        ranking = await self.redis_core.ztop_union_redis(
+            keys=keys, weights=weights, dest="prewarm:ranking", count=self.PREWARM_TOP_N, time=self.PREWARM_BUCKET_TIME,
+        )
+        symbols = [symbol for symbol, _ in ranking]
+        if not symbols:
+            return []
+
+        now = datetime.now().timestamp()
+        expirations = await self.redis_core.mget_soft_expirations_redis(keys=[self.redis_core.quote_key(symbol) for symbol in symbols])
+        expiring = [
+            symbol for symbol, soft_expires_at in zip(symbols, expirations)
+            if soft_expires_at is not None and soft_expires_at - now <= self.PREWARM_LEAD_TIME
+        ]
+        expiring = expiring[:await self._take_budget(requested=len(expiring))]
+        if expiring:
+            await self.refresh(expiring)
+            logger(mensagem=f":D -------- PREWARM {len(expiring)} SYMBOLS -------- :D", nivel=logging.INFO)
+        return expiring
+
+    async def _flush(self, bucket: int) -> None:
+        """
+        Envia ao Redis os contadores acumulados em memória.
+
+        Args:
+            bucket (int): A janela de tempo atual.
+        """
+        if not self._counts:
+            return
+        counts, self._counts = self._counts, {}
+        await self.redis_core.zincrby_many_redis(
+            key=f"prewarm:hits:{bucket}",
+            data=counts,
+            time=self.PREWARM_BUCKET_TIME * (self.PREWARM_WINDOW + 1),
+        )
+
+    async def _take_budget(self, requested: int) -> int:
+        """
+        Reserva atualizações no orçamento do minuto corrente.
+
+        Args:
+            requested (int): Quantidade de atualizações desejadas.
+
+        Returns:
+            int: Quantidade de atualizações permitidas.
+        """
+        if requested <= 0:
+            return 0
+        key = f"prewarm:budget:{int(datetime.now().timestamp() // 60)}"
+        used = await self.redis_core.incr_redis(key=key, amount=requested, time=60)
+        return max(0, min(requested, self.PREWARM_BUDGET_PER_MINUTE - (used - requested)))
+
+    async def _loop(self) -> None:
+        """
+        Executa `run_once` a cada PREWARM_INTERVAL segundos.
+        """
+        while True:
+            await asyncio.sleep(self.PREWARM_INTERVAL)
+            try:
+                await self.run_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception as error:
+                logger(mensagem=f"PrewarmCore._loop -> {error}", nivel=logging.WARNING)
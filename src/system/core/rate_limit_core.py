@@ -0,0 +1,134 @@
+import os
+import logging
+from typing import Optional
+
+from src.system.core.logger_core import logger
+from src.system.core.redis_core import RedisCore, RedisUnavailableError
+
+
+class RateLimitExceeded(Exception):
+    def __init__(self, key: str, retry_after: float) -> None:
+        """
+        Erro levantado quando um balde de tokens não tem saldo suficiente.
+
+        Args:
+            key (str): A chave do balde.
+            retry_after (float): Segundos até haver tokens suficientes.
+        """
+        super().__init__(f"Limite de requisições excedido para {key}; tente novamente em {retry_after:.2f}s.")
+        self.key = key
+        self.retry_after = retry_after
+
+
+class RateLimitCore():
+    TOKEN_BUCKET_SCRIPT = """
+    local rate = tonumber(ARGV[1])
+    local capacity = tonumber(ARGV[2])
+    local cost = tonumber(ARGV[3])
+    local time = redis.call("TIME")
+    local now = tonumber(time[1]) + tonumber(time[2]) / 1000000
+    local bucket = redis.call("HMGET", KEYS[1], "tokens", "updated_at")
+    local tokens = tonumber(bucket[1]) or capacity
+    local updated_at = tonumber(bucket[2]) or now
+    tokens = math.min(capacity, tokens + math.max(0, now - updated_at) * rate)
+    local retry_after = 0
+    if tokens >= cost then
+        tokens = tokens - cost
+    else
+        retry_after = (cost - tokens) / rate
+    end
+    redis.call("HSET", KEYS[1], "tokens", string.format("%.17g", tokens), "updated_at", string.format("%.17g", now))
+    redis.call("PEXPIRE", KEYS[1], math.ceil(capacity / rate * 1000) + 1000)
+    return string.format("%.17g", retry_after)
+    """
+
+    def __init__(self, redis_core: RedisCore) -> None:
+        """
+        Inicializa o limitador de requisições por balde de tokens.
+
+        Os baldes ficam no Redis e são consumidos atomicamente por um script
+        Lua (uma ida ao servidor por verificação), de forma que o limite vale
+        para todos os workers. Há um balde por usuário autenticado
+        (RATE_LIMIT_USER_RATE tokens/s, até RATE_LIMIT_USER_BURST) e um por
+        integração listada em RATE_LIMIT_PROVIDERS, no formato
+        "Integracao:tokens_por_segundo:capacidade,...". Se o Redis falhar, a
+        requisição é liberada.
+
+        Args:
+            redis_core (RedisCore): Instância usada para os baldes.
+        """
+        self.RATE_LIMIT_ENABLED = os.environ.get("RATE_LIMIT_ENABLED", "true").lower() == "true"
+        self.RATE_LIMIT_USER_RATE = float(os.environ.get("RATE_LIMIT_USER_RATE", 10))
+        self.RATE_LIMIT_USER_BURST = float(os.environ.get("RATE_LIMIT_USER_BURST", 20))
+        self.RATE_LIMIT_PROVIDERS = self._parse_providers(
+            os.environ.get("RATE_LIMIT_PROVIDERS", "CoinGecko:0.5:10,StoreMercadoBitcoin:5:20")
+        )
+        self.redis_core = redis_core
+        self.token_bucket_script = redis_core.register_script_redis(self.TOKEN_BUCKET_SCRIPT)
+
+    @staticmethod
+    def _parse_providers(value: str) -> dict:
+        providers = {}
+        for item in value.split(","):
+            if not item.strip():
+                continue
+            name, rate, capacity = item.strip().split(":")
+            providers[name] = (float(rate), float(capacity))
+        return providers
+
+    async def acquire(self, key: str, rate: float, capacity: float, cost: float = 1) -> None:
+        """
+        Consome `cost` tokens do balde.
+
+        Args:
+            key (str): A chave do balde.
+            rate (float): Tokens repostos por segundo.
+            capacity (float): Capacidade máxima do balde (rajada).
+            cost (float, optional): Tokens a consumir. O padrão é 1.
+
+        Raises:
+            RateLimitExceeded: Se o balde não tiver tokens suficientes.
+        """
+        if not self.RATE_LIMIT_ENABLED or rate <= 0:
+            return
+        try:
+            retry_after = float(await self.redis_core.eval_script_redis(
+                script=self.token_bucket_script,
+                keys=[f"ratelimit:{key}"],
+                args=[rate, capacity, min(cost, capacity)],
+            ))
+        except RedisUnavailableError:
+            # Modo degradado: o limite fica aberto sem registrar cada requisição.
+            return
+        except Exception as error:
+            logger(mensagem=f"RateLimitCore.acquire -> {error}", nivel=logging.WARNING)
+            return
+        if retry_after > 0:
+            raise RateLimitExceeded(key=key, retry_after=retry_after)
+
+    async def acquire_user(self, username: str) -> None:
+        """
+        Consome um token do balde do usuário.
+
+        Args:
+            username (str): O usuário autenticado.
+
+        Raises:
+            RateLimitExceeded: Se o usuário excedeu o limite.
+        """
+        await self.acquire(key=f"user:{username}", rate=self.RATE_LIMIT_USER_RATE, capacity=self.RATE_LIMIT_USER_BURST)
+
+    async def acquire_provider(self, name: str, cost: float = 1) -> None:
+        """
+        Consome tokens do balde da integração, se ela tiver limite configurado.
+
+        Args:
+            name (str): Nome da integração em CLASS_MAPPING.
+            cost (float, optional): Quantidade de chamadas ao upstream.
+
+        Raises:
+            RateLimitExceeded: Se a integração excedeu o limite.
+        """
+        limit: Optional[tuple] = self.RATE_LIMIT_PROVIDERS.get(name)
+        if limit:
+            await self.acquire(key=f"provider:{name}", rate=limit[0], capacity=limit[1], cost=cost)
@@ -1,57 +1,367 @@
 import json
 import os
+import math
+import time
+import asyncio
+import logging
+from collections import OrderedDict
+from datetime import datetime
 import redis.asyncio as redis  
 
+from src.system.core.logger_core import logger
+from src.system.core.circuit_breaker_core import CircuitBreakerCore
+from src.system.core.memory_cache_core import MemoryCacheCore
+from src.system.core.metrics_core import CACHE_REQUESTS, metrics
+
+REDIS_HITS = CACHE_REQUESTS.labels("redis", "hit")
+REDIS_MISSES = CACHE_REQUESTS.labels("redis", "miss")
+
+class RedisCoreError(Exception):
+    def __init__(self, error: Exception) -> None:
+        """
+        Erro levantado quando uma operação no Redis falha.
+
+        Args:
+            error (Exception): O erro original do cliente Redis.
+        """
+        super().__init__(str(error))
+        self.error = error
+
+
+class RedisUnavailableError(RedisCoreError):
+    """
+    Erro levantado quando o Redis não respondeu dentro do prazo, recusou a
+    conexão ou não foi chamado por estar em modo degradado (circuito aberto).
+    """
+
+
+REDIS_WRITES = metrics.counter("redis_deferred_writes_total", "Escritas adiadas durante o modo degradado, por destino.", ("result",))
+REDIS_WRITES_DEFERRED = REDIS_WRITES.labels("deferred")
+REDIS_WRITES_REPLAYED = REDIS_WRITES.labels("replayed")
+REDIS_WRITES_DROPPED = REDIS_WRITES.labels("dropped")
+
+
 class RedisCore():
+    SET_ENTRY_SCRIPT = """
+    local current = redis.call("GET", KEYS[1])
+    if current then
+        local ok, entry = pcall(cjson.decode, current)
+        if ok and type(entry) == "table" and entry["fetched_at"] and tonumber(entry["fetched_at"]) > tonumber(ARGV[2]) then
+            return 0
+        end
+    end
+    redis.call("SET", KEYS[1], ARGV[1], "EX", ARGV[3])
+    return 1
+    """
+
+    TRACKING_CHANNEL = "__redis__:invalidate"
+
+    AVAILABILITY_ERRORS = (redis.ConnectionError, redis.TimeoutError, asyncio.TimeoutError, OSError)
+
+    NORMAL = "normal"
+    DEGRADED = "degraded"
+
+    RELEASE_LEASE_SCRIPT = """
+    if redis.call("GET", KEYS[1]) == ARGV[1] then
+        return redis.call("DEL", KEYS[1])
+    end
+    return 0
+    """
+
     def __init__(self) -> None:
+        """
+        Inicializa o cliente Redis com um pool de conexões limitado.
+
+        O pool tem até REDIS_MAX_CONNECTIONS conexões; quando todas estão em
+        uso, a chamada espera até REDIS_POOL_TIMEOUT segundos por uma livre.
+        REDIS_SOCKET_TIMEOUT e REDIS_SOCKET_CONNECT_TIMEOUT limitam cada
+        comando e cada conexão, e conexões ociosas há mais de
+        REDIS_HEALTH_CHECK_INTERVAL segundos são testadas com PING antes do
+        uso. REDIS_PROTOCOL escolhe RESP2 ou RESP3 para os comandos.
+
+        Com REDIS_CLIENT_TRACKING ligado, o cache em memória também é
+        invalidado pelo próprio servidor (CLIENT TRACKING em modo BCAST,
+        opcionalmente restrito a REDIS_TRACKING_PREFIXES), o que cobre
+        escritas feitas fora deste serviço e expirações de chaves.
+
+        Modo degradado: cada chamada tem o prazo REDIS_DEADLINE e passa por
+        um circuit breaker (aberto por REDIS_CIRCUIT_OPEN_TIME segundos). Com
+        o Redis lento ou fora, as leituras de cache caem para um cache em
+        memória limitado (REDIS_FALLBACK_MAX_SIZE entradas, até
+        REDIS_FALLBACK_TTL segundos) com os últimos valores lidos ou gravados,
+        e o serviço continua respondendo. Operações em lote ou de intervalo
+        (pipelines de várias chaves, scripts em série, faixas de sorted set e
+        snapshots grandes) têm o prazo maior REDIS_BULK_DEADLINE, e o estouro
+        desse prazo não conta como falha no circuito: só erros de conexão
+        delas abrem o circuito. Política de escrita:
+
+        - `set_redis`, `mset_redis` e `set_entries_redis` (valores de cache)
+          que falharem ficam em uma fila de até REDIS_REPLAY_MAX_SIZE chaves,
+          só com o último valor de cada uma, e são regravados quando o Redis
+          volta. Envelopes passam pelo SET_ENTRY_SCRIPT, então nunca
+          sobrescrevem um valor mais novo, e valores cujo TTL venceu
+          enquanto esperavam são descartados. Com a fila cheia, a chave mais
+          antiga é descartada.
+        - As demais escritas (contadores, concessões, baldes de rate limit,
+          sorted sets e histórico) são descartadas: valem por pouco tempo ou
+          seriam incorretas se aplicadas depois. Elas levantam
+          RedisUnavailableError e cada chamador decide como seguir.
+        """
         self.REDIS_HOST = os.environ.get("REDIS_HOST", "0.0.0.0")
         self.REDIS_PORT = int(os.environ.get("REDIS_PORT", 6379))
         self.REDIS_TIME = int(os.environ.get("REDIS_TIME", 3600))
-        
+        self.REDIS_STALE_TIME = int(os.environ.get("REDIS_STALE_TIME", self.REDIS_TIME))
+        self.REDIS_QUOTE_PREFIX = os.environ.get("REDIS_QUOTE_PREFIX", "quote:")
+        self.REDIS_MAX_CONNECTIONS = int(os.environ.get("REDIS_MAX_CONNECTIONS", 50))
+        self.REDIS_POOL_TIMEOUT = float(os.environ.get("REDIS_POOL_TIMEOUT", 5))
+        self.REDIS_SOCKET_TIMEOUT = float(os.environ.get("REDIS_SOCKET_TIMEOUT", 2))
+        self.REDIS_SOCKET_CONNECT_TIMEOUT = float(os.environ.get("REDIS_SOCKET_CONNECT_TIMEOUT", 1))
+        self.REDIS_HEALTH_CHECK_INTERVAL = int(os.environ.get("REDIS_HEALTH_CHECK_INTERVAL", 30))
+        self.REDIS_PROTOCOL = int(os.environ.get("REDIS_PROTOCOL", 2))
+        self.REDIS_CLIENT_TRACKING = os.environ.get("REDIS_CLIENT_TRACKING", "false").lower() == "true"
+        self.REDIS_TRACKING_PREFIXES = [prefix for prefix in os.environ.get("REDIS_TRACKING_PREFIXES", "").split(",") if prefix]
+        self.MEMORY_CACHE_CHANNEL = os.environ.get("MEMORY_CACHE_CHANNEL", "cache:invalidate")
+        self.REDIS_DEADLINE = float(os.environ.get("REDIS_DEADLINE", 0.25))
+        self.REDIS_BULK_DEADLINE = float(os.environ.get("REDIS_BULK_DEADLINE", 2))
+        self.REDIS_CIRCUIT_OPEN_TIME = float(os.environ.get("REDIS_CIRCUIT_OPEN_TIME", 5))
+        self.REDIS_FALLBACK_MAX_SIZE = int(os.environ.get("REDIS_FALLBACK_MAX_SIZE", 10000))
+        self.REDIS_FALLBACK_TTL = float(os.environ.get("REDIS_FALLBACK_TTL", self.REDIS_TIME + self.REDIS_STALE_TIME))
+        self.REDIS_REPLAY_MAX_SIZE = int(os.environ.get("REDIS_REPLAY_MAX_SIZE", 1000))
+        self.memory_cache = MemoryCacheCore()
+        self.fallback_cache = MemoryCacheCore(max_size=self.REDIS_FALLBACK_MAX_SIZE, max_skew=self.REDIS_FALLBACK_TTL, layer="fallback")
+        self.circuit_breaker = CircuitBreakerCore(name="redis", open_time=self.REDIS_CIRCUIT_OPEN_TIME)
+        self.pending_writes: OrderedDict[str, tuple] = OrderedDict()
+        self._replay_task = None
+        self._invalidation_task = None
+
+        self.redis_service = self._create_client(protocol=self.REDIS_PROTOCOL, max_connections=self.REDIS_MAX_CONNECTIONS)
+        # As mensagens de pub/sub e de invalidação do CLIENT TRACKING usam
+        # sempre RESP2: no RESP3 o cliente assíncrono as entrega como push e
+        # não pelo canal inscrito.
+        self.redis_pubsub_service = self._create_client(protocol=2, max_connections=2)
+        self.set_entry_script = self.register_script_redis(self.SET_ENTRY_SCRIPT)
+        self.release_lease_script = self.register_script_redis(self.RELEASE_LEASE_SCRIPT)
+
+    def _create_client(self, protocol, max_connections):
+        """
+        Cria um cliente Redis com um pool de conexões próprio.
+
+        Args:
+            protocol (int): A versão do protocolo (2 ou 3).
+            max_connections (int): O tamanho máximo do pool.
+
+        Returns:
+            StrictRedis: O cliente.
+        """
+        pool = redis.BlockingConnectionPool(
+            host=f"{self.REDIS_HOST}",
+            port=self.REDIS_PORT,
+            db=5,
+            decode_responses=True,
+            protocol=protocol,
+            max_connections=max_connections,
+            timeout=self.REDIS_POOL_TIMEOUT,
+            socket_timeout=self.REDIS_SOCKET_TIMEOUT,
+            socket_connect_timeout=self.REDIS_SOCKET_CONNECT_TIMEOUT,
+            socket_keepalive=True,
+            health_check_interval=self.REDIS_HEALTH_CHECK_INTERVAL,
+            retry_on_timeout=True,
+        )
+        return redis.StrictRedis(connection_pool=pool)
+
+    @property
+    def mode(self) -> str:
+        return self.NORMAL if self.circuit_breaker.state == CircuitBreakerCore.CLOSED else self.DEGRADED
+
+    async def _run(self, operation, bulk=False):
+        """
+        Executa uma operação no Redis com o prazo REDIS_DEADLINE, passando
+        pelo circuit breaker.
+
+        Erros de conexão e estouros de prazo contam como falha no circuito;
+        erros de comando (como um script inválido) não, pois o servidor
+        respondeu. Operações em lote usam o prazo REDIS_BULK_DEADLINE; o
+        estouro dele não conta como falha e a duração delas não entra na
+        latência do circuito, que reflete as chamadas pontuais.
+
+        Args:
+            operation (Callable): Função assíncrona, sem argumentos, que usa o Redis.
+            bulk (bool, optional): Se a operação é em lote ou de intervalo.
+
+        Raises:
+            RedisUnavailableError: Se o circuito estiver aberto, o prazo
+                                   estourar ou a conexão falhar.
+            RedisCoreError: Se o Redis responder com erro.
+
+        Returns:
+            Any: O retorno da operação.
+        """
+        if not self.circuit_breaker.allow():
+            raise RedisUnavailableError(ConnectionError("Redis em modo degradado, chamada não realizada."))
+        started = time.monotonic()
         try:
-            self.redis_service = redis.StrictRedis(host=f"{self.REDIS_HOST}", port=self.REDIS_PORT, db=5,decode_responses=True,retry_on_timeout=True)
-        except redis.ConnectionError as e:
-            print(f"Erro de conexão com o Redis: {e}")        
-        except redis.TimeoutError as e:
-            print(f"Erro de timeout ao conectar ao Redis: {e}")        
-        except Exception as e:
-            print(f"Ocorreu um erro ao tentar conectar ao Redis: {e}")
+            response = await asyncio.wait_for(operation(), timeout=self.REDIS_BULK_DEADLINE if bulk else self.REDIS_DEADLINE)
+        except asyncio.CancelledError:
+            self.circuit_breaker.record_cancelled()
+            raise
+        except asyncio.TimeoutError as error:
+            if bulk:
+                self.circuit_breaker.record_cancelled()
+            else:
+                self.circuit_breaker.record_failure(latency=time.monotonic() - started, error=error)
+            raise RedisUnavailableError(error) from error
+        except self.AVAILABILITY_ERRORS as error:
+            self.circuit_breaker.record_failure(latency=None if bulk else time.monotonic() - started, error=error)
+            raise RedisUnavailableError(error) from error
+        except Exception as error:
+            self.circuit_breaker.record_success(latency=None if bulk else time.monotonic() - started)
+            raise RedisCoreError(error) from error
+        self.circuit_breaker.record_success(latency=None if bulk else time.monotonic() - started)
+        if self.pending_writes and (self._replay_task is None or self._replay_task.done()):
+            self._replay_task = asyncio.ensure_future(self._replay_writes())
+        return response
+
+    def _defer_write(self, key, value, time=None, fetched_at=None):
+        """
+        Guarda uma escrita de cache que falhou para regravá-la quando o Redis
+        voltar, mantendo só o último valor de cada chave.
+
+        Args:
+            key (str): A chave.
+            value (str): O valor serializado.
+            time (float, optional): O TTL da chave em segundos, ou None para
+                                    não expirar.
+            fetched_at (float, optional): O instante da busca, para
+                                          envelopes de cache.
+        """
+        if self.REDIS_REPLAY_MAX_SIZE <= 0:
+            REDIS_WRITES_DROPPED.inc()
+            return
+        expires_at = None if time is None else datetime.now().timestamp() + time
+        self.pending_writes.pop(key, None)
+        self.pending_writes[key] = (value, expires_at, fetched_at)
+        REDIS_WRITES_DEFERRED.inc()
+        while len(self.pending_writes) > self.REDIS_REPLAY_MAX_SIZE:
+            self.pending_writes.popitem(last=False)
+            REDIS_WRITES_DROPPED.inc()
+
+    async def _replay_writes(self):
+        """
+        Regrava, em pipelines de até 100 chaves, as escritas adiadas durante
+        o modo degradado. Se o Redis falhar de novo, as escritas restantes
+        voltam para a fila sem sobrescrever outras mais novas.
+        """
+        while self.pending_writes:
+            batch = []
+            while self.pending_writes and len(batch) < 100:
+                batch.append(self.pending_writes.popitem(last=False))
+            now = datetime.now().timestamp()
+            live = [(key, item) for key, item in batch if item[1] is None or item[1] > now]
+            REDIS_WRITES_DROPPED.inc(len(batch) - len(live))
+            if not live:
+                continue
 
-    async def set_redis(self, key, data):
+            async def operation():
+                async with self.redis_service.pipeline(transaction=False) as pipe:
+                    for key, (value, expires_at, fetched_at) in live:
+                        ttl = None if expires_at is None else max(1, math.ceil(expires_at - now))
+                        if fetched_at is not None:
+                            await self.set_entry_script(keys=[key], args=[value, fetched_at, ttl], client=pipe)
+                        else:
+                            pipe.set(key, value, ex=ttl)
+                        pipe.publish(self.MEMORY_CACHE_CHANNEL, key)
+                    return await pipe.execute()
+            try:
+                await self._run(operation, bulk=True)
+            except RedisCoreError as error:
+                for key, item in reversed(live):
+                    if key not in self.pending_writes:
+                        self.pending_writes[key] = item
+                        self.pending_writes.move_to_end(key, last=False)
+                logger(mensagem=f"RedisCore._replay_writes -> {error}", nivel=logging.WARNING)
+                return
+            REDIS_WRITES_REPLAYED.inc(len(live))
+            for key, _ in live:
+                self.memory_cache.delete(key)
+        logger(mensagem=":D -------- REDIS ESCRITAS ADIADAS REGRAVADAS -------- :D", nivel=logging.INFO)
+
+    def stats(self) -> dict:
+        """
+        Retorna o modo de operação e o estado do Redis neste worker.
+
+        Returns:
+            dict: Modo, estado do circuito, escritas aguardando regravação e
+                tamanho dos caches em memória.
+        """
+        return {
+            "mode": self.mode,
+            "circuit": self.circuit_breaker.stats(),
+            "pending_writes": len(self.pending_writes),
+            "fallback_cache": self.fallback_cache.stats(),
+            "memory_cache": self.memory_cache.stats(),
+        }
+
+    async def set_redis(self, key, data, bulk=False):
         """
         Armazena dados no Redis com a chave especificada.
 
         Args:
             key (str): A chave sob a qual os dados serão armazenados no Redis.
             data (Any): Os dados a serem armazenados.
+            bulk (bool, optional): Se o valor é grande (snapshot), usando o
+                                   prazo REDIS_BULK_DEADLINE.
 
         Returns:
             bool: Retorna True se os dados foram armazenados com sucesso, 
                 caso contrário, lança uma exceção.
         """
+        async def operation():
+            async with self.redis_service.pipeline(transaction=False) as pipe:
+                pipe.set(key, data)
+                pipe.publish(self.MEMORY_CACHE_CHANNEL, key)
+                response, _ = await pipe.execute()
+            return response
         try:
-            return await self.redis_service.set(key, data)
-        except Exception as error:
-            raise Exception(error)
+            response = await self._run(operation, bulk=bulk)
+        except RedisUnavailableError:
+            self._defer_write(key=key, value=data)
+            response = False
+        self.memory_cache.delete(key)
+        self.fallback_cache.set(key, data)
+        return response
 
-    async def get_redis(self, key):
+    async def get_redis(self, key, bulk=False):
         """
-        Recupera dados do Redis usando a chave especificada.
+        Recupera dados do Redis usando a chave especificada, consultando
+        antes o cache em memória do processo (L1).
 
         Args:
             key (str): A chave para recuperar os dados armazenados.
+            bulk (bool, optional): Se o valor é grande (snapshot), usando o
+                                   prazo REDIS_BULK_DEADLINE.
 
         Returns:
             Any: Retorna os dados armazenados como um dicionário, ou 
                 uma lista vazia se não houver dados.
         """
+        if self.memory_cache.enabled:
+            self._start_invalidation_listener()
+            cached = self.memory_cache.get(key)
+            if cached is not None:
+                return cached
         try:
-            response = await self.redis_service.get(key)
-            if response:
-                return json.loads(response)
-            return []
-        except Exception as error:
-            raise Exception(error)
+            response = await self._run(lambda: self.redis_service.get(key), bulk=bulk)
+        except RedisUnavailableError:
+            response = self.fallback_cache.get(key)
+            return json.loads(response) if response else []
+        if response:
+            REDIS_HITS.inc()
+            data = json.loads(response)
+            self.memory_cache.set(key, data)
+            self.fallback_cache.set(key, response)
+            return data
+        REDIS_MISSES.inc()
+        return []
 
     async def expire_redis(self, key, time=None):
         """
@@ -66,27 +376,33 @@ class RedisCore():
             bool: Retorna True se a expiração foi definida com sucesso, 
                 caso contrário, lança uma exceção.
         """
-        try:
-            if time is None:
-                time = self.REDIS_TIME  
-            return await self.redis_service.expire(key, time, nx=True)
-        except Exception as error:
-            raise Exception(error)
+        if time is None:
+            time = self.REDIS_TIME
+        return await self._run(lambda: self.redis_service.expire(key, time, nx=True))
 
-    async def incr_redis(self, key):
+    async def incr_redis(self, key, amount=1, time=None):
         """
         Incrementa o valor armazenado na chave especificada no Redis.
 
         Args:
             key (str): A chave do valor a ser incrementado.
+            amount (int, optional): O valor do incremento. O padrão é 1.
+            time (int, optional): Se informado, a chave passa a expirar em
+                                `time` segundos, na mesma transação do
+                                incremento.
 
         Returns:
             int: O novo valor após o incremento, caso tenha sucesso.
         """
-        try:
-            return await self.redis_service.incr(key)
-        except Exception as error:
-            raise Exception(error)
+        async def operation():
+            if time is None:
+                return await self.redis_service.incr(key, amount)
+            async with self.redis_service.pipeline(transaction=True) as pipe:
+                pipe.incrby(key, amount)
+                pipe.expire(key, time)
+                response, _ = await pipe.execute()
+            return response
+        return await self._run(operation)
 
     async def decr_redis(self, key):
         """
@@ -98,10 +414,7 @@ class RedisCore():
         Returns:
             int: O novo valor após o decremento, caso tenha sucesso.
         """
-        try:
-            return await self.redis_service.decr(key)
-        except Exception as error:
-            raise Exception(error)
+        return await self._run(lambda: self.redis_service.decr(key))
 
     async def setnx_redis(self, key, data):
         """
@@ -116,7 +429,530 @@ class RedisCore():
             bool: Retorna True se os dados foram armazenados com sucesso, 
                 caso contrário, lança uma exceção.
         """
+        async def operation():
+            async with self.redis_service.pipeline(transaction=False) as pipe:
+                pipe.setnx(key, data)
+                pipe.publish(self.MEMORY_CACHE_CHANNEL, key)
+                response, _ = await pipe.execute()
+            return response
+        response = await self._run(operation)
+        self.memory_cache.delete(key)
+        return response
+
+    async def exists_redis(self, key):
+        """
+        Verifica se a chave especificada existe no Redis.
+
+        Args:
+            key (str): A chave a ser verificada.
+
+        Returns:
+            bool: True se a chave existir, caso contrário False.
+        """
+        return bool(await self._run(lambda: self.redis_service.exists(key)))
+
+    async def acquire_lease_redis(self, key, token, time):
+        """
+        Adquire uma concessão (lease) exclusiva e de curta duração no Redis.
+
+        Args:
+            key (str): A chave da concessão.
+            token (str): Identificador único do detentor da concessão.
+            time (float): Duração máxima da concessão, em segundos.
+
+        Returns:
+            bool: True se a concessão foi adquirida, False se outro processo
+                já a detém.
+        """
+        return bool(await self._run(lambda: self.redis_service.set(key, token, nx=True, px=int(time * 1000))))
+
+    async def release_lease_redis(self, key, token):
+        """
+        Libera uma concessão apenas se ela ainda pertencer ao token informado.
+
+        Args:
+            key (str): A chave da concessão.
+            token (str): Identificador do detentor da concessão.
+
+        Returns:
+            bool: True se a concessão foi liberada, False se ela já havia
+                expirado ou pertence a outro detentor.
+        """
+        return bool(await self._run(lambda: self.release_lease_script(keys=[key], args=[token])))
+
+    async def mget_redis(self, keys):
+        """
+        Recupera vários valores em uma única chamada MGET, consultando antes
+        o cache em memória do processo (L1).
+
+        Args:
+            keys (list[str]): As chaves a serem recuperadas.
+
+        Returns:
+            list: Uma lista, na mesma ordem das chaves, com os dados de cada
+                chave como dicionário, ou None para as chaves sem dados.
+        """
+        responses = {}
+        if self.memory_cache.enabled:
+            self._start_invalidation_listener()
+            for key in keys:
+                cached = self.memory_cache.get(key)
+                if cached is not None:
+                    responses[key] = cached
+        missing = [key for key in keys if key not in responses]
+        if missing:
+            try:
+                values = await self._run(lambda: self.redis_service.mget(missing))
+            except RedisUnavailableError:
+                for key in missing:
+                    response = self.fallback_cache.get(key)
+                    if response:
+                        responses[key] = json.loads(response)
+                return [responses.get(key) for key in keys]
+            for key, response in zip(missing, values):
+                if response:
+                    REDIS_HITS.inc()
+                    responses[key] = json.loads(response)
+                    self.memory_cache.set(key, responses[key])
+                    self.fallback_cache.set(key, response)
+                else:
+                    REDIS_MISSES.inc()
+        return [responses.get(key) for key in keys]
+
+    async def mset_redis(self, data, time=None):
+        """
+        Armazena vários valores, cada um com expiração, em um único pipeline.
+
+        Args:
+            data (dict): Dicionário que mapeia cada chave ao valor serializado.
+            time (int, optional): O tempo de expiração em segundos. Se None,
+                                usa o tempo padrão definido em REDIS_TIME.
+
+        Returns:
+            list: Um booleano por chave, na ordem do dicionário, indicando se
+                o valor foi armazenado.
+        """
+        if time is None:
+            time = self.REDIS_TIME
+        if not data:
+            return []
+
+        async def operation():
+            async with self.redis_service.pipeline(transaction=False) as pipe:
+                for key, value in data.items():
+                    pipe.set(key, value, ex=time)
+                    pipe.publish(self.MEMORY_CACHE_CHANNEL, key)
+                return await pipe.execute()
         try:
-            return await self.redis_service.setnx(key, data)
-        except Exception as error:
-            raise Exception(error)
+            response = [bool(result) for result in (await self._run(operation, bulk=True))[::2]]
+        except RedisUnavailableError:
+            for key, value in data.items():
+                self._defer_write(key=key, value=value, time=time)
+            response = [False] * len(data)
+        for key, value in data.items():
+            self.memory_cache.delete(key)
+            self.fallback_cache.set(key, value, ttl=time)
+        return response
+
+    async def pipeline_redis(self, commands, transaction=True):
+        """
+        Executa vários comandos em um único round-trip, atomicamente
+        (MULTI/EXEC) quando `transaction` é True.
+
+        As chaves alteradas não são invalidadas no cache em memória; use
+        os métodos específicos para dados servidos pelo L1.
+
+        Args:
+            commands (list[tuple]): Um comando por tupla, como
+                                    ("INCRBY", "chave", 2).
+            transaction (bool, optional): Se os comandos rodam em MULTI/EXEC.
+
+        Returns:
+            list: O resultado de cada comando, na ordem de `commands`.
+        """
+        if not commands:
+            return []
+
+        async def operation():
+            async with self.redis_service.pipeline(transaction=transaction) as pipe:
+                for command in commands:
+                    pipe.execute_command(*command)
+                return await pipe.execute()
+        return await self._run(operation)
+
+    async def ping_redis(self):
+        """
+        Verifica se o Redis está respondendo.
+
+        Returns:
+            bool: True se o PING foi respondido.
+        """
+        return bool(await self._run(self.redis_service.ping))
+
+    def _build_entry(self, data, time=None, stale_time=None):
+        """
+        Monta o envelope de cache com TTL suave e TTL rígido.
+
+        Args:
+            data (dict): Os dados a serem armazenados.
+            time (int, optional): TTL suave em segundos; após ele o valor é
+                                servido como obsoleto. Padrão: REDIS_TIME.
+            stale_time (int, optional): Segundos, após o TTL suave, em que o
+                                valor obsoleto ainda pode ser servido.
+                                Padrão: REDIS_STALE_TIME.
+
+        Returns:
+            tuple: O envelope serializado, o instante da busca e o TTL rígido.
+        """
+        if time is None:
+            time = self.REDIS_TIME
+        if stale_time is None:
+            stale_time = self.REDIS_STALE_TIME
+        fetched_at = datetime.now().timestamp()
+        entry = json.dumps({"data": data, "fetched_at": fetched_at, "soft_expires_at": fetched_at + time})
+        return entry, fetched_at, int(time + stale_time)
+
+    def quote_key(self, symbol):
+        """
+        Monta a chave de cache da cotação de um símbolo. O prefixo
+        REDIS_QUOTE_PREFIX separa as cotações das demais chaves (catálogos,
+        concessões, rate limit), que nunca podem ser lidas como cotação.
+
+        Args:
+            symbol (str): O símbolo da criptomoeda.
+
+        Returns:
+            str: A chave da cotação.
+        """
+        return f"{self.REDIS_QUOTE_PREFIX}{symbol}"
+
+    def _parse_entry(self, entry, with_ttl=False):
+        """
+        Interpreta um envelope de cache.
+
+        Valores sem envelope (formato antigo ou chaves de outro tipo) são
+        tratados como inexistentes, para que nunca sejam servidos como cotação.
+
+        Args:
+            entry (dict): O envelope decodificado.
+            with_ttl (bool, optional): Se True, inclui os segundos restantes
+                                       até o TTL suave.
+
+        Returns:
+            tuple: Os dados, um booleano indicando se estão obsoletos e, com
+                `with_ttl`, os segundos restantes até o TTL suave (negativos
+                se já passou), ou None se não houver valor.
+        """
+        if not isinstance(entry, dict) or "soft_expires_at" not in entry:
+            return None
+        ttl = entry["soft_expires_at"] - datetime.now().timestamp()
+        return (entry["data"], ttl <= 0, ttl) if with_ttl else (entry["data"], ttl <= 0)
+
+    async def get_entry_redis(self, key, with_ttl=False):
+        """
+        Recupera um envelope de cache com TTL suave e rígido.
+
+        Args:
+            key (str): A chave do envelope.
+            with_ttl (bool, optional): Se True, inclui os segundos restantes
+                                       até o TTL suave.
+
+        Returns:
+            tuple: Os dados, um booleano indicando se passaram do TTL suave e,
+                com `with_ttl`, os segundos restantes até ele, ou None se a
+                chave não existir (TTL rígido expirado).
+        """
+        return self._parse_entry(await self.get_redis(key), with_ttl=with_ttl)
+
+    async def mget_entries_redis(self, keys, with_ttl=False):
+        """
+        Recupera vários envelopes de cache em uma única chamada MGET.
+
+        Args:
+            keys (list[str]): As chaves a serem recuperadas.
+            with_ttl (bool, optional): Se True, inclui os segundos restantes
+                                       até o TTL suave.
+
+        Returns:
+            list: Uma lista, na mesma ordem das chaves, com o resultado de
+                `get_entry_redis` de cada chave.
+        """
+        return [self._parse_entry(entry, with_ttl=with_ttl) for entry in await self.mget_redis(keys)]
+
+    async def set_entry_redis(self, key, data, time=None, stale_time=None):
+        """
+        Grava atomicamente um envelope de cache, já com expiração, em uma única
+        chamada de script. Um envelope mais antigo que o já armazenado não o
+        sobrescreve.
+
+        Args:
+            key (str): A chave do envelope.
+            data (dict): Os dados a serem armazenados.
+            time (int, optional): TTL suave em segundos. Padrão: REDIS_TIME.
+            stale_time (int, optional): Janela de obsolescência em segundos.
+                                        Padrão: REDIS_STALE_TIME.
+
+        Returns:
+            bool: True se o envelope foi gravado.
+        """
+        response = await self.set_entries_redis(data={key: data}, time=time, stale_time=stale_time)
+        return response[0]
+
+    async def set_entries_redis(self, data, time=None, stale_time=None):
+        """
+        Grava vários envelopes de cache em um único pipeline, cada um de forma
+        atômica através do script SET_ENTRY_SCRIPT.
+
+        Args:
+            data (dict): Dicionário que mapeia cada chave aos dados a serem armazenados.
+            time (int, optional): TTL suave em segundos. Padrão: REDIS_TIME.
+            stale_time (int, optional): Janela de obsolescência em segundos.
+                                        Padrão: REDIS_STALE_TIME.
+
+        Returns:
+            list: Um booleano por chave, na ordem do dicionário, indicando se
+                o envelope foi gravado.
+        """
+        if not data:
+            return []
+        entries = {}
+        for key, value in data.items():
+            entries[key] = self._build_entry(data=value, time=time, stale_time=stale_time)
+
+        async def operation():
+            async with self.redis_service.pipeline(transaction=False) as pipe:
+                for key, (entry, fetched_at, hard_time) in entries.items():
+                    await self.set_entry_script(keys=[key], args=[entry, fetched_at, hard_time], client=pipe)
+                    pipe.publish(self.MEMORY_CACHE_CHANNEL, key)
+                return await pipe.execute()
+        try:
+            response = [bool(result) for result in (await self._run(operation, bulk=True))[::2]]
+        except RedisUnavailableError:
+            for key, (entry, fetched_at, hard_time) in entries.items():
+                self._defer_write(key=key, value=entry, time=hard_time, fetched_at=fetched_at)
+            response = [False] * len(entries)
+        for key, (entry, fetched_at, hard_time) in entries.items():
+            self.memory_cache.delete(key)
+            self.fallback_cache.set(key, entry, ttl=hard_time)
+        return response
+
+    async def zincrby_many_redis(self, key, data, time=None):
+        """
+        Incrementa vários membros de um sorted set em um único pipeline e
+        define a expiração da chave.
+
+        Args:
+            key (str): A chave do sorted set.
+            data (dict): Dicionário que mapeia cada membro ao incremento.
+            time (int, optional): O tempo de expiração em segundos. Se None, 
+                                usa o tempo padrão definido em REDIS_TIME.
+
+        Returns:
+            list: O novo score de cada membro, na ordem do dicionário.
+        """
+        if time is None:
+            time = self.REDIS_TIME
+        if not data:
+            return []
+
+        async def operation():
+            async with self.redis_service.pipeline(transaction=False) as pipe:
+                for member, amount in data.items():
+                    pipe.zincrby(key, amount, member)
+                pipe.expire(key, time)
+                return await pipe.execute()
+        return (await self._run(operation))[:-1]
+
+    async def ztop_union_redis(self, keys, weights, dest, count, time=None):
+        """
+        Combina sorted sets com pesos (ZUNIONSTORE) e retorna os membros de
+        maior score, em um único pipeline.
+
+        Args:
+            keys (list[str]): As chaves dos sorted sets a combinar.
+            weights (list[float]): O peso de cada chave.
+            dest (str): A chave onde o resultado é armazenado.
+            count (int): Quantidade de membros a retornar.
+            time (int, optional): O tempo de expiração de `dest` em segundos.
+                                Se None, usa REDIS_TIME.
+
+        Returns:
+            list: Tuplas (membro, score), do maior para o menor score.
+        """
+        if time is None:
+            time = self.REDIS_TIME
+
+        async def operation():
+            async with self.redis_service.pipeline(transaction=False) as pipe:
+                pipe.zunionstore(dest, dict(zip(keys, weights)))
+                pipe.expire(dest, time)
+                pipe.zrevrange(dest, 0, count - 1, withscores=True)
+                return await pipe.execute()
+        return (await self._run(operation))[-1]
+
+    async def mget_soft_expirations_redis(self, keys):
+        """
+        Retorna o instante de expiração suave dos envelopes de cache.
+
+        Args:
+            keys (list[str]): As chaves dos envelopes.
+
+        Returns:
+            list: Um timestamp por chave, na mesma ordem, ou None para chaves
+                inexistentes ou que não sejam envelopes.
+        """
+        return [
+            (entry.get("soft_expires_at") if isinstance(entry, dict) else None)
+            for entry in await self.mget_redis(keys)
+        ]
+
+    def register_script_redis(self, script):
+        """
+        Registra um script Lua, executado depois via EVALSHA (com recarga
+        automática caso o servidor não o conheça).
+
+        Args:
+            script (str): O código Lua.
+
+        Returns:
+            AsyncScript: O script registrado, para uso em `eval_many_redis`.
+        """
+        return self.redis_service.register_script(script)
+
+    async def eval_script_redis(self, script, keys, args, bulk=False):
+        """
+        Executa um script registrado uma única vez.
+
+        Args:
+            script (AsyncScript): O script retornado por `register_script_redis`.
+            keys (list[str]): As chaves (KEYS) do script.
+            args (list): Os argumentos (ARGV) do script.
+            bulk (bool, optional): Se o script lê ou grava muitos membros,
+                                   usando o prazo REDIS_BULK_DEADLINE.
+
+        Returns:
+            Any: O retorno do script.
+        """
+        return await self._run(lambda: script(keys=keys, args=args), bulk=bulk)
+
+    async def eval_many_redis(self, script, calls):
+        """
+        Executa um script registrado várias vezes em um único pipeline.
+
+        Args:
+            script (AsyncScript): O script retornado por `register_script_redis`.
+            calls (list[tuple]): Uma tupla (keys, args) por execução.
+
+        Returns:
+            list: O resultado de cada execução, na ordem de `calls`.
+        """
+        if not calls:
+            return []
+
+        async def operation():
+            async with self.redis_service.pipeline(transaction=False) as pipe:
+                for keys, args in calls:
+                    await script(keys=keys, args=args, client=pipe)
+                return await pipe.execute()
+        return await self._run(operation, bulk=True)
+
+    async def zrangebyscore_redis(self, key, min, max):
+        """
+        Recupera os membros de um sorted set com score entre `min` e `max`.
+
+        Args:
+            key (str): A chave do sorted set.
+            min (float | str): O score mínimo (inclusive), ou "-inf".
+            max (float | str): O score máximo (inclusive), ou "+inf".
+
+        Returns:
+            list[str]: Os membros, em ordem crescente de score.
+        """
+        return await self._run(lambda: self.redis_service.zrangebyscore(key, min, max), bulk=True)
+
+    async def start(self):
+        """
+        Abre a primeira conexão do pool e, com o cache em memória ativo, inicia
+        a escuta de invalidações, para que a primeira requisição não pague
+        esse custo.
+
+        Raises:
+            RedisUnavailableError: Se o Redis não responder.
+        """
+        await self.ping_redis()
+        if self.memory_cache.enabled:
+            self._start_invalidation_listener()
+
+    async def close(self):
+        """
+        Interrompe as tasks em segundo plano e fecha os pools de conexões.
+        """
+        for task in (self._invalidation_task, self._replay_task):
+            if task is not None and not task.done():
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+        self._invalidation_task = None
+        self._replay_task = None
+        await self.redis_service.aclose(close_connection_pool=True)
+        await self.redis_pubsub_service.aclose(close_connection_pool=True)
+
+    def _start_invalidation_listener(self):
+        """
+        Inicia, se ainda não estiver rodando, a task que escuta as
+        invalidações publicadas por outros workers.
+        """
+        if self._invalidation_task is None or self._invalidation_task.done():
+            self._invalidation_task = asyncio.create_task(self._listen_invalidations())
+
+    async def _listen_invalidations(self):
+        """
+        Escuta o canal MEMORY_CACHE_CHANNEL (e, com REDIS_CLIENT_TRACKING, as
+        invalidações enviadas pelo servidor) e remove do cache em memória as
+        chaves alteradas. Se a conexão cair, o cache em memória é limpo, pois
+        invalidações podem ter sido perdidas, e a inscrição é refeita.
+        """
+        while True:
+            pubsub = self.redis_pubsub_service.pubsub()
+            tracking = None
+            try:
+                channels = [self.MEMORY_CACHE_CHANNEL]
+                if self.REDIS_CLIENT_TRACKING:
+                    await pubsub.connect()
+                    await pubsub.connection.send_command("CLIENT", "ID")
+                    client_id = await pubsub.connection.read_response()
+                    channels.append(self.TRACKING_CHANNEL)
+                await pubsub.subscribe(*channels)
+                if self.REDIS_CLIENT_TRACKING:
+                    # O CLIENT TRACKING vale enquanto a conexão que o ativou
+                    # existir, por isso ela fica reservada junto da inscrição.
+                    tracking = redis.StrictRedis(connection_pool=self.redis_pubsub_service.connection_pool, single_connection_client=True)
+                    prefixes = [argument for prefix in self.REDIS_TRACKING_PREFIXES for argument in ("PREFIX", prefix)]
+                    await tracking.execute_command("CLIENT", "TRACKING", "ON", "REDIRECT", client_id, "BCAST", *prefixes)
+                self.memory_cache.clear()
+                while True:
+                    message = await pubsub.get_message(timeout=self.REDIS_HEALTH_CHECK_INTERVAL or 30)
+                    if not message or message.get("type") != "message":
+                        continue
+                    if message["channel"] == self.MEMORY_CACHE_CHANNEL:
+                        self.memory_cache.delete(message["data"])
+                    elif message["data"] is None:
+                        # FLUSHDB/FLUSHALL: o servidor invalida tudo.
+                        self.memory_cache.clear()
+                    else:
+                        for key in message["data"]:
+                            self.memory_cache.delete(key)
+            except asyncio.CancelledError:
+                raise
+            except Exception as error:
+                logger(mensagem=f"RedisCore._listen_invalidations -> {error}", nivel=logging.WARNING)
+                self.memory_cache.clear()
+                await asyncio.sleep(1)
+            finally:
+                if tracking is not None:
+                    if tracking.connection is not None:
+                        await tracking.connection.disconnect()
+                    await tracking.aclose()
+                await pubsub.aclose()
@@ -0,0 +1,352 @@
+import os
+import re
+import string
+import unicodedata
+from bisect import bisect_left, insort
+from collections import Counter, OrderedDict
+from typing import Optional
+
+import numpy as np
+
+from src.system.core.metrics_core import CACHE_REQUESTS
+
+SEARCH_HITS = CACHE_REQUESTS.labels("search", "hit")
+SEARCH_MISSES = CACHE_REQUESTS.labels("search", "miss")
+
+_WORD_SPLIT = re.compile(r"[^0-9a-z]+")
+
+
+def normalize(text: str) -> str:
+    """
+    Normaliza um texto para busca: minúsculas, sem acentos e só com letras,
+    dígitos e espaços.
+
+    Args:
+        text (str): O texto.
+
+    Returns:
+        str: O texto normalizado.
+    """
+    text = unicodedata.normalize("NFKD", text or "").encode("ascii", "ignore").decode("ascii").lower()
+    return " ".join(word for word in _WORD_SPLIT.split(text) if word)
+
+
+def trigrams(text: str) -> set:
+    return {text[index:index + 3] for index in range(len(text) - 2)}
+
+
+class _PrefixIndex():
+    # Acima desta quantidade de termos novos ou removidos em uma atualização,
+    # a lista ordenada é reconstruída de uma vez em vez de termo a termo.
+    REBUILD_THRESHOLD = 64
+
+    def __init__(self) -> None:
+        """
+        Lista ordenada de termos com o conjunto de entradas de cada termo.
+        Os termos com um prefixo ocupam uma faixa contínua da lista,
+        encontrada por busca binária.
+        """
+        self.terms: list[str] = []
+        self.postings: dict[str, set] = {}
+        self._added: set = set()
+        self._removed: set = set()
+
+    def add(self, term: str, entry_id: int) -> None:
+        postings = self.postings.get(term)
+        if postings is None:
+            postings = self.postings[term] = set()
+            if term in self._removed:
+                self._removed.discard(term)
+            else:
+                self._added.add(term)
+        postings.add(entry_id)
+
+    def discard(self, term: str, entry_id: int) -> None:
+        postings = self.postings[term]
+        postings.discard(entry_id)
+        if not postings:
+            del self.postings[term]
+            if term in self._added:
+                self._added.discard(term)
+            else:
+                self._removed.add(term)
+
+    def commit(self) -> None:
+        """
+        Aplica à lista ordenada os termos criados e removidos desde a última
+        chamada.
+        """
+        if len(self._added) + len(self._removed) > self.REBUILD_THRESHOLD:
+            self.terms = sorted(self.postings)
+        else:
+            for term in self._removed:
+                index = bisect_left(self.terms, term)
+                if index < len(self.terms) and self.terms[index] == term:
+                    del self.terms[index]
+            for term in self._added:
+                insort(self.terms, term)
+        self._added.clear()
+        self._removed.clear()
+
+    def get(self, term: str) -> set:
+        return self.postings.get(term, set())
+
+    def match(self, prefix: str) -> set:
+        """
+        Retorna as entradas de todos os termos que começam com o prefixo.
+
+        Args:
+            prefix (str): O prefixo, já normalizado.
+
+        Returns:
+            set: Os slots das entradas.
+        """
+        start = bisect_left(self.terms, prefix)
+        end = bisect_left(self.terms, prefix + "{", lo=start)
+        return set().union(*map(self.postings.__getitem__, self.terms[start:end]))
+
+
+class SearchIndexCore():
+    # Consultas de um caractere casam com boa parte do índice; seu ranking é
+    # recalculado a cada atualização, e não na primeira consulta.
+    PRECOMPUTED_QUERIES = string.ascii_lowercase + string.digits
+
+    def __init__(self) -> None:
+        """
+        Inicializa o índice de busca de símbolos em memória.
+
+        Cada entrada (símbolo, nome e ranking, vinda de uma fonte) é indexada
+        por prefixo — listas ordenadas de termos (símbolo, palavras do nome e
+        nome sem espaços) consultadas por busca binária — e por trigramas,
+        usados para tolerar erros de digitação e trechos do meio do nome
+        quando os prefixos encontram menos de SEARCH_FUZZY_MIN_MATCHES
+        entradas (consultas com 3 ou mais caracteres; a entrada precisa ter
+        ao menos a fração SEARCH_FUZZY_THRESHOLD dos trigramas da consulta).
+        Os índices guardam cada entrada por um número inteiro (slot), e as
+        consultas são resolvidas com operações de conjunto sobre esses números
+        e com numpy: a posição de cada slot no ranking e o símbolo de cada
+        posição ficam em arrays, então ordenar e agrupar por símbolo não tem
+        laços por entrada em Python.
+
+        O ranking coloca primeiro o símbolo exato, depois os prefixos de
+        símbolo ou nome e por fim os trigramas (pela quantidade em comum);
+        dentro de cada camada vale o ranking de mercado e o tamanho do
+        símbolo. Os resultados são agrupados por símbolo. Cada fonte é
+        atualizada por diferença, tocando apenas as entradas que mudaram;
+        só a tabela de posições é recalculada inteira.
+
+        Consultas repetidas são respondidas de um cache LRU de
+        SEARCH_CACHE_SIZE entradas, limpo a cada atualização, e cada consulta
+        guarda até SEARCH_MAX_RESULTS resultados ranqueados.
+        """
+        self.SEARCH_CACHE_SIZE = int(os.environ.get("SEARCH_CACHE_SIZE", 1024))
+        self.SEARCH_MAX_RESULTS = int(os.environ.get("SEARCH_MAX_RESULTS", 1000))
+        self.SEARCH_FUZZY_THRESHOLD = float(os.environ.get("SEARCH_FUZZY_THRESHOLD", 0.6))
+        self.SEARCH_FUZZY_MIN_MATCHES = int(os.environ.get("SEARCH_FUZZY_MIN_MATCHES", 10))
+        self.sources: dict[str, dict] = {}
+        self.entries: dict[tuple, tuple] = {}
+        self.version = 0
+        self._terms = _PrefixIndex()
+        self._symbol_terms = _PrefixIndex()
+        self._trigrams: dict[str, set] = {}
+        self._order: dict[tuple, tuple] = {}
+        self._slot: dict[tuple, int] = {}
+        self._entry_at: list[Optional[tuple]] = []
+        self._free_slots: list[int] = []
+        self._position_at = np.empty(0, dtype=np.int64)
+        self._by_position: list[tuple] = []
+        self._symbol_at = np.empty(0, dtype=np.int64)
+        self._display: dict[tuple, str] = {}
+        self._symbols: dict[str, set] = {}
+        self._cache: OrderedDict[str, tuple] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def diff_source(self, source: str, entries: dict) -> tuple:
+        """
+        Compara as entradas de uma fonte com as já indexadas.
+
+        Args:
+            source (str): O nome da fonte, por exemplo "CoinGecko".
+            entries (dict): Mapeamento id -> (símbolo, nome, ranking).
+
+        Returns:
+            tuple: Os ids adicionados, removidos e alterados.
+        """
+        current = self.sources.get(source, {})
+        added = entries.keys() - current.keys()
+        removed = current.keys() - entries.keys()
+        changed = {key for key in entries.keys() & current.keys() if entries[key] != current[key]}
+        return added, removed, changed
+
+    def update_source(self, source: str, entries: dict) -> tuple:
+        """
+        Substitui as entradas de uma fonte, reindexando apenas a diferença
+        para a versão anterior.
+
+        Args:
+            source (str): O nome da fonte, por exemplo "CoinGecko".
+            entries (dict): Mapeamento id -> (símbolo, nome, ranking), com o
+                            id único dentro da fonte.
+
+        Returns:
+            tuple: Quantidade de entradas adicionadas, removidas e alteradas.
+        """
+        added, removed, changed = self.diff_source(source=source, entries=entries)
+        if not (added or removed or changed):
+            return 0, 0, 0
+        for key in removed | changed:
+            self._remove((source, key))
+        for key in added | changed:
+            symbol, name, rank = entries[key]
+            self._add(entry_id=(source, key), symbol=symbol, name=name, rank=rank)
+        self._terms.commit()
+        self._symbol_terms.commit()
+        self._by_position = sorted(self._order, key=self._order.__getitem__)
+        self._position_at = np.zeros(len(self._entry_at), dtype=np.int64)
+        self._position_at[np.fromiter(map(self._slot.__getitem__, self._by_position), dtype=np.int64, count=len(self._by_position))] = np.arange(len(self._by_position))
+        codes = {}
+        self._symbol_at = np.fromiter(
+            (codes.setdefault(self._display[entry_id], len(codes)) for entry_id in self._by_position),
+            dtype=np.int64, count=len(self._by_position),
+        )
+        self.sources[source] = dict(entries)
+        self.version += 1
+        self._cache.clear()
+        if self.SEARCH_CACHE_SIZE >= len(self.PRECOMPUTED_QUERIES):
+            for query in self.PRECOMPUTED_QUERIES:
+                self._cache[query] = self._rank(query)
+        return len(added), len(removed), len(changed)
+
+    def _add(self, entry_id: tuple, symbol: str, name: str, rank: Optional[int]) -> None:
+        symbol = (symbol or "").lower()
+        symbol_normalized = normalize(symbol).replace(" ", "")
+        name_normalized = normalize(name)
+        terms = {symbol_normalized, name_normalized.replace(" ", ""), *name_normalized.split()} - {""}
+        if self._free_slots:
+            slot = self._free_slots.pop()
+            self._entry_at[slot] = entry_id
+        else:
+            slot = len(self._entry_at)
+            self._entry_at.append(entry_id)
+        self._slot[entry_id] = slot
+        for term in terms:
+            self._terms.add(term, slot)
+        if symbol_normalized:
+            self._symbol_terms.add(symbol_normalized, slot)
+        grams = trigrams(symbol_normalized) | trigrams(name_normalized.replace(" ", ""))
+        for gram in grams:
+            self._trigrams.setdefault(gram, set()).add(slot)
+        self.entries[entry_id] = (symbol_normalized, symbol, name, rank, terms, grams)
+        self._order[entry_id] = (rank is None, rank or 0, len(symbol), symbol, entry_id)
+        self._display[entry_id] = symbol
+        self._symbols.setdefault(symbol, set()).add(entry_id)
+
+    def _remove(self, entry_id: tuple) -> None:
+        symbol_normalized, symbol, _, _, terms, grams = self.entries.pop(entry_id)
+        slot = self._slot.pop(entry_id)
+        self._entry_at[slot] = None
+        self._free_slots.append(slot)
+        for term in terms:
+            self._terms.discard(term, slot)
+        if symbol_normalized:
+            self._symbol_terms.discard(symbol_normalized, slot)
+        for gram in grams:
+            postings = self._trigrams[gram]
+            postings.discard(slot)
+            if not postings:
+                del self._trigrams[gram]
+        del self._order[entry_id]
+        del self._display[entry_id]
+        ids = self._symbols[symbol]
+        ids.discard(entry_id)
+        if not ids:
+            del self._symbols[symbol]
+
+    def search(self, query: str, limit: int = 10, offset: int = 0) -> dict:
+        """
+        Busca símbolos e nomes que casem com a consulta.
+
+        Args:
+            query (str): O texto digitado.
+            limit (int, optional): Tamanho da página.
+            offset (int, optional): Quantos resultados pular.
+
+        Returns:
+            dict: O total de símbolos encontrados e os itens da página, cada
+                um com símbolo, nome, ranking e as fontes que têm o símbolo.
+        """
+        query = normalize(query).replace(" ", "")
+        if not query:
+            return {"total": 0, "items": []}
+        cached = self._cache.get(query)
+        if cached is None:
+            SEARCH_MISSES.inc()
+            cached = self._rank(query)
+            self._cache[query] = cached
+            while len(self._cache) > self.SEARCH_CACHE_SIZE:
+                self._cache.popitem(last=False)
+        else:
+            SEARCH_HITS.inc()
+            self._cache.move_to_end(query)
+        total, ranked = cached
+        return {"total": total, "items": [self._item(entry_id) for entry_id in ranked[offset:offset + limit]]}
+
+    def _rank(self, query: str) -> tuple:
+        """
+        Calcula o ranking completo de uma consulta.
+
+        Returns:
+            tuple: O total de símbolos encontrados e os ids das melhores
+                entradas (uma por símbolo), até SEARCH_MAX_RESULTS.
+        """
+        exact = self._positions(self._symbol_terms.get(query))
+        matched = self._terms.match(query)
+        # O símbolo exato também é um termo, então `exact` está contido em
+        # `matched`; setdiff1d já devolve o restante ordenado.
+        layers = [np.sort(exact), np.setdiff1d(self._positions(matched), exact)]
+        query_grams = trigrams(query)
+        if query_grams and len(matched) < self.SEARCH_FUZZY_MIN_MATCHES:
+            shared = Counter()
+            for gram in query_grams:
+                shared.update(self._trigrams.get(gram, ()))
+            minimum = self.SEARCH_FUZZY_THRESHOLD * len(query_grams)
+            fuzzy = [slot for slot, count in shared.items() if count >= minimum and slot not in matched]
+            positions = self._positions(fuzzy)
+            # Mais trigramas em comum primeiro e, no empate, a ordem do ranking.
+            counts = np.fromiter(map(shared.__getitem__, fuzzy), dtype=np.int64, count=len(fuzzy))
+            layers.append(positions[np.lexsort((positions, -counts))])
+        ordered = np.concatenate(layers)
+        # Uma entrada por símbolo: a primeira (mais bem ranqueada) de cada um.
+        _, first = np.unique(self._symbol_at[ordered], return_index=True)
+        first.sort()
+        ranked = [self._by_position[index] for index in ordered[first[:self.SEARCH_MAX_RESULTS]].tolist()]
+        return len(first), ranked
+
+    def _positions(self, slots) -> np.ndarray:
+        return self._position_at[np.fromiter(slots, dtype=np.int64, count=len(slots))]
+
+    def _item(self, entry_id: tuple) -> dict:
+        _, symbol, name, rank, _, _ = self.entries[entry_id]
+        return {
+            "symbol": symbol,
+            "name": name,
+            "rank": rank,
+            "sources": sorted({source for source, _ in self._symbols[symbol]}),
+        }
+
+    def stats(self) -> dict:
+        """
+        Retorna o tamanho do índice.
+
+        Returns:
+            dict: Entradas por fonte, símbolos, termos e trigramas distintos.
+        """
+        return {
+            "sources": {source: len(entries) for source, entries in self.sources.items()},
+            "symbols": len(self._symbols),
+            "terms": len(self._terms.terms),
+            "trigrams": len(self._trigrams),
+            "version": self.version,
+        }
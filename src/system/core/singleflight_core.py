@@ -0,0 +1,110 @@
+import os
+import uuid
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable
+
+from src.system.core.logger_core import logger
+from src.system.core.redis_core import RedisCore, RedisCoreError, RedisUnavailableError
+
+
+class SingleFlightCore():
+    def __init__(self, redis_core: RedisCore) -> None:
+        """
+        Inicializa o coalescedor de requisições concorrentes.
+
+        Requisições simultâneas para a mesma chave compartilham uma única busca:
+        dentro do processo através de uma task compartilhada e, entre workers e
+        réplicas, através de uma concessão (lease) curta no Redis.
+
+        Args:
+            redis_core (RedisCore): Instância usada para as concessões distribuídas.
+        """
+        self.SINGLEFLIGHT_LEASE_TIME = float(os.environ.get("SINGLEFLIGHT_LEASE_TIME", 10))
+        self.SINGLEFLIGHT_WAIT_TIME = float(os.environ.get("SINGLEFLIGHT_WAIT_TIME", 5))
+        self.SINGLEFLIGHT_POLL_INTERVAL = float(os.environ.get("SINGLEFLIGHT_POLL_INTERVAL", 0.05))
+        self.redis_core = redis_core
+        self._inflight: dict[str, asyncio.Task] = {}
+
+    async def do(
+        self,
+        key: str,
+        fetch: Callable[[], Awaitable[Any]],
+        read_cached: Callable[[], Awaitable[Any]],
+    ) -> Any:
+        """
+        Executa `fetch` uma única vez para todas as chamadas concorrentes da chave.
+
+        Args:
+            key (str): Chave que identifica a busca (por exemplo, o símbolo).
+            fetch (Callable): Função assíncrona que busca no upstream e grava o cache.
+            read_cached (Callable): Função assíncrona que lê o valor do cache,
+                                    usada enquanto outro worker detém a concessão.
+
+        Returns:
+            Any: O resultado de `fetch`, ou o valor gravado no cache pelo
+                detentor da concessão.
+        """
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._do_distributed(key=key, fetch=fetch, read_cached=read_cached))
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        return await asyncio.shield(task)
+
+    async def _do_distributed(
+        self,
+        key: str,
+        fetch: Callable[[], Awaitable[Any]],
+        read_cached: Callable[[], Awaitable[Any]],
+    ) -> Any:
+        """
+        Coordena a busca entre workers através de uma concessão no Redis.
+
+        Quem adquire a concessão executa `fetch`; os demais aguardam o valor
+        aparecer no cache até SINGLEFLIGHT_WAIT_TIME e, se ele não aparecer ou a
+        concessão for liberada sem valor, executam `fetch` por conta própria.
+
+        Args:
+            key (str): Chave que identifica a busca.
+            fetch (Callable): Função assíncrona que busca no upstream e grava o cache.
+            read_cached (Callable): Função assíncrona que lê o valor do cache.
+
+        Returns:
+            Any: O resultado da busca ou do cache.
+        """
+        lease_key = f"lease:{key}"
+        token = uuid.uuid4().hex
+        try:
+            acquired = await self.redis_core.acquire_lease_redis(key=lease_key, token=token, time=self.SINGLEFLIGHT_LEASE_TIME)
+        except RedisUnavailableError:
+            return await fetch()
+        except Exception as error:
+            logger(mensagem=f"SingleFlightCore -> {error}", nivel=logging.WARNING)
+            return await fetch()
+
+        if acquired:
+            try:
+                return await fetch()
+            finally:
+                try:
+                    await self.redis_core.release_lease_redis(key=lease_key, token=token)
+                except Exception as error:
+                    logger(mensagem=f"SingleFlightCore -> {error}", nivel=logging.WARNING)
+
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.SINGLEFLIGHT_WAIT_TIME
+        while loop.time() < deadline:
+            await asyncio.sleep(self.SINGLEFLIGHT_POLL_INTERVAL)
+            cached = await read_cached()
+            if cached:
+                return cached
+            try:
+                if not await self.redis_core.exists_redis(key=lease_key):
+                    break
+            except RedisCoreError:
+                break
+        cached = await read_cached()
+        if cached:
+            return cached
+        return await fetch()
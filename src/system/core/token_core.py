@@ -0,0 +1,161 @@
+import os
+import hmac
+import json
+import time
+import base64
+import hashlib
+import logging
+import secrets
+from typing import Optional
+
+from src.system.core.logger_core import logger
+
+
+class InvalidTokenError(Exception):
+    def __init__(self, reason: str) -> None:
+        """
+        Erro levantado quando um token não é válido.
+
+        Args:
+            reason (str): O motivo da rejeição.
+        """
+        super().__init__(f"Token inválido: {reason}.")
+        self.reason = reason
+
+
+def _b64encode(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode("ascii")
+
+
+def _b64decode(data: str) -> bytes:
+    return base64.urlsafe_b64decode(data + "=" * (-len(data) % 4))
+
+
+class TokenCore():
+    HEADER = _b64encode(json.dumps({"alg": "HS256", "typ": "JWT"}, separators=(",", ":")).encode())
+
+    def __init__(self) -> None:
+        """
+        Inicializa a emissão e verificação de tokens de acesso assinados
+        (JWT HS256), verificáveis sem consulta ao cadastro de usuários.
+
+        A chave vem de AUTH_SECRET_KEY e precisa ser a mesma em todos os
+        workers; sem ela, uma chave aleatória é gerada e os tokens só valem
+        no processo que os emitiu. AUTH_TOKEN_TTL é a validade, em segundos,
+        e AUTH_TOKEN_LEEWAY a tolerância de relógio na expiração.
+        """
+        secret = os.environ.get("AUTH_SECRET_KEY", "")
+        if not secret:
+            logger("AUTH_SECRET_KEY não definida, usando chave aleatória do processo", logging.WARNING)
+            secret = secrets.token_urlsafe(32)
+        self.AUTH_SECRET_KEY = secret.encode()
+        self.AUTH_TOKEN_TTL = int(os.environ.get("AUTH_TOKEN_TTL", 900))
+        self.AUTH_TOKEN_LEEWAY = float(os.environ.get("AUTH_TOKEN_LEEWAY", 5))
+
+    def _sign(self, signing_input: str) -> str:
+        return _b64encode(hmac.new(self.AUTH_SECRET_KEY, signing_input.encode("ascii"), hashlib.sha256).digest())
+
+    def encode(self, subject: str, claims: Optional[dict] = None, ttl: Optional[int] = None) -> str:
+        """
+        Emite um token assinado.
+
+        Args:
+            subject (str): O dono do token (claim "sub").
+            claims (dict, optional): Claims extras incluídas no token.
+            ttl (int, optional): Validade em segundos. O padrão é AUTH_TOKEN_TTL.
+
+        Returns:
+            str: O token no formato header.payload.assinatura.
+        """
+        now = int(time.time())
+        payload = (claims or {}) | {"sub": subject, "iat": now, "exp": now + (self.AUTH_TOKEN_TTL if ttl is None else ttl)}
+        signing_input = f"{self.HEADER}.{_b64encode(json.dumps(payload, separators=(',', ':')).encode())}"
+        return f"{signing_input}.{self._sign(signing_input)}"
+
+    def decode(self, token: str) -> dict:
+        """
+        Verifica a assinatura e a expiração de um token.
+
+        Args:
+            token (str): O token.
+
+        Raises:
+            InvalidTokenError: Se o token estiver malformado, com assinatura
+                               inválida ou expirado.
+
+        Returns:
+            dict: As claims do token.
+        """
+        # Tokens válidos são sempre ASCII (base64url); outros caracteres
+        # quebrariam a assinatura e o compare_digest.
+        parts = token.split(".") if token and token.isascii() else []
+        if len(parts) != 3:
+            raise InvalidTokenError("malformado")
+        header, payload, signature = parts
+        if header != self.HEADER:
+            raise InvalidTokenError("cabeçalho não suportado")
+        if not hmac.compare_digest(signature, self._sign(f"{header}.{payload}")):
+            raise InvalidTokenError("assinatura")
+        try:
+            claims = json.loads(_b64decode(payload))
+        except ValueError:
+            raise InvalidTokenError("payload")
+        if not isinstance(claims, dict) or not isinstance(claims.get("exp"), (int, float)):
+            raise InvalidTokenError("payload")
+        if claims["exp"] + self.AUTH_TOKEN_LEEWAY < time.time():
+            raise InvalidTokenError("expirado")
+        return claims
+
+
+class PasswordHasherCore():
+    ALGORITHM = "pbkdf2_sha256"
+
+    def __init__(self) -> None:
+        """
+        Inicializa o hash de senhas com PBKDF2-HMAC-SHA256.
+
+        O hash guardado tem o formato "pbkdf2_sha256$iterações$salt$hash",
+        de modo que AUTH_PBKDF2_ITERATIONS pode ser aumentado sem invalidar
+        as senhas já cadastradas. O cálculo é propositalmente lento e deve
+        rodar fora do event loop.
+        """
+        self.AUTH_PBKDF2_ITERATIONS = int(os.environ.get("AUTH_PBKDF2_ITERATIONS", 600000))
+
+    def hash(self, password: str) -> str:
+        """
+        Gera o hash de uma senha com um salt aleatório.
+
+        Args:
+            password (str): A senha.
+
+        Returns:
+            str: O hash codificado.
+        """
+        salt = secrets.token_bytes(16)
+        digest = hashlib.pbkdf2_hmac("sha256", password.encode(), salt, self.AUTH_PBKDF2_ITERATIONS)
+        return f"{self.ALGORITHM}${self.AUTH_PBKDF2_ITERATIONS}${_b64encode(salt)}${_b64encode(digest)}"
+
+    def verify(self, password: str, hashed_password: str) -> bool:
+        """
+        Confere uma senha com um hash, em tempo constante na comparação.
+
+        Args:
+            password (str): A senha informada.
+            hashed_password (str): O hash guardado.
+
+        Returns:
+            bool: True se a senha confere.
+        """
+        try:
+            algorithm, iterations, salt, digest = hashed_password.split("$")
+            if algorithm != self.ALGORITHM:
+                return False
+            expected = _b64decode(digest)
+            computed = hashlib.pbkdf2_hmac("sha256", password.encode(), _b64decode(salt), int(iterations))
+        except ValueError:
+            return False
+        return hmac.compare_digest(computed, expected)
+
+
+token_core = TokenCore()
+password_hasher = PasswordHasherCore()
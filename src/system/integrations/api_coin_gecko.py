@@ -1,35 +1,69 @@
 import os
-import requests
+import math
+from typing import Optional
 from datetime import datetime
 
+from src.system.core.redis_core import RedisCore
+from src.system.integrations.http_client import HttpClient
+from src.system.integrations.coin_gecko_symbol_index import CoinGeckoSymbolIndex
+
 class CoinGecko():
-    def __init__(self) -> None:
+    def __init__(self, redis_core: Optional[RedisCore] = None) -> None:
         self.COINGECKO_BASE_URL=os.environ.get("COINGECKO_BASE_URL","https://api.coingecko.com/api/v3/")
         if not self.COINGECKO_BASE_URL:
             raise ValueError("A variável de ambiente 'COINGECKO_BASE_URL' não está definida ou está vazia.")
-        self.crypto_symbols = self.get_crypto_symbols()
-        
-    def get_crypto_symbols(self):
+        self.COINGECKO_BATCH_SIZE = int(os.environ.get("COINGECKO_BATCH_SIZE", 100))
+        self.http_client = HttpClient(base_url=self.COINGECKO_BASE_URL)
+        self.symbol_index = CoinGeckoSymbolIndex(coin_gecko=self, redis_core=redis_core or RedisCore())
+
+    async def get_coins_list(self):
         """
-        Busca todos os símbolos de criptomoedas e retorna um dicionário
-        que mapeia o símbolo da criptomoeda ao seu ID.
+        Busca a lista completa de criptomoedas suportadas pela CoinGecko.
 
         Returns:
-            dict: Um dicionário onde as chaves são os símbolos das 
-                criptomoedas e os valores são os IDs correspondentes.
+            list: Lista de dicionários com 'id', 'symbol' e 'name' de cada criptomoeda.
+
+        Raises:
+            HttpClientError: Se a requisição à API falhar ou retornar um código
+                    de status diferente de 200.
+        """
+        return await self.http_client.get_json("coins/list")
+
+    async def get_markets(self, page=1, per_page=250, vs_currency='usd'):
+        """
+        Busca uma página das criptomoedas ordenadas por capitalização de mercado.
+
+        Args:
+            page (int, optional): A página a ser buscada. O padrão é 1.
+            per_page (int, optional): Itens por página (máximo 250).
+            vs_currency (str, optional): A moeda dos valores. O padrão é 'usd'.
+
+        Returns:
+            list: Lista de dicionários com 'id', 'symbol', 'name',
+                'market_cap_rank' e demais dados de mercado.
 
         Raises:
-            Exception: Se a requisição à API falhar ou retornar um código
+            HttpClientError: Se a requisição à API falhar ou retornar um código
                     de status diferente de 200.
         """
-        url = f"{self.COINGECKO_BASE_URL}coins/list"
-        response = requests.get(url)
-        if response.status_code != 200:
-            raise Exception(f"Erro ao acessar a API: {response.status_code} - {response.text}")
+        return await self.http_client.get_json(
+            "coins/markets",
+            params={"vs_currency": vs_currency, "order": "market_cap_desc", "per_page": per_page, "page": page},
+        )
+
+    async def get_crypto_symbols(self):
+        """
+        Retorna um dicionário que mapeia o símbolo da criptomoeda ao ID mais
+        bem ranqueado por capitalização de mercado.
 
-        return {coin['symbol']: coin['id'] for coin in response.json()}
+        Returns:
+            dict: Um dicionário onde as chaves são os símbolos das 
+                criptomoedas e os valores são os IDs correspondentes.
+        """
+        await self.symbol_index.ensure_loaded()
+        return {symbol: candidates[0] for symbol, candidates in self.symbol_index.candidates.items()}
 
-    def get_per_symbol(self, symbol, vs_currency='usd'):
+    async def get_per_symbol(self, symbol, vs_currency='usd'):
         """
         Busca os dados da criptomoeda pelo símbolo especificado e retorna
         informações formatadas sobre a criptomoeda.
@@ -43,30 +77,88 @@ class CoinGecko():
 
         Returns:
             dict: Um dicionário contendo informações sobre a criptomoeda, incluindo 
-                nome, símbolo, preço atual e data da consulta.
+                nome, símbolo, preço atual (na moeda `currency`) e data da consulta.
 
         Raises:
-            Exception: Se a criptomoeda com o símbolo especificado não for encontrada 
-                    ou se a requisição à API falhar ou retornar um código de 
+            Exception: Se a criptomoeda com o símbolo especificado não for encontrada.
+            HttpClientError: Se a requisição à API falhar ou retornar um código de 
                     status diferente de 200.
         """
-        coin_id = self.crypto_symbols.get(symbol)
+        await self.symbol_index.ensure_loaded()
+        coin_id = self.symbol_index.resolve(symbol)
         if not coin_id:
             raise Exception(f"Criptomoeda com símbolo '{symbol}' não encontrada.")
-        url = f"{self.COINGECKO_BASE_URL}coins/{coin_id}"
-        response = requests.get(url)
-        if response.status_code != 200:
-            raise Exception(f"Erro ao acessar a API: {response.status_code} - {response.text}")
-
-        response_data = response.json()
+        response_data = await self.http_client.get_json(f"coins/{coin_id}")
         response_formatted = {
             'coin_name': response_data['name'],
             'symbol': response_data['symbol'],
             'coin_price': response_data['market_data']['current_price'][vs_currency],
             'coin_price_dolar': response_data['market_data']['current_price']['usd'],
             'date_consult': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            'currency': vs_currency.upper(),
         }
         return response_formatted
 
+    def batch_cost(self, symbols: list) -> int:
+        """
+        Estima quantas chamadas ao upstream `get_per_symbols` fará para os
+        símbolos, usada para consumir o limite de requisições da integração.
+
+        Args:
+            symbols (list[str]): Os símbolos das criptomoedas.
+
+        Returns:
+            int: A quantidade de lotes de COINGECKO_BATCH_SIZE ids. Antes de o
+                índice de símbolos carregar, conta um id por símbolo.
+        """
+        if self.symbol_index.updated_at:
+            coin_ids = {self.symbol_index.resolve(symbol) for symbol in symbols} - {None}
+        else:
+            coin_ids = set(symbols)
+        return math.ceil(len(coin_ids) / self.COINGECKO_BATCH_SIZE)
 
+    async def get_per_symbols(self, symbols, vs_currency='usd'):
+        """
+        Busca os dados de várias criptomoedas de uma vez através do endpoint
+        multi-id `simple/price`, em lotes de COINGECKO_BATCH_SIZE ids.
 
+        Args:
+            symbols (list[str]): Os símbolos das criptomoedas.
+            vs_currency (str, optional): A moeda em que o preço da 
+                                        criptomoeda será retornado. 
+                                        O padrão é 'usd'.
+
+        Returns:
+            dict: Um dicionário que mapeia cada símbolo encontrado às mesmas
+                informações retornadas por `get_per_symbol`. Símbolos não
+                encontrados ficam de fora.
+
+        Raises:
+            HttpClientError: Se a requisição à API falhar ou retornar um código de 
+                    status diferente de 200.
+        """
+        await self.symbol_index.ensure_loaded()
+        ids_per_symbol = {symbol: self.symbol_index.resolve(symbol) for symbol in symbols if self.symbol_index.resolve(symbol)}
+        coin_ids = list(dict.fromkeys(ids_per_symbol.values()))
+        currencies = ",".join(dict.fromkeys([vs_currency, 'usd']))
+        prices = {}
+        for start in range(0, len(coin_ids), self.COINGECKO_BATCH_SIZE):
+            prices.update(await self.http_client.get_json(
+                "simple/price",
+                params={"ids": ",".join(coin_ids[start:start + self.COINGECKO_BATCH_SIZE]), "vs_currencies": currencies},
+            ))
+        date_consult = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        response_formatted = {}
+        for symbol, coin_id in ids_per_symbol.items():
+            price = prices.get(coin_id)
+            if not price or vs_currency not in price:
+                continue
+            response_formatted[symbol] = {
+                'coin_name': self.symbol_index.get_name(coin_id),
+                'symbol': symbol,
+                'coin_price': price[vs_currency],
+                'coin_price_dolar': price.get('usd'),
+                'date_consult': date_consult,
+                'currency': vs_currency.upper(),
+            }
+        return response_formatted
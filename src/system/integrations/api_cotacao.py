@@ -3,12 +3,11 @@
 import os
 import logging
 from typing import Optional
-from requests import request
 from datetime import datetime
 from pydantic import BaseModel, field_validator
 
-from requests.exceptions import HTTPError
 from src.system.core.logger_core import logger
+from src.system.integrations.http_client import HttpClient, HttpClientError
 
 
 class ApiResponse(BaseModel):
@@ -29,6 +28,10 @@ class ApiResponse(BaseModel):
         if isinstance(value, str):
             try:
                 return datetime.strptime(value, "%Y-%m-%d %H:%M:%S")
+            except ValueError:
+                pass
+            try:
+                return datetime.fromisoformat(value)
             except ValueError as e:
                 raise ValueError(f"O formato de data de retorno é inválido: {value}") from e
         return value
@@ -47,8 +50,9 @@ class Cotacao():
         self.COTACAO_BASE_URL = os.environ.get("COTACAO_BASE_URL", "https://economia.awesomeapi.com.br/")
         if not self.COTACAO_BASE_URL:
             raise ValueError("A variável de ambiente 'COTACAO_BASE_URL' não está definida ou está vazia.")
+        self.http_client = HttpClient(base_url=self.COTACAO_BASE_URL)
 
-    def get_cotacao(self, filter: FilterCotacao) -> ApiResponse:
+    async def get_cotacao(self, filter: FilterCotacao) -> ApiResponse:
         """
         Busca a cotação das moedas especificadas pelo filtro.
 
@@ -57,7 +61,7 @@ class Cotacao():
                                     as moedas a serem consultadas.
 
         Raises:
-            HTTPError: Levanta uma exceção se a resposta da requisição HTTP não
+            HttpClientError: Levanta uma exceção se a resposta da requisição HTTP não
                     for bem-sucedida.
             Exception: Levanta uma exceção genérica para outros erros que possam
                     ocorrer durante o processamento.
@@ -67,18 +71,46 @@ class Cotacao():
                         consultadas.
         """
         try:
-            url = f"{self.COTACAO_BASE_URL}last/{filter.moeda}"     
-            # filters = filter.model_dump(exclude_none=True)
-            response = request(url=url, method="GET")
-            response.raise_for_status()
-            return ApiResponse.model_validate(response.json().get(self._remove_symbol(text=filter.moeda, symbol="-")))
-        except HTTPError as error:
+            response = await self.http_client.get_json(f"last/{filter.moeda}")
+            return ApiResponse.model_validate(response.get(self._remove_symbol(text=filter.moeda, symbol="-")))
+        except HttpClientError as error:
             logger(mensagem=f"get_store_mercado_bitcoin -> {error}", nivel=logging.ERROR)
             raise error
         except Exception as error:
             logger(mensagem=f"get_store_mercado_bitcoin -> {error}", nivel=logging.ERROR)
             raise error
 
+    async def get_cotacoes(self, moedas: list) -> dict:
+        """
+        Busca a cotação de vários pares de moedas em uma única requisição.
+
+        Args:
+            moedas (list[str]): Os pares a serem consultados, por exemplo
+                                ["USD-BRL", "EUR-BRL"].
+
+        Raises:
+            HttpClientError: Levanta uma exceção se a resposta da requisição HTTP não
+                    for bem-sucedida.
+            Exception: Levanta uma exceção genérica para outros erros que possam
+                    ocorrer durante o processamento.
+
+        Returns:
+            dict: Um dicionário que mapeia cada par encontrado ao seu ApiResponse.
+        """
+        try:
+            response = await self.http_client.get_json(f"last/{','.join(moedas)}")
+            return {
+                moeda: ApiResponse.model_validate(response[self._remove_symbol(text=moeda, symbol="-")])
+                for moeda in moedas
+                if self._remove_symbol(text=moeda, symbol="-") in response
+            }
+        except HttpClientError as error:
+            logger(mensagem=f"get_cotacoes -> {error}", nivel=logging.ERROR)
+            raise error
+        except Exception as error:
+            logger(mensagem=f"get_cotacoes -> {error}", nivel=logging.ERROR)
+            raise error
+
     def _remove_symbol(self, text: str, symbol: str) -> str:
         """
         Remove um símbolo específico de uma string.
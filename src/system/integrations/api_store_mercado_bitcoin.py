@@ -3,9 +3,10 @@ import logging
 from typing import Optional
 from datetime import datetime
 from pydantic import BaseModel
-from curl_cffi import requests
-from requests.exceptions import HTTPError
 from src.system.core.logger_core import logger
+from src.system.core.redis_core import RedisCore
+from src.system.integrations.http_client import HttpClient, HttpClientError
+from src.system.integrations.mercado_bitcoin_catalog import MercadoBitcoinCatalog
 
 class FilterGetPerSymbol(BaseModel):
     symbol:str
@@ -15,45 +16,144 @@ class FilterGetPerSymbol(BaseModel):
     sort: Optional[str] = 'release_date'
     
 class StoreMercadoBitcoin():
-    def __init__(self) -> None:
+    MODES = ("catalog", "symbol")
+
+    def __init__(self, redis_core: Optional[RedisCore] = None) -> None:
         self.STORE_MERCADO_BITCOIN_BASE_URL=os.environ.get("STORE_MERCADO_BITCOIN_BASE_URL","https://store.mercadobitcoin.com.br/api/v1/")        
         if not self.STORE_MERCADO_BITCOIN_BASE_URL:
             raise ValueError("A variável de ambiente 'STORE_MERCADO_BITCOIN_BASE_URL' não está definida ou está vazia.")
+        self.STORE_MERCADO_BITCOIN_MODE = os.environ.get("STORE_MERCADO_BITCOIN_MODE", "catalog").lower()
+        if self.STORE_MERCADO_BITCOIN_MODE not in self.MODES:
+            raise ValueError(f"A variável de ambiente 'STORE_MERCADO_BITCOIN_MODE' deve ser uma de {self.MODES}.")
+        self.http_client = HttpClient(base_url=self.STORE_MERCADO_BITCOIN_BASE_URL, impersonate="chrome")
+        self.catalog = MercadoBitcoinCatalog(store_mercado_bitcoin=self, redis_core=redis_core or RedisCore())
+
+    async def get_products(self, limit: int = 100, offset: int = 0) -> dict:
+        """
+        Busca uma página do catálogo de produtos, sem filtro de símbolo.
 
-    def get_per_symbol(self, symbol: str) :
-        """_summary_
-            Args:
-                filter (FilterStoreMercadoBitCoin): 
-                    limit: int = 20
-                    offset: int = 0
-                    order: str = 'desc'
-                    sort: str = 'release_date'
+        Args:
+            limit (int, optional): Itens por página.
+            offset (int, optional): Quantos itens pular.
 
-            Raise:
-                error: HTTPError
-                error: Exception
+        Raises:
+            HttpClientError: Se a requisição à API falhar.
 
-            Returns:
-                ApiResponse:{}
+        Returns:
+            dict: Os produtos da página ('products') e o total do catálogo
+                ('total_items').
         """
+        response_data = await self.http_client.get_json(
+            "marketplace/product/unlogged",
+            params={"limit": limit, "offset": offset, "order": "asc", "sort": "release_date"},
+        )
+        return response_data['response_data']
+
+    async def get_per_symbol(self, symbol: str) :
+        """
+        Busca o produto do símbolo e retorna as informações formatadas.
+
+        Com STORE_MERCADO_BITCOIN_MODE=catalog a resposta vem do catálogo em
+        memória (MercadoBitcoinCatalog), sem chamada ao upstream; a consulta
+        por símbolo só é feita se o catálogo não puder ser carregado, estiver
+        desatualizado há mais de MB_CATALOG_MAX_AGE segundos ou, incompleto
+        (maior que MB_CATALOG_MAX_PAGES páginas), não tiver o símbolo.
+
+        Args:
+            symbol (str): O símbolo da criptomoeda.
+
+        Raises:
+            HttpClientError: Se a requisição à API falhar.
+            Exception: Se o símbolo não for encontrado.
+
+        Returns:
+            dict: Nome, símbolo, preço e data da consulta.
+        """
+        if await self._catalog_available() and (self.catalog.complete or self.catalog.get_product(symbol)):
+            return self._from_catalog(symbol=symbol)
         try:            
-            url=f"{self.STORE_MERCADO_BITCOIN_BASE_URL}marketplace/product/unlogged"     
             filters = FilterGetPerSymbol(symbol=symbol).model_dump()
-            response = requests.get(url=url,params=filters, impersonate="chrome")
-            response.raise_for_status()
-            response_data = response.json()
+            response_data = await self.http_client.get_json("marketplace/product/unlogged", params=filters)
             product = response_data['response_data']['products'][0]  # Assumindo que há pelo menos 1 produto
             response_formatted= {
                 'coin_name': product['name'],
                 'symbol': symbol, 
                 'coin_price': float(product['market_price']),  
                 'coin_price_dolar': float(0.0),  
-                'date_consult': datetime.now().strftime('%Y-%m-%d %H:%M:%S')  
+                'date_consult': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+                'currency': 'BRL',
             }
             return response_formatted
-        except HTTPError as error:
+        except HttpClientError as error:
             logger(mensagem=f"get_store_mercado_bitcoin -> {error}",nivel=logging.ERROR)
             raise error
         except Exception as error:
             logger(mensagem=f"get_store_mercado_bitcoin -> {error}",nivel=logging.ERROR)
-            raise error
\ No newline at end of file
+            raise error
+
+    @property
+    def serves_from_memory(self) -> bool:
+        """
+        Indica se as consultas estão sendo respondidas pelo catálogo em
+        memória, sem chamadas ao upstream: modo catálogo e catálogo carregado,
+        atualizado e completo. Com o catálogo incompleto, símbolos ausentes
+        ainda vão ao upstream e precisam passar pelo rate limit.
+        """
+        return self.STORE_MERCADO_BITCOIN_MODE == "catalog" and self.catalog.is_fresh() and self.catalog.complete
+
+    @property
+    def batch_available(self) -> bool:
+        """
+        Indica se `get_per_symbols` pode ser usado. Caso contrário os símbolos
+        são consultados um a um por `get_per_symbol`.
+        """
+        return self.serves_from_memory
+
+    async def get_per_symbols(self, symbols: list) -> dict:
+        """
+        Busca vários símbolos de uma vez no catálogo em memória, sem chamadas
+        ao upstream.
+
+        Args:
+            symbols (list[str]): Os símbolos das criptomoedas.
+
+        Raises:
+            Exception: Se o catálogo não estiver disponível ou estiver incompleto.
+
+        Returns:
+            dict: Um dicionário que mapeia cada símbolo encontrado às mesmas
+                informações retornadas por `get_per_symbol`. Símbolos não
+                encontrados ficam de fora.
+        """
+        if not await self._catalog_available() or not self.catalog.complete:
+            raise Exception("Catálogo do Mercado Bitcoin indisponível ou incompleto.")
+        response_formatted = {}
+        for symbol in symbols:
+            product = self.catalog.get_product(symbol)
+            if product and product[2] is not None:
+                response_formatted[symbol] = self._from_catalog(symbol=symbol)
+        return response_formatted
+
+    async def _catalog_available(self) -> bool:
+        if self.STORE_MERCADO_BITCOIN_MODE != "catalog":
+            return False
+        try:
+            await self.catalog.ensure_loaded()
+        except Exception as error:
+            logger(mensagem=f"get_store_mercado_bitcoin -> catálogo indisponível: {error}",nivel=logging.WARNING)
+            return False
+        return self.catalog.is_fresh()
+
+    def _from_catalog(self, symbol: str) -> dict:
+        product = self.catalog.get_product(symbol)
+        if not product or product[2] is None:
+            raise Exception(f"Produto com símbolo '{symbol}' não encontrado no catálogo.")
+        _, name, price = product
+        return {
+            'coin_name': name,
+            'symbol': symbol,
+            'coin_price': price,
+            'coin_price_dolar': float(0.0),
+            'date_consult': datetime.fromtimestamp(self.catalog.updated_at).strftime('%Y-%m-%d %H:%M:%S'),
+            'currency': 'BRL',
+        }
@@ -0,0 +1,284 @@
+import os
+import json
+import uuid
+import asyncio
+import logging
+from datetime import datetime
+from typing import Optional
+
+from src.system.core.logger_core import logger
+from src.system.core.redis_core import RedisCore
+from src.system.core.singleflight_core import SingleFlightCore
+
+
+class CoinGeckoSymbolIndex():
+    def __init__(self, coin_gecko, redis_core: RedisCore) -> None:
+        """
+        Inicializa o índice de símbolos da CoinGecko.
+
+        O índice mapeia cada símbolo aos ids candidatos, ordenados pelo ranking
+        de capitalização de mercado, e é persistido como snapshot no Redis (e
+        opcionalmente em disco em COINGECKO_INDEX_PATH). Os workers carregam o
+        snapshot compartilhado; apenas o detentor de uma concessão no Redis
+        baixa a lista completa, a cada COINGECKO_INDEX_REFRESH_INTERVAL
+        segundos, aplicando ao índice somente a diferença para o snapshot
+        anterior.
+
+        Args:
+            coin_gecko (CoinGecko): Integração usada para baixar a lista de
+                                    moedas e o ranking de mercado.
+            redis_core (RedisCore): Instância usada para o snapshot e a concessão.
+        """
+        self.COINGECKO_INDEX_REDIS_KEY = os.environ.get("COINGECKO_INDEX_REDIS_KEY", "coingecko:symbol_index")
+        self.COINGECKO_INDEX_PATH = os.environ.get("COINGECKO_INDEX_PATH", "")
+        self.COINGECKO_INDEX_REFRESH_INTERVAL = float(os.environ.get("COINGECKO_INDEX_REFRESH_INTERVAL", 3600))
+        self.COINGECKO_INDEX_SYNC_INTERVAL = float(os.environ.get("COINGECKO_INDEX_SYNC_INTERVAL", 60))
+        self.COINGECKO_INDEX_RANK_PAGES = int(os.environ.get("COINGECKO_INDEX_RANK_PAGES", 4))
+        self.coin_gecko = coin_gecko
+        self.redis_core = redis_core
+        self.single_flight = SingleFlightCore(redis_core=redis_core)
+        self.coins: dict[str, tuple] = {}
+        self.candidates: dict[str, tuple] = {}
+        self._ids_per_symbol: dict[str, set] = {}
+        self.updated_at = 0.0
+        self._lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+
+    def resolve(self, symbol: str) -> Optional[str]:
+        """
+        Retorna o id mais bem ranqueado para o símbolo.
+
+        Args:
+            symbol (str): O símbolo da criptomoeda.
+
+        Returns:
+            str: O id da CoinGecko, ou None se o símbolo não existir.
+        """
+        candidates = self.candidates.get(symbol)
+        return candidates[0] if candidates else None
+
+    def get_candidates(self, symbol: str) -> tuple:
+        """
+        Retorna todos os ids que usam o símbolo, do mais ao menos bem ranqueado.
+
+        Args:
+            symbol (str): O símbolo da criptomoeda.
+
+        Returns:
+            tuple: Os ids candidatos.
+        """
+        return self.candidates.get(symbol, ())
+
+    def get_name(self, coin_id: str) -> str:
+        """
+        Retorna o nome da criptomoeda.
+
+        Args:
+            coin_id (str): O id da CoinGecko.
+
+        Returns:
+            str: O nome da criptomoeda, ou o próprio id se não for conhecido.
+        """
+        coin = self.coins.get(coin_id)
+        return coin[1] if coin else coin_id
+
+    def start(self) -> None:
+        """
+        Inicia a sincronização periódica em segundo plano, se ainda não estiver rodando.
+        """
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._sync_loop())
+
+    async def stop(self) -> None:
+        """
+        Interrompe a sincronização periódica.
+        """
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def ensure_loaded(self) -> None:
+        """
+        Garante que o índice esteja carregado, usando o snapshot do Redis ou do
+        disco e, apenas se nenhum existir, baixando a lista na hora (uma única
+        vez entre todos os workers).
+        """
+        self.start()
+        if self.candidates:
+            return
+        async with self._lock:
+            if self.candidates:
+                return
+            if not await self._load_snapshot():
+                await self.single_flight.do(
+                    key=self.COINGECKO_INDEX_REDIS_KEY,
+                    fetch=self._refresh,
+                    read_cached=self._load_snapshot,
+                )
+
+    async def sync(self) -> None:
+        """
+        Sincroniza o índice com o snapshot compartilhado e, se o snapshot tiver
+        mais de COINGECKO_INDEX_REFRESH_INTERVAL segundos e este worker obtiver
+        a concessão, baixa a lista atualizada.
+        """
+        async with self._lock:
+            await self._load_snapshot()
+            if datetime.now().timestamp() - self.updated_at < self.COINGECKO_INDEX_REFRESH_INTERVAL:
+                return
+            lease_key = f"lease:{self.COINGECKO_INDEX_REDIS_KEY}"
+            token = uuid.uuid4().hex
+            if not await self.redis_core.acquire_lease_redis(key=lease_key, token=token, time=self.COINGECKO_INDEX_SYNC_INTERVAL):
+                return
+            try:
+                await self._refresh()
+            finally:
+                await self.redis_core.release_lease_redis(key=lease_key, token=token)
+
+    async def _refresh(self) -> None:
+        """
+        Baixa a lista de moedas e o ranking de mercado, aplica a diferença ao
+        índice e grava o novo snapshot. Se alguma página do ranking falhar, as
+        moedas que ficaram sem ranking mantêm o ranking anterior, para que um
+        símbolo ambíguo não deixe de apontar para a moeda de maior mercado.
+        """
+        coins_list = await self.coin_gecko.get_coins_list()
+        ranks = {}
+        ranked = True
+        for page in range(1, self.COINGECKO_INDEX_RANK_PAGES + 1):
+            try:
+                markets = await self.coin_gecko.get_markets(page=page)
+            except Exception as error:
+                logger(mensagem=f"CoinGeckoSymbolIndex._refresh -> ranking indisponível, mantendo o anterior: {error}", nivel=logging.WARNING)
+                ranked = False
+                break
+            if not markets:
+                break
+            ranks.update({coin['id']: coin.get('market_cap_rank') for coin in markets})
+        if not ranked:
+            ranks = {coin_id: coin[2] for coin_id, coin in self.coins.items()} | ranks
+        coins = {
+            coin['id']: (coin['symbol'].lower(), coin['name'], ranks.get(coin['id']))
+            for coin in coins_list
+        }
+        added, removed, changed = self._apply(coins=coins, updated_at=datetime.now().timestamp())
+        logger(
+            mensagem=f"CoinGeckoSymbolIndex -> {len(self.coins)} moedas (+{added} -{removed} ~{changed})",
+            nivel=logging.INFO,
+        )
+        await self._save_snapshot()
+
+    def _apply(self, coins: dict, updated_at: float) -> tuple:
+        """
+        Aplica ao índice apenas a diferença entre o snapshot atual e o novo,
+        reordenando somente os símbolos afetados.
+
+        Args:
+            coins (dict): Mapeamento id -> (símbolo, nome, ranking).
+            updated_at (float): Instante do novo snapshot.
+
+        Returns:
+            tuple: Quantidade de ids adicionados, removidos e alterados.
+        """
+        added = coins.keys() - self.coins.keys()
+        removed = self.coins.keys() - coins.keys()
+        changed = {coin_id for coin_id in coins.keys() & self.coins.keys() if coins[coin_id] != self.coins[coin_id]}
+        affected = set()
+        for coin_id in removed | changed:
+            symbol = self.coins[coin_id][0]
+            self._ids_per_symbol.get(symbol, set()).discard(coin_id)
+            affected.add(symbol)
+        for coin_id in added | changed:
+            symbol = coins[coin_id][0]
+            self._ids_per_symbol.setdefault(symbol, set()).add(coin_id)
+            affected.add(symbol)
+        self.coins = coins
+        for symbol in affected:
+            ids = self._ids_per_symbol.get(symbol)
+            if ids:
+                self.candidates[symbol] = tuple(sorted(ids, key=self._rank_key))
+            else:
+                self._ids_per_symbol.pop(symbol, None)
+                self.candidates.pop(symbol, None)
+        self.updated_at = updated_at
+        return len(added), len(removed), len(changed)
+
+    def _rank_key(self, coin_id: str) -> tuple:
+        rank = self.coins[coin_id][2]
+        return (rank is None, rank or 0, coin_id)
+
+    async def _load_snapshot(self) -> bool:
+        """
+        Carrega o snapshot mais recente entre Redis e disco, se for mais novo
+        que o índice em memória.
+
+        Returns:
+            bool: True se o índice em memória tem dados após a carga.
+        """
+        snapshot = None
+        try:
+            snapshot = await self.redis_core.get_redis(key=self.COINGECKO_INDEX_REDIS_KEY, bulk=True) or None
+        except Exception as error:
+            logger(mensagem=f"CoinGeckoSymbolIndex._load_snapshot -> {error}", nivel=logging.WARNING)
+        if self.COINGECKO_INDEX_PATH and (snapshot is None or not self.candidates):
+            disk_snapshot = await asyncio.to_thread(self._read_disk_snapshot)
+            if disk_snapshot and (snapshot is None or disk_snapshot["updated_at"] > snapshot["updated_at"]):
+                snapshot = disk_snapshot
+        if snapshot and snapshot["updated_at"] > self.updated_at:
+            coins = {coin_id: (symbol, name, rank) for coin_id, symbol, name, rank in snapshot["coins"]}
+            self._apply(coins=coins, updated_at=snapshot["updated_at"])
+        return bool(self.candidates)
+
+    async def _save_snapshot(self) -> None:
+        """
+        Grava o índice atual como snapshot no Redis e, se configurado, em disco.
+        """
+        snapshot = {
+            "updated_at": self.updated_at,
+            "coins": [[coin_id, symbol, name, rank] for coin_id, (symbol, name, rank) in self.coins.items()],
+        }
+        try:
+            await self.redis_core.set_redis(key=self.COINGECKO_INDEX_REDIS_KEY, data=json.dumps(snapshot), bulk=True)
+        except Exception as error:
+            logger(mensagem=f"CoinGeckoSymbolIndex._save_snapshot -> {error}", nivel=logging.WARNING)
+        if self.COINGECKO_INDEX_PATH:
+            await asyncio.to_thread(self._write_disk_snapshot, snapshot)
+
+    def _read_disk_snapshot(self) -> Optional[dict]:
+        try:
+            with open(self.COINGECKO_INDEX_PATH, encoding="utf-8") as file:
+                return json.load(file)
+        except FileNotFoundError:
+            return None
+        except Exception as error:
+            logger(mensagem=f"CoinGeckoSymbolIndex._read_disk_snapshot -> {error}", nivel=logging.WARNING)
+            return None
+
+    def _write_disk_snapshot(self, snapshot: dict) -> None:
+        try:
+            directory = os.path.dirname(self.COINGECKO_INDEX_PATH)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            temp_path = f"{self.COINGECKO_INDEX_PATH}.tmp"
+            with open(temp_path, "w", encoding="utf-8") as file:
+                json.dump(snapshot, file)
+            os.replace(temp_path, self.COINGECKO_INDEX_PATH)
+        except Exception as error:
+            logger(mensagem=f"CoinGeckoSymbolIndex._write_disk_snapshot -> {error}", nivel=logging.WARNING)
+
+    async def _sync_loop(self) -> None:
+        """
+        Executa `sync` a cada COINGECKO_INDEX_SYNC_INTERVAL segundos.
+        """
+        while True:
+            await asyncio.sleep(self.COINGECKO_INDEX_SYNC_INTERVAL)
+            try:
+                await self.sync()
+            except asyncio.CancelledError:
+                raise
+            except Exception as error:
+                logger(mensagem=f"CoinGeckoSymbolIndex._sync_loop -> {error}", nivel=logging.WARNING)
@@ -0,0 +1,241 @@
+import os
+import json
+import asyncio
+import logging
+from datetime import datetime
+from typing import Optional
+
+import numpy as np
+
+from src.system.core.logger_core import logger
+from src.system.core.redis_core import RedisCore
+from src.system.core.metrics_core import FX_LOOKUPS
+from src.system.integrations.api_cotacao import ApiResponse, Cotacao
+
+
+class FxRateService():
+    # Moeda de referência dos pares: todas as cotações são "<moeda>-BRL".
+    BASE_CURRENCY = "BRL"
+
+    def __init__(self, cotacao: Cotacao, redis_core: RedisCore) -> None:
+        """
+        Inicializa o serviço de câmbio.
+
+        Mantém em memória e no Redis a última cotação dos pares configurados em
+        FX_PAIRS, atualizada em segundo plano a cada FX_REFRESH_INTERVAL
+        segundos. As conversões são respondidas da memória, sem I/O. Entre
+        workers, a cotação gravada no Redis por um deles é reaproveitada pelos
+        demais enquanto estiver dentro do intervalo de atualização.
+
+        FX_CURRENCIES são as moedas aceitas em `vs_currencies`: os pares
+        "<moeda>-BRL" entram em FX_PAIRS, de modo que todas são buscadas na
+        mesma requisição, e a cotação de cada moeda carregada (em reais por
+        unidade) fica em um vetor numpy remontado apenas quando alguma cotação
+        muda.
+
+        Args:
+            cotacao (Cotacao): Integração usada para buscar as cotações.
+            redis_core (RedisCore): Instância usada para compartilhar as cotações.
+        """
+        self.FX_PAIRS = [pair.strip().upper() for pair in os.environ.get("FX_PAIRS", "USD-BRL").split(",") if pair.strip()]
+        self.FX_CURRENCIES = list(dict.fromkeys(
+            currency.strip().upper() for currency in os.environ.get("FX_CURRENCIES", "BRL,USD,EUR,GBP").split(",") if currency.strip()
+        ))
+        for currency in self.FX_CURRENCIES:
+            if currency != self.BASE_CURRENCY and f"{currency}-{self.BASE_CURRENCY}" not in self.FX_PAIRS:
+                self.FX_PAIRS.append(f"{currency}-{self.BASE_CURRENCY}")
+        self.FX_REFRESH_INTERVAL = float(os.environ.get("FX_REFRESH_INTERVAL", 30))
+        self.FX_REDIS_KEY = os.environ.get("FX_REDIS_KEY", "fx:rates")
+        self.cotacao = cotacao
+        self.redis_core = redis_core
+        self.rates: dict[str, ApiResponse] = {}
+        self.updated_at: dict[str, float] = {}
+        self._task: Optional[asyncio.Task] = None
+        self._refresh_lock = asyncio.Lock()
+        self._vector: Optional[np.ndarray] = None
+        self._vector_index: dict[str, int] = {}
+
+    def start(self) -> None:
+        """
+        Inicia a atualização periódica em segundo plano, se ainda não estiver rodando.
+        """
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._refresh_loop())
+
+    async def stop(self) -> None:
+        """
+        Interrompe a atualização periódica.
+        """
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def ensure_loaded(self) -> None:
+        """
+        Garante que as cotações de todos os pares configurados estejam em
+        memória e inicia a atualização periódica.
+
+        Raises:
+            Exception: Se algum par não puder ser obtido.
+        """
+        self.start()
+        if any(pair not in self.rates for pair in self.FX_PAIRS):
+            await self.refresh()
+        missing = [pair for pair in self.FX_PAIRS if pair not in self.rates]
+        if missing:
+            raise Exception(f"Cotação dos pares {missing} indisponível.")
+
+    async def get_rate(self, pair: str) -> tuple[ApiResponse, float]:
+        """
+        Retorna a cotação do par e há quantos segundos ela foi obtida.
+
+        Em regime normal a resposta vem da memória, sem I/O. Apenas na primeira
+        consulta de um par ainda não carregado a cotação é buscada na hora.
+
+        Args:
+            pair (str): O par de moedas, por exemplo "USD-BRL".
+
+        Raises:
+            Exception: Se o par não puder ser obtido.
+
+        Returns:
+            tuple: A cotação (ApiResponse) e sua idade em segundos.
+        """
+        pair = pair.upper()
+        self.start()
+        source = "memory"
+        if pair not in self.rates:
+            source = "fetch"
+            if pair not in self.FX_PAIRS:
+                self.FX_PAIRS.append(pair)
+            await self.refresh()
+        if pair not in self.rates:
+            FX_LOOKUPS.labels(pair, "error").inc()
+            raise Exception(f"Cotação do par '{pair}' indisponível.")
+        FX_LOOKUPS.labels(pair, source).inc()
+        return self.rates[pair], self.get_age(pair)
+
+    async def get_conversion_rates(self, currencies: list) -> np.ndarray:
+        """
+        Retorna quantos reais vale uma unidade de cada moeda, na ordem pedida,
+        para converter preços com uma única operação vetorizada. Usa o campo
+        `bid` de cada par "<moeda>-BRL".
+
+        Args:
+            currencies (list[str]): As moedas, em maiúsculas. Pares ainda não
+                                    carregados são buscados na hora.
+
+        Raises:
+            Exception: Se a cotação de alguma moeda não puder ser obtida.
+
+        Returns:
+            np.ndarray: As cotações (BRL por unidade), uma por moeda.
+        """
+        self.start()
+        pairs = [f"{currency}-{self.BASE_CURRENCY}" for currency in currencies if currency != self.BASE_CURRENCY]
+        if any(pair not in self.rates for pair in pairs):
+            self.FX_PAIRS.extend(pair for pair in dict.fromkeys(pairs) if pair not in self.FX_PAIRS)
+            await self.refresh()
+        if self._vector is None:
+            self._vector_index = {self.BASE_CURRENCY: 0}
+            values = [1.0]
+            for pair, rate in self.rates.items():
+                currency, _, quote = pair.partition("-")
+                if quote == self.BASE_CURRENCY and rate.bid:
+                    self._vector_index[currency] = len(values)
+                    values.append(rate.bid)
+            self._vector = np.array(values, dtype=np.float64)
+        missing = [currency for currency in currencies if currency not in self._vector_index]
+        if missing:
+            FX_LOOKUPS.labels("matrix", "error").inc()
+            raise Exception(f"Cotação de {missing} indisponível.")
+        FX_LOOKUPS.labels("matrix", "memory").inc()
+        return self._vector[[self._vector_index[currency] for currency in currencies]]
+
+    def get_age(self, pair: str) -> Optional[float]:
+        """
+        Retorna há quantos segundos a cotação do par foi obtida.
+
+        Args:
+            pair (str): O par de moedas.
+
+        Returns:
+            float: A idade da cotação em segundos, ou None se não houver cotação.
+        """
+        updated_at = self.updated_at.get(pair.upper())
+        if updated_at is None:
+            return None
+        return max(0.0, datetime.now().timestamp() - updated_at)
+
+    def get_rates(self) -> dict:
+        """
+        Retorna o estado atual das cotações em memória.
+
+        Returns:
+            dict: Para cada par, a cotação, o instante da atualização e a idade
+                em segundos.
+        """
+        return {
+            pair: {
+                "rate": rate.model_dump(mode="json"),
+                "updated_at": datetime.fromtimestamp(self.updated_at[pair]).strftime("%Y-%m-%d %H:%M:%S"),
+                "age_seconds": self.get_age(pair),
+            }
+            for pair, rate in self.rates.items()
+        }
+
+    async def refresh(self) -> None:
+        """
+        Atualiza as cotações de todos os pares configurados.
+
+        Usa as cotações do Redis se outro worker as atualizou há menos de
+        FX_REFRESH_INTERVAL segundos; caso contrário busca todos os pares em uma
+        única requisição e grava o resultado no Redis.
+        """
+        async with self._refresh_lock:
+            now = datetime.now().timestamp()
+            pending = set(self.FX_PAIRS)
+            try:
+                shared = await self.redis_core.get_redis(key=self.FX_REDIS_KEY) or {}
+            except Exception as error:
+                logger(mensagem=f"FxRateService.refresh -> {error}", nivel=logging.WARNING)
+                shared = {}
+            for pair, item in shared.items():
+                if pair in pending and now - item["updated_at"] < self.FX_REFRESH_INTERVAL:
+                    self._store(pair=pair, rate=ApiResponse.model_validate(item["rate"]), updated_at=item["updated_at"])
+                    pending.discard(pair)
+            if not pending:
+                return
+
+            rates = await self.cotacao.get_cotacoes(moedas=sorted(pending))
+            for pair, rate in rates.items():
+                self._store(pair=pair, rate=rate, updated_at=now)
+                shared[pair] = {"rate": rate.model_dump(mode="json"), "updated_at": now}
+            try:
+                await self.redis_core.set_redis(key=self.FX_REDIS_KEY, data=json.dumps(shared))
+            except Exception as error:
+                logger(mensagem=f"FxRateService.refresh -> {error}", nivel=logging.WARNING)
+
+    def _store(self, pair: str, rate: ApiResponse, updated_at: float) -> None:
+        if updated_at >= self.updated_at.get(pair, 0):
+            self.rates[pair] = rate
+            self.updated_at[pair] = updated_at
+            self._vector = None
+
+    async def _refresh_loop(self) -> None:
+        """
+        Executa `refresh` a cada FX_REFRESH_INTERVAL segundos, mantendo a última
+        cotação válida em caso de erro.
+        """
+        while True:
+            try:
+                await self.refresh()
+            except asyncio.CancelledError:
+                raise
+            except Exception as error:
+                logger(mensagem=f"FxRateService._refresh_loop -> {error}", nivel=logging.WARNING)
+            await asyncio.sleep(self.FX_REFRESH_INTERVAL)
@@ -0,0 +1,135 @@
+import os
+import logging
+from typing import Optional
+
+import httpx
+from curl_cffi.requests import AsyncSession
+from curl_cffi.requests.errors import RequestsError
+
+from src.system.core.logger_core import logger
+
+
+class HttpClientError(Exception):
+    def __init__(self, mensagem: str, status_code: Optional[int] = None) -> None:
+        """
+        Erro padronizado das chamadas HTTP feitas pelas integrações.
+
+        Args:
+            mensagem (str): Descrição do erro.
+            status_code (int, optional): Código HTTP retornado pelo upstream,
+                                         ou None para erros de transporte.
+        """
+        super().__init__(mensagem)
+        self.status_code = status_code
+
+
+class HttpClient():
+    _clients: dict = {}
+    _sessions: dict = {}
+
+    def __init__(self, base_url: str, impersonate: Optional[str] = None) -> None:
+        """
+        Inicializa um cliente HTTP assíncrono para a URL base informada.
+
+        Os clientes são compartilhados por URL base (um pool de conexões
+        keep-alive por host), de forma que todas as instâncias de uma mesma
+        integração reutilizam as mesmas conexões.
+
+        Args:
+            base_url (str): URL base do upstream.
+            impersonate (str, optional): Perfil de navegador do curl-cffi. Quando
+                                         informado, usa uma AsyncSession do
+                                         curl-cffi em vez do httpx.
+        """
+        self.HTTP_TIMEOUT = float(os.environ.get("HTTP_TIMEOUT", 10))
+        self.HTTP_CONNECT_TIMEOUT = float(os.environ.get("HTTP_CONNECT_TIMEOUT", 3))
+        self.HTTP_MAX_CONNECTIONS_PER_HOST = int(os.environ.get("HTTP_MAX_CONNECTIONS_PER_HOST", 20))
+        self.HTTP_MAX_KEEPALIVE_CONNECTIONS = int(os.environ.get("HTTP_MAX_KEEPALIVE_CONNECTIONS", 10))
+        self.HTTP_KEEPALIVE_EXPIRY = float(os.environ.get("HTTP_KEEPALIVE_EXPIRY", 30))
+        self.base_url = base_url if base_url.endswith("/") else f"{base_url}/"
+        self.impersonate = impersonate
+
+    def _get_client(self) -> httpx.AsyncClient:
+        """
+        Retorna o cliente httpx compartilhado da URL base, criando-o se necessário.
+
+        Returns:
+            httpx.AsyncClient: Cliente com pool de conexões e timeouts configurados.
+        """
+        client = HttpClient._clients.get(self.base_url)
+        if client is None or client.is_closed:
+            client = httpx.AsyncClient(
+                base_url=self.base_url,
+                timeout=httpx.Timeout(self.HTTP_TIMEOUT, connect=self.HTTP_CONNECT_TIMEOUT),
+                limits=httpx.Limits(
+                    max_connections=self.HTTP_MAX_CONNECTIONS_PER_HOST,
+                    max_keepalive_connections=self.HTTP_MAX_KEEPALIVE_CONNECTIONS,
+                    keepalive_expiry=self.HTTP_KEEPALIVE_EXPIRY,
+                ),
+            )
+            HttpClient._clients[self.base_url] = client
+        return client
+
+    def _get_session(self) -> AsyncSession:
+        """
+        Retorna a sessão curl-cffi compartilhada da URL base, criando-a se necessário.
+
+        Returns:
+            AsyncSession: Sessão com limite de conexões e timeout configurados.
+        """
+        session = HttpClient._sessions.get(self.base_url)
+        if session is None:
+            session = AsyncSession(
+                max_clients=self.HTTP_MAX_CONNECTIONS_PER_HOST,
+                impersonate=self.impersonate,
+                timeout=self.HTTP_TIMEOUT,
+            )
+            HttpClient._sessions[self.base_url] = session
+        return session
+
+    async def get_json(self, path: str, params: Optional[dict] = None):
+        """
+        Executa um GET no upstream e retorna o corpo decodificado como JSON.
+
+        Args:
+            path (str): Caminho relativo à URL base.
+            params (dict, optional): Parâmetros de query string.
+
+        Raises:
+            HttpClientError: Se a requisição falhar ou retornar um código de
+                             status diferente de 2xx.
+
+        Returns:
+            Any: O corpo da resposta decodificado.
+        """
+        try:
+            if self.impersonate:
+                response = await self._get_session().get(f"{self.base_url}{path}", params=params)
+            else:
+                response = await self._get_client().get(path, params=params)
+        except (httpx.HTTPError, RequestsError) as error:
+            raise HttpClientError(f"Erro ao acessar {self.base_url}{path}: {error}") from error
+        if not 200 <= response.status_code < 300:
+            raise HttpClientError(
+                f"Erro ao acessar a API: {response.status_code} - {response.text}",
+                status_code=response.status_code,
+            )
+        return response.json()
+
+    @classmethod
+    async def close_all(cls) -> None:
+        """
+        Fecha todos os clientes e sessões compartilhados.
+        """
+        for client in cls._clients.values():
+            try:
+                await client.aclose()
+            except Exception as error:
+                logger(mensagem=f"HttpClient.close_all -> {error}", nivel=logging.WARNING)
+        for session in cls._sessions.values():
+            try:
+                await session.close()
+            except Exception as error:
+                logger(mensagem=f"HttpClient.close_all -> {error}", nivel=logging.WARNING)
+        cls._clients.clear()
+        cls._sessions.clear()
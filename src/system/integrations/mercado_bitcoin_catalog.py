@@ -0,0 +1,248 @@
+import os
+import json
+import math
+import uuid
+import asyncio
+import logging
+from datetime import datetime
+from typing import Optional
+
+from src.system.core.logger_core import logger
+from src.system.core.redis_core import RedisCore
+from src.system.core.singleflight_core import SingleFlightCore
+
+
+class MercadoBitcoinCatalog():
+    def __init__(self, store_mercado_bitcoin, redis_core: RedisCore) -> None:
+        """
+        Inicializa o catálogo de produtos do Mercado Bitcoin.
+
+        O catálogo mapeia cada símbolo ao produto (nome e preço) e é persistido
+        como snapshot no Redis. Os workers carregam o snapshot compartilhado;
+        apenas o detentor de uma concessão no Redis baixa o catálogo completo,
+        a cada MB_CATALOG_REFRESH_INTERVAL segundos, em páginas de
+        MB_CATALOG_PAGE_SIZE itens (até MB_CATALOG_MAX_PAGES páginas), com no
+        máximo MB_CATALOG_CONCURRENCY páginas simultâneas. Uma única
+        sincronização atualiza o preço de todos os produtos. Se o catálogo
+        tiver mais itens que esse limite, ele é marcado como incompleto
+        (`complete`) e os símbolos ausentes devem ser consultados um a um.
+
+        Quando há mais de um produto com o mesmo símbolo, vale o lançamento
+        mais recente, como na consulta por símbolo.
+
+        Args:
+            store_mercado_bitcoin (StoreMercadoBitcoin): Integração usada para
+                                                         baixar as páginas do catálogo.
+            redis_core (RedisCore): Instância usada para o snapshot e a concessão.
+        """
+        self.MB_CATALOG_REDIS_KEY = os.environ.get("MB_CATALOG_REDIS_KEY", "mercadobitcoin:catalog")
+        self.MB_CATALOG_REFRESH_INTERVAL = float(os.environ.get("MB_CATALOG_REFRESH_INTERVAL", 60))
+        self.MB_CATALOG_SYNC_INTERVAL = float(os.environ.get("MB_CATALOG_SYNC_INTERVAL", 10))
+        self.MB_CATALOG_MAX_AGE = float(os.environ.get("MB_CATALOG_MAX_AGE", 300))
+        self.MB_CATALOG_PAGE_SIZE = int(os.environ.get("MB_CATALOG_PAGE_SIZE", 100))
+        self.MB_CATALOG_MAX_PAGES = int(os.environ.get("MB_CATALOG_MAX_PAGES", 50))
+        self.MB_CATALOG_CONCURRENCY = int(os.environ.get("MB_CATALOG_CONCURRENCY", 4))
+        self.store_mercado_bitcoin = store_mercado_bitcoin
+        self.redis_core = redis_core
+        self.single_flight = SingleFlightCore(redis_core=redis_core)
+        self.products: dict[str, tuple] = {}
+        self.updated_at = 0.0
+        self.complete = True
+        self.failed_at = 0.0
+        self._lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+
+    def get_product(self, symbol: str) -> Optional[tuple]:
+        """
+        Retorna o produto do símbolo.
+
+        Args:
+            symbol (str): O símbolo da criptomoeda, em minúsculas.
+
+        Returns:
+            tuple: O símbolo como informado pelo Mercado Bitcoin, o nome e o
+                preço (ou None se não for numérico), ou None se o símbolo não
+                estiver no catálogo.
+        """
+        return self.products.get(symbol)
+
+    def is_fresh(self) -> bool:
+        """
+        Indica se o catálogo foi carregado e tem menos de MB_CATALOG_MAX_AGE
+        segundos, isto é, se pode responder às consultas por símbolo.
+
+        Returns:
+            bool: True se o catálogo pode ser usado.
+        """
+        return bool(self.updated_at) and datetime.now().timestamp() - self.updated_at < self.MB_CATALOG_MAX_AGE
+
+    def start(self) -> None:
+        """
+        Inicia a sincronização periódica em segundo plano, se ainda não estiver rodando.
+        """
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._sync_loop())
+
+    async def stop(self) -> None:
+        """
+        Interrompe a sincronização periódica.
+        """
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def ensure_loaded(self) -> None:
+        """
+        Garante que o catálogo esteja carregado, usando o snapshot do Redis e,
+        apenas se ele não existir, baixando o catálogo na hora (uma única vez
+        entre todos os workers).
+
+        Se esse download falhar, o instante é guardado em `failed_at` e as
+        chamadas seguintes retornam sem tentar de novo: só a sincronização
+        periódica volta a baixar o catálogo, e até lá as consultas seguem por
+        símbolo sem esperar por um upstream que está falhando.
+
+        Raises:
+            HttpClientError: Se o catálogo precisar ser baixado e a requisição
+                    à API falhar.
+        """
+        self.start()
+        if self.updated_at or self.failed_at:
+            return
+        async with self._lock:
+            if self.updated_at or self.failed_at:
+                return
+            if not await self._load_snapshot():
+                try:
+                    await self.single_flight.do(
+                        key=self.MB_CATALOG_REDIS_KEY,
+                        fetch=self._refresh,
+                        read_cached=self._load_snapshot,
+                    )
+                except Exception:
+                    self.failed_at = datetime.now().timestamp()
+                    raise
+
+    async def sync(self) -> None:
+        """
+        Sincroniza o catálogo com o snapshot compartilhado e, se o snapshot
+        tiver mais de MB_CATALOG_REFRESH_INTERVAL segundos e este worker obtiver
+        a concessão, baixa o catálogo atualizado.
+        """
+        async with self._lock:
+            await self._load_snapshot()
+            if datetime.now().timestamp() - self.updated_at < self.MB_CATALOG_REFRESH_INTERVAL:
+                return
+            lease_key = f"lease:{self.MB_CATALOG_REDIS_KEY}"
+            token = uuid.uuid4().hex
+            if not await self.redis_core.acquire_lease_redis(key=lease_key, token=token, time=self.MB_CATALOG_REFRESH_INTERVAL):
+                return
+            try:
+                await self._refresh()
+            finally:
+                await self.redis_core.release_lease_redis(key=lease_key, token=token)
+
+    async def _refresh(self) -> bool:
+        """
+        Baixa o catálogo completo e grava o novo snapshot. A primeira página
+        informa o total de itens; as demais são buscadas em paralelo. Se alguma
+        página falhar o catálogo anterior é mantido, para que um catálogo
+        incompleto não dê símbolos existentes como inexistentes. Se o total
+        passar de MB_CATALOG_MAX_PAGES páginas, só essas são baixadas e o
+        catálogo fica marcado como incompleto.
+
+        Raises:
+            HttpClientError: Se alguma página não puder ser obtida.
+
+        Returns:
+            bool: True, após o catálogo ser atualizado.
+        """
+        first = await self.store_mercado_bitcoin.get_products(limit=self.MB_CATALOG_PAGE_SIZE, offset=0)
+        pages = [first.get('products') or []]
+        total_items = int(first.get('total_items') or 0)
+        page_count = math.ceil(total_items / self.MB_CATALOG_PAGE_SIZE)
+        complete = page_count <= self.MB_CATALOG_MAX_PAGES
+        if not complete:
+            logger(
+                mensagem=f"MercadoBitcoinCatalog -> {total_items} produtos excedem MB_CATALOG_MAX_PAGES ({self.MB_CATALOG_MAX_PAGES} páginas de {self.MB_CATALOG_PAGE_SIZE}); símbolos fora do catálogo serão consultados por símbolo",
+                nivel=logging.WARNING,
+            )
+            page_count = self.MB_CATALOG_MAX_PAGES
+        semaphore = asyncio.Semaphore(self.MB_CATALOG_CONCURRENCY)
+
+        async def get_page(page: int) -> list:
+            async with semaphore:
+                response_data = await self.store_mercado_bitcoin.get_products(limit=self.MB_CATALOG_PAGE_SIZE, offset=page * self.MB_CATALOG_PAGE_SIZE)
+                return response_data.get('products') or []
+
+        if len(pages[0]) >= self.MB_CATALOG_PAGE_SIZE:
+            pages += await asyncio.gather(*(get_page(page) for page in range(1, page_count)))
+        products = {}
+        # As páginas vêm em ordem crescente de lançamento: o mais recente de
+        # cada símbolo sobrescreve os anteriores.
+        for page in pages:
+            for product in page:
+                if product.get('symbol'):
+                    products[product['symbol'].lower()] = (product['symbol'], product.get('name') or product['symbol'], self._price(product.get('market_price')))
+        self.products = products
+        self.complete = complete
+        self.updated_at = datetime.now().timestamp()
+        logger(mensagem=f"MercadoBitcoinCatalog -> {len(products)} produtos em {len(pages)} páginas", nivel=logging.INFO)
+        await self._save_snapshot()
+        return True
+
+    @staticmethod
+    def _price(value) -> Optional[float]:
+        try:
+            return float(value)
+        except (TypeError, ValueError):
+            return None
+
+    async def _load_snapshot(self) -> bool:
+        """
+        Carrega o snapshot do Redis, se for mais novo que o catálogo em memória.
+
+        Returns:
+            bool: True se o catálogo em memória foi carregado após a carga.
+        """
+        snapshot = None
+        try:
+            snapshot = await self.redis_core.get_redis(key=self.MB_CATALOG_REDIS_KEY, bulk=True) or None
+        except Exception as error:
+            logger(mensagem=f"MercadoBitcoinCatalog._load_snapshot -> {error}", nivel=logging.WARNING)
+        if snapshot and snapshot["updated_at"] > self.updated_at:
+            self.products = {symbol: (display_symbol, name, price) for symbol, display_symbol, name, price in snapshot["products"]}
+            self.complete = snapshot.get("complete", True)
+            self.updated_at = snapshot["updated_at"]
+        return bool(self.updated_at)
+
+    async def _save_snapshot(self) -> None:
+        """
+        Grava o catálogo atual como snapshot no Redis.
+        """
+        snapshot = {
+            "updated_at": self.updated_at,
+            "complete": self.complete,
+            "products": [[symbol, display_symbol, name, price] for symbol, (display_symbol, name, price) in self.products.items()],
+        }
+        try:
+            await self.redis_core.set_redis(key=self.MB_CATALOG_REDIS_KEY, data=json.dumps(snapshot), bulk=True)
+        except Exception as error:
+            logger(mensagem=f"MercadoBitcoinCatalog._save_snapshot -> {error}", nivel=logging.WARNING)
+
+    async def _sync_loop(self) -> None:
+        """
+        Executa `sync` a cada MB_CATALOG_SYNC_INTERVAL segundos.
+        """
+        while True:
+            await asyncio.sleep(self.MB_CATALOG_SYNC_INTERVAL)
+            try:
+                await self.sync()
+            except asyncio.CancelledError:
+                raise
+            except Exception as error:
+                logger(mensagem=f"MercadoBitcoinCatalog._sync_loop -> {error}", nivel=logging.WARNING)
@@ -0,0 +1,153 @@
+import os
+import time
+import asyncio
+import logging
+from typing import Optional
+
+from src.system.core.logger_core import logger
+from src.system.core.search_index_core import SearchIndexCore
+from src.system.integrations.api_coin_gecko import CoinGecko
+from src.system.integrations.api_store_mercado_bitcoin import StoreMercadoBitcoin
+
+
+class SymbolSearchService():
+    COINGECKO = "CoinGecko"
+    STORE_MERCADO_BITCOIN = "StoreMercadoBitcoin"
+
+    def __init__(self, coin_gecko: CoinGecko, store_mercado_bitcoin: StoreMercadoBitcoin) -> None:
+        """
+        Inicializa a busca de símbolos (autocomplete).
+
+        O índice em memória (SearchIndexCore) é alimentado pela lista de
+        moedas da CoinGecko, já mantida pelo CoinGeckoSymbolIndex, e pelo
+        catálogo de produtos do Mercado Bitcoin, já mantido pelo
+        MercadoBitcoinCatalog. A cada SEARCH_SYNC_INTERVAL segundos as fontes
+        são conferidas; quando alguma mudou, um índice novo é montado numa
+        thread (a montagem leva cerca de um segundo e não pode travar o event
+        loop) e substitui o atual, que segue atendendo as buscas até lá.
+
+        Args:
+            coin_gecko (CoinGecko): Integração com o índice de símbolos da CoinGecko.
+            store_mercado_bitcoin (StoreMercadoBitcoin): Integração com o catálogo do Mercado Bitcoin.
+        """
+        self.SEARCH_SYNC_INTERVAL = float(os.environ.get("SEARCH_SYNC_INTERVAL", 60))
+        self.coin_gecko = coin_gecko
+        self.store_mercado_bitcoin = store_mercado_bitcoin
+        self.index = SearchIndexCore()
+        self.synced_at = 0.0
+        self._coin_gecko_updated_at = 0.0
+        self._mercado_bitcoin_updated_at = 0.0
+        self._lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        """
+        Inicia a sincronização periódica em segundo plano, se ainda não estiver rodando.
+        """
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._sync_loop())
+
+    async def stop(self) -> None:
+        """
+        Interrompe a sincronização periódica.
+        """
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def ensure_loaded(self) -> None:
+        """
+        Garante que as fontes tenham sido sincronizadas ao menos uma vez (com
+        ou sem sucesso; as que falharem são tentadas de novo pelo ciclo
+        periódico) e inicia a sincronização periódica.
+        """
+        self.start()
+        if not self.synced_at:
+            await self.sync()
+
+    async def search(self, query: str, limit: int = 10, offset: int = 0) -> dict:
+        """
+        Busca símbolos e nomes de criptomoedas que casem com a consulta.
+
+        Args:
+            query (str): O texto digitado.
+            limit (int, optional): Tamanho da página.
+            offset (int, optional): Quantos resultados pular.
+
+        Returns:
+            dict: O total de símbolos encontrados e os itens da página.
+        """
+        await self.ensure_loaded()
+        return self.index.search(query=query, limit=limit, offset=offset)
+
+    async def sync(self) -> None:
+        """
+        Reindexa as fontes que mudaram desde a última sincronização. A falha
+        de uma fonte não impede a atualização da outra.
+        """
+        async with self._lock:
+            try:
+                await self._sync_coin_gecko()
+            except Exception as error:
+                logger(mensagem=f"SymbolSearchService._sync_coin_gecko -> {error}", nivel=logging.WARNING)
+            try:
+                await self._sync_mercado_bitcoin()
+            except Exception as error:
+                logger(mensagem=f"SymbolSearchService._sync_mercado_bitcoin -> {error}", nivel=logging.WARNING)
+            self.synced_at = time.monotonic()
+
+    async def _sync_coin_gecko(self) -> None:
+        symbol_index = self.coin_gecko.symbol_index
+        await symbol_index.ensure_loaded()
+        if symbol_index.updated_at == self._coin_gecko_updated_at:
+            return
+        await self._update(source=self.COINGECKO, entries=symbol_index.coins)
+        self._coin_gecko_updated_at = symbol_index.updated_at
+
+    async def _sync_mercado_bitcoin(self) -> None:
+        catalog = self.store_mercado_bitcoin.catalog
+        await catalog.ensure_loaded()
+        if catalog.updated_at == self._mercado_bitcoin_updated_at:
+            return
+        entries = {symbol: (display_symbol, name, None) for symbol, (display_symbol, name, _) in catalog.products.items()}
+        await self._update(source=self.STORE_MERCADO_BITCOIN, entries=entries)
+        self._mercado_bitcoin_updated_at = catalog.updated_at
+
+    async def _update(self, source: str, entries: dict) -> None:
+        added, removed, changed = self.index.diff_source(source=source, entries=entries)
+        if not (added or removed or changed):
+            return
+        self.index = await asyncio.to_thread(self._build, source, dict(entries))
+        logger(
+            mensagem=f"SymbolSearchService -> {source}: {len(entries)} símbolos (+{len(added)} -{len(removed)} ~{len(changed)})",
+            nivel=logging.INFO,
+        )
+
+    def _build(self, source: str, entries: dict) -> SearchIndexCore:
+        """
+        Monta um índice novo com as fontes atuais, trocando as entradas de
+        `source`. Roda fora do event loop; o índice atual só é lido.
+        """
+        index = SearchIndexCore()
+        for name, current in self.index.sources.items():
+            if name != source:
+                index.update_source(source=name, entries=current)
+        index.update_source(source=source, entries=entries)
+        return index
+
+    async def _sync_loop(self) -> None:
+        """
+        Executa `sync` a cada SEARCH_SYNC_INTERVAL segundos.
+        """
+        while True:
+            await asyncio.sleep(self.SEARCH_SYNC_INTERVAL)
+            try:
+                await self.sync()
+            except asyncio.CancelledError:
+                raise
+            except Exception as error:
+                logger(mensagem=f"SymbolSearchService._sync_loop -> {error}", nivel=logging.WARNING)
@@ -0,0 +1,92 @@
+import json
+import asyncio
+
+import pytest
+
+from src.app.api.model import ApiOut
+from src.app.api.controller import ApiController
+from src.system.integrations.api_cotacao import ApiResponse
+
+
+def fx_rate(code: str, bid: float) -> ApiResponse:
+    return ApiResponse(
+        code=code, codein="BRL", name=f"{code}/BRL", high=bid * 1.1, low=bid * 0.9, varBid=0, pctChange=0,
+        bid=bid, ask=bid, timestamp="1", create_date="2024-01-01 00:00:00",
+    )
+
+
+@pytest.fixture
+def api_controller(monkeypatch):
+    api_controller = ApiController()
+    fx_rate_service = api_controller.fx_rate_service
+    monkeypatch.setattr(fx_rate_service, "start", lambda: None)
+    for pair, bid in {"USD-BRL": 5.0, "EUR-BRL": 6.0, "GBP-BRL": 7.0}.items():
+        fx_rate_service._store(pair=pair, rate=fx_rate(code=pair[:3], bid=bid), updated_at=1.0)
+    return api_controller
+
+
+def serialize(api_controller: ApiController, quote: dict) -> str:
+    return api_controller._dumps(ApiOut(**quote).model_dump(mode="json"))
+
+
+def test_prices_for_coin_gecko_and_mercado_bitcoin_quotes(api_controller):
+    # CoinGecko informa o preço em dólar; o Mercado Bitcoin, em reais.
+    coin_gecko = {"coin_name": "Bitcoin", "symbol": "btc", "coin_price": 100.0, "coin_price_dolar": 100.0, "currency": "USD"}
+    mercado_bitcoin = {"coin_name": "MBX", "symbol": "mbx", "coin_price": 500.0, "coin_price_dolar": 100.0, "currency": "BRL"}
+    responses = {
+        "btc": serialize(api_controller, coin_gecko),
+        "mbx": serialize(api_controller, mercado_bitcoin),
+    }
+
+    converted = asyncio.run(api_controller._add_prices(responses=responses, currencies=["BRL", "USD", "EUR"]))
+
+    for symbol in ("btc", "mbx"):
+        prices = json.loads(converted[symbol])["prices"]
+        assert prices["brl"] == pytest.approx(500.0)
+        assert prices["usd"] == pytest.approx(100.0)
+        assert prices["eur"] == pytest.approx(500.0 / 6.0)
+        ApiOut.model_validate_json(converted[symbol])
+
+
+def test_prices_are_null_without_source_currency(api_controller):
+    legacy = {"coin_name": "MBX", "symbol": "mbx", "coin_price": 500.0, "coin_price_dolar": 100.0}
+    converted = asyncio.run(api_controller._add_prices(responses={"mbx": serialize(api_controller, legacy)}, currencies=["USD"]))
+    assert json.loads(converted["mbx"])["prices"] is None
+
+
+def test_bulk_fetch_consumes_one_provider_token_per_upstream_batch(api_controller, monkeypatch):
+    coin_gecko = api_controller.CLASS_MAPPING["CoinGecko"]
+    symbol_index = coin_gecko.symbol_index
+    symbols = [f"c{index}" for index in range(250)]
+    symbol_index.coins = {f"coin-{symbol}": (symbol, symbol.upper(), None) for symbol in symbols}
+    symbol_index.candidates = {symbol: (f"coin-{symbol}",) for symbol in symbols}
+    symbol_index.updated_at = 1.0
+    costs, batches = [], []
+
+    async def ensure_loaded():
+        pass
+
+    async def acquire_provider(name, cost=1):
+        costs.append((name, cost))
+
+    async def get_json(path, params):
+        batches.append(params["ids"].split(","))
+        return {coin_id: {"usd": 1.0} for coin_id in batches[-1]}
+
+    monkeypatch.setattr(symbol_index, "ensure_loaded", ensure_loaded)
+    monkeypatch.setattr(coin_gecko.http_client, "get_json", get_json)
+    monkeypatch.setattr(api_controller.rate_limit, "acquire_provider", acquire_provider)
+    monkeypatch.setattr(api_controller, "CLASS_MAPPING", {"CoinGecko": coin_gecko})
+
+    responses = asyncio.run(api_controller._fetch_many(symbols=symbols))
+
+    assert len(responses) == 250
+    assert costs == [("CoinGecko", len(batches))] == [("CoinGecko", 3)]
+
+
+def test_default_provider_order_is_stable_across_latencies(api_controller):
+    assert api_controller.PROVIDER_ORDER == "static"
+    expected = list(api_controller.CLASS_MAPPING)
+    for class_integracao in reversed(expected):
+        api_controller.circuit_breakers[class_integracao].record_success(latency=0.001)
+        assert api_controller._ordered_integrations() == expected
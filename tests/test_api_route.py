@@ -0,0 +1,52 @@
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from src.app.api import route
+
+QUOTE = '{"coin_name":"Bitcoin","symbol":"btc","coin_price":100.0,"coin_price_dolar":100.0,"date_consult":"2024-01-01 00:00:00"}'
+
+
+@pytest.fixture
+def client(monkeypatch):
+    ttl = [30.4]
+
+    async def search_coin_per_symbol_cached(data):
+        return QUOTE, ttl[0]
+
+    monkeypatch.setattr(route.api_controller, "search_coin_per_symbol_cached", search_coin_per_symbol_cached)
+    app = FastAPI()
+    app.include_router(route.backend)
+    app.dependency_overrides[route.get_rate_limited_user] = lambda: None
+    client = TestClient(app)
+    client.ttl = ttl
+    return client
+
+
+def test_quote_carries_etag_and_cache_control(client):
+    response = client.get("/api", params={"symbol": "btc"})
+    stale_time = route.api_controller.redis_core.REDIS_STALE_TIME
+    assert response.status_code == 200
+    assert response.text == QUOTE
+    assert response.headers["ETag"].startswith('W/"')
+    assert response.headers["Cache-Control"] == f"private, max-age=30, stale-while-revalidate={int(30.4 + stale_time) - 30}"
+
+    client.ttl[0] = None
+    assert client.get("/api", params={"symbol": "btc"}).headers["Cache-Control"] == "private, no-cache"
+
+
+@pytest.mark.parametrize("if_none_match, status_code", [
+    ("{etag}", 304),
+    ("{strong}", 304),
+    ('W/"outro", {etag}', 304),
+    ("*", 304),
+    ('W/"outro"', 200),
+])
+def test_if_none_match_returns_304_without_body(client, if_none_match, status_code):
+    etag = client.get("/api", params={"symbol": "btc"}).headers["ETag"]
+    if_none_match = if_none_match.format(etag=etag, strong=etag.removeprefix("W/"))
+
+    response = client.get("/api", params={"symbol": "btc"}, headers={"If-None-Match": if_none_match})
+    assert response.status_code == status_code
+    assert response.headers["ETag"] == etag
+    assert response.content == (b"" if status_code == 304 else QUOTE.encode())
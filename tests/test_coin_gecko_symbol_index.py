@@ -0,0 +1,45 @@
+import asyncio
+
+import pytest
+import fakeredis.aioredis
+
+from src.system.core import redis_core
+from src.system.integrations.coin_gecko_symbol_index import CoinGeckoSymbolIndex
+
+
+class FakeCoinGecko():
+    def __init__(self) -> None:
+        self.markets_available = True
+
+    async def get_coins_list(self) -> list:
+        return [
+            {"id": "bridged-eth", "symbol": "eth", "name": "Bridged Ether"},
+            {"id": "ethereum", "symbol": "eth", "name": "Ethereum"},
+        ]
+
+    async def get_markets(self, page: int) -> list:
+        if not self.markets_available:
+            raise Exception("HTTP 429")
+        return [{"id": "ethereum", "market_cap_rank": 2}] if page == 1 else []
+
+
+@pytest.fixture
+def coin_gecko_symbol_index(monkeypatch):
+    fake_redis = fakeredis.aioredis.FakeRedis(decode_responses=True)
+    monkeypatch.setattr(redis_core.redis, "StrictRedis", lambda *args, **kwargs: fake_redis)
+    monkeypatch.setenv("COINGECKO_INDEX_PATH", "")
+    return CoinGeckoSymbolIndex(coin_gecko=FakeCoinGecko(), redis_core=redis_core.RedisCore())
+
+
+def test_failed_ranking_keeps_previous_ranks(coin_gecko_symbol_index):
+    async def run():
+        await coin_gecko_symbol_index._refresh()
+        first = coin_gecko_symbol_index.get_candidates("eth")
+        coin_gecko_symbol_index.coin_gecko.markets_available = False
+        await coin_gecko_symbol_index._refresh()
+        return first, coin_gecko_symbol_index.get_candidates("eth")
+
+    first, after_failure = asyncio.run(run())
+    assert first == ("ethereum", "bridged-eth")
+    assert after_failure == ("ethereum", "bridged-eth")
+    assert coin_gecko_symbol_index.coins["ethereum"][2] == 2
@@ -0,0 +1,73 @@
+import asyncio
+from datetime import datetime
+
+import numpy as np
+import orjson
+import pytest
+import fakeredis.aioredis
+
+from src.system.core import redis_core
+from src.system.core.history_core import HistoryCore
+
+
+@pytest.fixture
+def history_core(monkeypatch):
+    fake_redis = fakeredis.aioredis.FakeRedis(decode_responses=True)
+    monkeypatch.setattr(redis_core.redis, "StrictRedis", lambda *args, **kwargs: fake_redis)
+    monkeypatch.setenv("HISTORY_PAGE_SIZE", "100000")
+    return HistoryCore(redis_core=redis_core.RedisCore())
+
+
+def test_parse_members():
+    values = HistoryCore._parse(members="60:1.5:2:1:1.5:3\n120:2:2.5:2:2.25:1", columns=6)
+    np.testing.assert_array_equal(values, [[60, 1.5, 2, 1, 1.5, 3], [120, 2, 2.5, 2, 2.25, 1]])
+    assert HistoryCore._parse(members="", columns=3).shape == (0, 3)
+    assert HistoryCore._last_score(members="60:1:0\n120:2:0\n120:3:0") == (120.0, 2)
+
+
+def test_candles_are_aggregated(history_core):
+    start = datetime.now().timestamp() // 3600 * 3600
+    observations = [
+        {"symbol": "BTC", "coin_price": price, "coin_price_dolar": price / 5, "date_consult": datetime.fromtimestamp(start + offset)}
+        for offset, price in ((0, 10.0), (60, 12.0), (120, 8.0))
+    ]
+
+    async def run():
+        await history_core.record_many(observations=observations)
+        return await history_core.get_candles(symbol="btc", field="coin_price", interval=300, start=start, end=start + 3599)
+
+    candles = asyncio.run(run())
+    np.testing.assert_array_equal(candles["timestamp"], [start])
+    np.testing.assert_array_equal(candles["open"], [10.0])
+    np.testing.assert_array_equal(candles["high"], [12.0])
+    np.testing.assert_array_equal(candles["low"], [8.0])
+    np.testing.assert_array_equal(candles["close"], [8.0])
+    np.testing.assert_array_equal(candles["count"], [3])
+
+
+def test_year_of_minute_candles_is_read_in_pages(history_core):
+    end = datetime.now().timestamp() // 60 * 60
+    buckets = end - 60 * np.arange(365 * 1440)[::-1]
+    members = {f"{bucket:.0f}:1:2:0.5:1.5:1": float(bucket) for bucket in buckets}
+
+    async def run():
+        await history_core.redis_core.redis_service.zadd(history_core._key("btc", "coin_price:1m"), members)
+        return await history_core.get_candles(symbol="btc", field="coin_price", interval=60, start=float(buckets[0]), end=end)
+
+    candles = asyncio.run(run())
+    np.testing.assert_array_equal(candles["timestamp"], buckets)
+    assert candles["count"].sum() == len(buckets)
+    assert len(orjson.loads(orjson.dumps(candles, option=orjson.OPT_SERIALIZE_NUMPY))["close"]) == len(buckets)
+
+
+def test_pages_do_not_skip_members_with_the_same_score(history_core):
+    history_core.HISTORY_PAGE_SIZE = 10
+    key = history_core._key("btc", "raw")
+    members = {f"{100 + index // 7}.0:{index}:0": 100 + index // 7 for index in range(95)}
+
+    async def run():
+        await history_core.redis_core.redis_service.zadd(key, members)
+        return await history_core.get_raw(symbol="btc", start=0, end=1e12)
+
+    raw = asyncio.run(run())
+    assert sorted(raw["coin_price"]) == list(range(95))
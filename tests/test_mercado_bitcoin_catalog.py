@@ -0,0 +1,81 @@
+import asyncio
+
+import pytest
+import fakeredis.aioredis
+
+from src.system.core import redis_core
+from src.system.integrations.http_client import HttpClientError
+from src.system.integrations.api_store_mercado_bitcoin import StoreMercadoBitcoin
+
+
+@pytest.fixture
+def store_mercado_bitcoin(monkeypatch):
+    fake_redis = fakeredis.aioredis.FakeRedis(decode_responses=True)
+    monkeypatch.setattr(redis_core.redis, "StrictRedis", lambda *args, **kwargs: fake_redis)
+    monkeypatch.setenv("STORE_MERCADO_BITCOIN_MODE", "catalog")
+    monkeypatch.setenv("MB_CATALOG_SYNC_INTERVAL", "3600")
+    return StoreMercadoBitcoin(redis_core=redis_core.RedisCore())
+
+
+def test_failed_catalog_download_is_not_retried_on_lookups(store_mercado_bitcoin, monkeypatch):
+    calls = {"catalog": 0, "symbol": 0}
+
+    async def get_products(limit: int = 100, offset: int = 0) -> dict:
+        calls["catalog"] += 1
+        raise HttpClientError("upstream fora")
+
+    async def get_json(path: str, params: dict) -> dict:
+        calls["symbol"] += 1
+        return {"response_data": {"products": [{"name": "MBX", "market_price": "3.5", "symbol": params["symbol"]}]}}
+
+    monkeypatch.setattr(store_mercado_bitcoin, "get_products", get_products)
+    monkeypatch.setattr(store_mercado_bitcoin.http_client, "get_json", get_json)
+
+    async def run():
+        responses = [await store_mercado_bitcoin.get_per_symbol(symbol="mbx") for _ in range(3)]
+        # Só a sincronização periódica volta a baixar o catálogo.
+        with pytest.raises(HttpClientError):
+            await store_mercado_bitcoin.catalog.sync()
+        await store_mercado_bitcoin.catalog.stop()
+        return responses
+
+    responses = asyncio.run(run())
+    assert [response["coin_price"] for response in responses] == [3.5, 3.5, 3.5]
+    assert calls == {"catalog": 2, "symbol": 3}
+    assert store_mercado_bitcoin.catalog.failed_at
+
+
+def test_truncated_catalog_falls_back_to_per_symbol_lookups(store_mercado_bitcoin, monkeypatch):
+    catalog = store_mercado_bitcoin.catalog
+    catalog.MB_CATALOG_PAGE_SIZE = 2
+    catalog.MB_CATALOG_MAX_PAGES = 2
+    products = [{"name": f"Produto {index}", "market_price": str(index), "symbol": f"P{index}"} for index in range(7)]
+    offsets, symbols = [], []
+
+    async def get_products(limit: int = 100, offset: int = 0) -> dict:
+        offsets.append(offset)
+        return {"products": products[offset:offset + limit], "total_items": len(products)}
+
+    async def get_json(path: str, params: dict) -> dict:
+        symbols.append(params["symbol"])
+        return {"response_data": {"products": [{"name": "Produto 6", "market_price": "6", "symbol": params["symbol"]}]}}
+
+    monkeypatch.setattr(store_mercado_bitcoin, "get_products", get_products)
+    monkeypatch.setattr(store_mercado_bitcoin.http_client, "get_json", get_json)
+
+    async def run():
+        await catalog.sync()
+        await catalog.stop()
+        responses = [await store_mercado_bitcoin.get_per_symbol(symbol=symbol) for symbol in ("p1", "p6")]
+        reloaded = type(catalog)(store_mercado_bitcoin=store_mercado_bitcoin, redis_core=catalog.redis_core)
+        await reloaded._load_snapshot()
+        return responses, reloaded
+
+    responses, reloaded = asyncio.run(run())
+    assert sorted(offsets) == [0, 2]
+    assert sorted(catalog.products) == ["p0", "p1", "p2", "p3"]
+    assert not catalog.complete
+    assert not store_mercado_bitcoin.serves_from_memory
+    assert [response["coin_price"] for response in responses] == [1.0, 6.0]
+    assert symbols == ["p6"]
+    assert not reloaded.complete and sorted(reloaded.products) == sorted(catalog.products)
@@ -0,0 +1,14 @@
+from src.system.core.metrics_core import MetricsCore
+
+
+def test_gauge_children_are_rendered_with_function_values():
+    metrics = MetricsCore()
+    gauge = metrics.gauge("queue_size", "Tamanho da fila.", ("queue",), function=lambda: {("b",): 7})
+    child = gauge.labels("a")
+    child.set(5)
+    child.inc(2)
+    child.dec()
+    gauge.labels("b").set(1)
+
+    assert gauge.labels("a") is child
+    assert metrics.render().splitlines()[2:] == ['queue_size{queue="a"} 6', 'queue_size{queue="b"} 7']
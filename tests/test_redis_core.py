@@ -0,0 +1,42 @@
+import asyncio
+import json
+
+import pytest
+import fakeredis
+import fakeredis.aioredis
+
+from src.system.core import redis_core
+
+
+@pytest.fixture
+def server(monkeypatch):
+    server = fakeredis.FakeServer()
+    monkeypatch.setattr(redis_core.redis, "StrictRedis", lambda *args, **kwargs: fakeredis.aioredis.FakeRedis(server=server, decode_responses=True))
+    monkeypatch.setenv("REDIS_CIRCUIT_OPEN_TIME", "0")
+    return server
+
+
+def test_writes_made_while_degraded_are_replayed_when_redis_returns(server):
+    async def run():
+        core = redis_core.RedisCore()
+        server.connected = False
+        await core.set_redis("catalog", "v1")
+        await core.set_entry_redis("quote:btc", {"price": 1})
+        await core.set_entry_redis("quote:eth", {"price": 2})
+        await core.set_redis("catalog", "v2")
+        assert list(core.pending_writes) == ["quote:btc", "quote:eth", "catalog"]
+        # A cotação de ETH expira enquanto espera e não deve ser regravada.
+        value, _, fetched_at = core.pending_writes["quote:eth"]
+        core.pending_writes["quote:eth"] = (value, 1.0, fetched_at)
+
+        server.connected = True
+        # Um valor mais novo gravado depois da volta não é sobrescrito.
+        await core.set_entry_redis("quote:btc", {"price": 3})
+        await core._replay_task
+        return core, await core.redis_service.mget("catalog", "quote:btc", "quote:eth")
+
+    core, (catalog, btc, eth) = asyncio.run(run())
+    assert core.pending_writes == {}
+    assert catalog == "v2"
+    assert json.loads(btc)["data"] == {"price": 3}
+    assert eth is None
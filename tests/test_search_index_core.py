@@ -0,0 +1,34 @@
+from src.system.core.search_index_core import SearchIndexCore
+
+
+def symbols(result: dict) -> list:
+    return [item["symbol"] for item in result["items"]]
+
+
+def test_ranking_prefers_exact_symbol_then_rank_and_dedupes_symbols():
+    index = SearchIndexCore()
+    index.update_source(source="CoinGecko", entries={
+        "bitcoin": ("btc", "Bitcoin", 1),
+        "bitcoin-cash": ("bch", "Bitcoin Cash", 20),
+        "wrapped-bitcoin": ("wbtc", "Wrapped Bitcoin", 15),
+        "bit": ("bit", "BitDAO", 90),
+        "bitcoin-pegged": ("btc", "Bitcoin Pegged", 500),
+    })
+    index.update_source(source="StoreMercadoBitcoin", entries={"BTC": ("BTC", "Bitcoin", None)})
+
+    result = index.search(query="bit", limit=10)
+    assert symbols(result) == ["bit", "btc", "wbtc", "bch"]
+    assert result["total"] == 4
+    assert result["items"][1]["sources"] == ["CoinGecko", "StoreMercadoBitcoin"]
+    assert symbols(index.search(query="bit", limit=2, offset=1)) == ["btc", "wbtc"]
+    assert symbols(index.search(query="bitcoim")) == ["btc", "wbtc", "bch"]
+
+
+def test_update_reuses_slots_of_removed_entries():
+    index = SearchIndexCore()
+    index.update_source(source="CoinGecko", entries={"a": ("aaa", "Alpha", 2), "b": ("abb", "Beta", 1)})
+    index.update_source(source="CoinGecko", entries={"b": ("abb", "Beta", 3), "c": ("acc", "Gamma", 1)})
+
+    assert symbols(index.search(query="a")) == ["acc", "abb"]
+    assert index.search(query="alpha")["total"] == 0
+    assert len(index) == 2
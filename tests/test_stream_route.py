@@ -0,0 +1,22 @@
+import pytest
+from fastapi import FastAPI, status
+from fastapi.testclient import TestClient
+from starlette.websockets import WebSocketDisconnect
+
+from src.app.stream import route
+
+
+def test_initial_subscription_error_closes_websocket(monkeypatch):
+    async def get_current_user(token):
+        return None
+
+    monkeypatch.setattr(route.auth_controller, "get_current_user", get_current_user)
+    monkeypatch.setattr(route.stream_controller, "STREAM_MAX_SYMBOLS", 1)
+    app = FastAPI()
+    app.include_router(route.backend)
+
+    with TestClient(app).websocket_connect("/stream/ws?token=t&symbols=btc,eth") as websocket:
+        assert "error" in websocket.receive_json()
+        with pytest.raises(WebSocketDisconnect) as error:
+            websocket.receive_text()
+    assert error.value.code == status.WS_1008_POLICY_VIOLATION
@@ -0,0 +1,20 @@
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from src.app.auth.route import backend
+from src.system.core.token_core import InvalidTokenError, TokenCore
+
+
+@pytest.mark.parametrize("suffix", ["abc.é", "é.abc", "abc.abc☃"])
+def test_non_ascii_tokens_are_malformed(suffix):
+    token_core = TokenCore()
+    with pytest.raises(InvalidTokenError):
+        token_core.decode(f"{TokenCore.HEADER}.{suffix}")
+
+
+def test_non_ascii_token_is_unauthorized():
+    app = FastAPI()
+    app.include_router(backend)
+    response = TestClient(app).get("/users/me", headers={"Authorization": f"Bearer {TokenCore.HEADER}.abc.é".encode("latin-1")})
+    assert response.status_code == 401